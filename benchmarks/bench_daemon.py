@@ -0,0 +1,61 @@
+"""
+Footprint of the headless background daemon vs the GUI: time until tracking
+runs and resident memory, each in a fresh interpreter. The daemon is driven
+by a desktop backend reporting one fixed focused window and logs into a
+temporary directory; the GUI figure is bench_startup's 'main_window_shown'.
+
+Usage: python -m benchmarks.bench_daemon [--seconds 2] [--repeat 3] [--output daemon.json]
+"""
+import argparse
+import json
+from benchmarks.bench_startup import TARGETS, measure
+
+DAEMON = """
+import os, sys, tempfile, threading
+from core.background_tracker import BackgroundTracker
+from core.desktop_utils_interface import DesktopUtilsInterface
+
+class FixedWindow(DesktopUtilsInterface):
+    def get_all_window_ids(self): return ["1"]
+    def get_window_name(self, wid): return "Benchmark"
+    def get_window_pid(self, wid): return os.getpid()
+    def get_active_window_id(self): return "1"
+    def find_window_id_by_title(self, target_title): return "1"
+    def find_window_by_pid(self, target_pid): return "1", "Benchmark"
+
+tracker = BackgroundTracker(0, 1, 0, FixedWindow(), log_dir=tempfile.mkdtemp())
+thread = threading.Thread(target=tracker.run, daemon=True)
+thread.start()
+while tracker.current_process is None:
+    threading.Event().wait(0.01)
+"""
+
+DAEMON_STOP = """
+threading.Event().wait({seconds})
+tracker.stop()
+thread.join()
+assert not any(m.startswith(('PyQt6', 'matplotlib')) for m in sys.modules), "Qt loaded"
+"""
+
+def main():
+    parser = argparse.ArgumentParser(description="Measures the daemon footprint against the GUI")
+    parser.add_argument("--seconds", type=float, default=2.0, help="How long the daemon tracks before RSS is read")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    report = {
+        # Time until the first window is tracked
+        'daemon_tracking': measure(DAEMON, args.repeat),
+        # RSS after running a while (time includes the wait)
+        'daemon_after_run': measure(DAEMON + DAEMON_STOP.format(seconds=args.seconds), args.repeat),
+        'gui_window_shown': measure(TARGETS['main_window_shown'], args.repeat),
+    }
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+LogManager query benchmark on a synthetic history.
+
+Every case is timed "cold" (a fresh LogManager after the per-process shared
+state, the last played stores, log catalogs and session tables, was dropped:
+like the first call in a new process) and "warm" (repeated calls on the same instance). The
+OS page cache is warm in both cases. Results are printed as JSON so runs can
+be diffed across commits.
+
+Usage: python -m benchmarks.bench_log_manager [--years 2] [--output results.json]
+--log-dir benchmarks a copy of an existing history, the original is never written.
+"""
+import argparse
+import json
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from benchmarks.history_generator import generate_history
+from core import log_parser
+from core.last_played import LastPlayedStore
+from core.log_catalog import LogCatalog
+from core.log_manager import LogManager
+from core.session_table import SessionTable
+
+TIMEFRAMES = ["Today", "Last 7 Days", "Last 30 Days", "All Time"]
+
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=Path(__file__).parent,
+            stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except Exception:
+        return None
+
+def timed(fn):
+    t0 = time.perf_counter()
+    fn()
+    return time.perf_counter() - t0
+
+def clear_shared_state():
+    """Forgets the per-process stores, catalogs and tables, the next LogManager starts from the disk."""
+    with LastPlayedStore._stores_lock:
+        stores = list(LastPlayedStore._stores.values())
+        LastPlayedStore._stores.clear()
+    for store in stores:
+        store.flush()
+    with LogCatalog._catalogs_lock:
+        catalogs = list(LogCatalog._catalogs.values())
+        LogCatalog._catalogs.clear()
+    for catalog in catalogs:
+        catalog.stop()
+    with SessionTable._tables_lock:
+        SessionTable._tables.clear()
+
+def cold_call(log_dir, call):
+    clear_shared_state()
+    return timed(lambda: call(LogManager(log_dir)))
+
+def measure(log_dir, call, repeat):
+    """Returns (cold_ms, warm_ms): best call in a fresh state, best repeated call."""
+    cold = min(cold_call(log_dir, call) for _ in range(repeat))
+    manager = LogManager(log_dir)
+    call(manager)
+    warm = min(timed(lambda: call(manager)) for _ in range(repeat))
+    return round(cold * 1000, 3), round(warm * 1000, 3)
+
+def pick_app(log_dir):
+    """Most recently played game, in the 'Title - app' form the UI passes."""
+    metadata = json.loads((log_dir / ".last_played.json").read_text(encoding="utf-8"))
+    games = [(data['time'], app, data['last_title']) for app, data in metadata.items() if app.endswith(".exe")]
+    _, app, title = max(games)
+    return app, f"{title} - {app}"
+
+def run_cases(log_dir, repeat):
+    app, combined = pick_app(log_dir)
+    cases = {
+        "get_stats_for_app": lambda m: m.get_stats_for_app(combined),
+        "get_grouped_logs_for_app": lambda m: m.get_grouped_logs_for_app(combined),
+        "get_total_app_playtime": lambda m: m.get_total_app_playtime(app),
+        "get_apps_sorted_by_latest": lambda m: m.get_apps_sorted_by_latest(),
+    }
+    for timeframe in TIMEFRAMES:
+        cases[f"get_global_summary[{timeframe}]"] = lambda m, t=timeframe: m.get_global_summary(t)
+
+    results = {}
+    for name, call in cases.items():
+        cold, warm = measure(log_dir, call, repeat)
+        results[name] = {"cold_ms": cold, "warm_ms": warm}
+
+    # Metadata missing: exercises the rebuild/fallback path
+    metadata = log_dir / ".last_played.json"
+    backup = metadata.read_bytes()
+    def without_metadata(m):
+        metadata.unlink(missing_ok=True)
+        m.get_apps_sorted_by_latest()
+    cold, warm = measure(log_dir, without_metadata, repeat)
+    metadata.write_bytes(backup)
+    results["get_apps_sorted_by_latest[no metadata]"] = {"cold_ms": cold, "warm_ms": warm}
+
+    # Periodic save of an in-flight session in today's (busy) file, the same ID
+    # every time so each call rewrites its line
+    start = datetime.now() - timedelta(minutes=5)
+    session = {
+        'start': start, 'end': datetime.now(), 'duration': 300, 'active_time': 120,
+        'app': app, 'title': combined.rsplit(" - ", 1)[0], 'status': "Manual", 'tags': "",
+        'id': log_parser.new_session_id()
+    }
+    LogManager(log_dir).save_session(session, is_update=False)
+    cold, warm = measure(log_dir, lambda m: m.save_session(session, is_update=True), repeat)
+    results["save_session[is_update]"] = {"cold_ms": cold, "warm_ms": warm}
+
+    # Write the debounced metadata before the temp dir goes away
+    LogManager(log_dir).last_played.flush()
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--years", type=float, default=2)
+    parser.add_argument("--apps", type=int, default=40)
+    parser.add_argument("--sessions", type=int, default=6, help="Game sessions per day")
+    parser.add_argument("--churn", type=int, default=30, help="Background-mode sessions per day")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--log-dir", help="Benchmark an existing log directory instead of generating one")
+    parser.add_argument("--output", help="Write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.log_dir:
+            # The cases save sessions and delete the metadata: work on a copy
+            log_dir = Path(tmp) / "log"
+            shutil.copytree(args.log_dir, log_dir)
+            dataset = {"source": str(Path(args.log_dir).resolve())}
+        else:
+            log_dir = Path(tmp)
+            dataset = generate_history(log_dir, args.years, args.apps, args.sessions, args.churn)
+            dataset.update(years=args.years, sessions_per_day=args.sessions, background_churn=args.churn)
+
+        report = {
+            "commit": git_commit(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "dataset": dataset,
+            "repeat": args.repeat,
+            "results": run_cases(log_dir, args.repeat),
+        }
+
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+
+if __name__ == "__main__":
+    sys.exit(main())
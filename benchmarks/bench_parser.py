@@ -0,0 +1,71 @@
+"""
+Microbenchmark: log_parser vs the previous csv.DictReader + strptime path.
+
+Usage: python -m benchmarks.bench_parser [--years 3] [--sessions 6] [--churn 30] [--repeat 5]
+"""
+import argparse
+import csv
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from benchmarks.history_generator import generate_history
+from core import log_parser
+
+def legacy_duration(duration_str):
+    parts = list(map(int, duration_str.split(':')))
+    if len(parts) == 3:
+        return parts[0] * 3600 + parts[1] * 60 + parts[2]
+    elif len(parts) == 2:
+        return parts[0] * 60 + parts[1]
+    return 0
+
+def legacy_summary(files):
+    summary = {}
+    for path in files:
+        with open(path, encoding='utf-8') as f:
+            for row in csv.DictReader(f, delimiter=';'):
+                datetime.strptime(row['Timestamp_Start'], '%Y-%m-%d %H:%M:%S')
+                app = row.get('App')
+                summary[app] = summary.get(app, 0) + legacy_duration(row.get('ActiveTime', '0:0:0'))
+    return summary
+
+def parser_summary(files):
+    summary = {}
+    for path in files:
+        for ts, seconds, app in log_parser.read_records(path, ('start', 'active', 'app')):
+            summary[app] = summary.get(app, 0) + seconds
+    return summary
+
+def best_of(fn, files, repeat):
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn(files)
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--years", type=int, default=3)
+    parser.add_argument("--sessions", type=int, default=6, help="Game sessions per day")
+    parser.add_argument("--churn", type=int, default=30, help="Background-mode sessions per day")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        stats = generate_history(tmp, args.years, sessions_per_day=args.sessions, background_churn=args.churn)
+        files = sorted(Path(tmp).glob("*/activity_*.csv"))
+        rows = stats['rows']
+        legacy_time, legacy_result = best_of(legacy_summary, files, args.repeat)
+        fast_time, fast_result = best_of(parser_summary, files, args.repeat)
+
+    assert legacy_result == fast_result, "Parsers disagree"
+    print(f"{len(files)} files, {rows} rows")
+    print(f"legacy  : {legacy_time * 1000:8.1f} ms ({rows / legacy_time:,.0f} rows/s)")
+    print(f"parser  : {fast_time * 1000:8.1f} ms ({rows / fast_time:,.0f} rows/s)")
+    print(f"speedup : {legacy_time / fast_time:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""
+Replays a focus trace (recorded with benchmarks.record_trace, or a synthetic
+day) through the tracking loops on a virtual clock: a day of tracking takes
+seconds. Reports the cost per loop tick and checks that the computed playtime
+and the written rows are the same as a saved baseline, so an engine change
+that alters results fails loudly.
+
+Usage:
+    python -m benchmarks.bench_replay --baseline replay_baseline.json --update-baseline
+    python -m benchmarks.bench_replay --baseline replay_baseline.json   # exit 1 on any difference
+    python -m benchmarks.bench_replay --trace my_day.jsonl --engines background
+"""
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from core import log_parser
+from core.clock import VirtualClock
+from core.focus_trace import FocusTrace, ReplayBackend
+from core.background_tracker import BackgroundTracker
+
+# Desktop of the synthetic trace: (app, title, wine)
+SYNTHETIC_APPS = [
+    ("game000.exe", "ひぐらしのなく頃に", True), ("game001.exe", "Elden Ring", True),
+    ("firefox", "Mozilla Firefox", False), ("konsole", "~ : bash — Konsole", False),
+    ("dolphin", "Home — Dolphin", False), ("discord", "Discord", False),
+]
+MANUAL_TARGET = "Elden Ring"
+
+def synthetic_trace(hours=24, seed=1, start=datetime(2026, 1, 5, 8, 0, 0)):
+    """
+    A day at the desk: focus hops between windows (mostly minutes, some
+    switches of a few seconds), AFK breaks, and the game exiting and coming
+    back under a new pid and window id.
+    """
+    rng = random.Random(seed)
+    duration = hours * 3600.0
+    events = []
+    next_pid = 1000
+    windows = {} # {app: (wid, pid)}
+
+    def open_window(t, app, title, wine):
+        nonlocal next_pid
+        next_pid += 1
+        pid, wid = str(next_pid), f"{{{next_pid:08x}-replay}}"
+        events.append({'t': t, 'type': 'process', 'pid': pid, 'app': app, 'wine': wine})
+        events.append({'t': t, 'type': 'window', 'wid': wid, 'title': title, 'pid': pid})
+        windows[app] = (wid, pid)
+
+    for app, title, wine in SYNTHETIC_APPS:
+        open_window(0.0, app, title, wine)
+
+    t = 0.0
+    while t < duration:
+        roll = rng.random()
+        if roll < 0.05:
+            # AFK break
+            events.append({'t': t, 'type': 'afk', 'afk': True})
+            t += rng.uniform(300, 3600)
+            events.append({'t': round(t, 1), 'type': 'afk', 'afk': False})
+        elif roll < 0.08:
+            # The game exits and is restarted
+            app, title, wine = SYNTHETIC_APPS[1]
+            events.append({'t': t, 'type': 'close', 'wid': windows[app][0]})
+            t += rng.uniform(5, 60)
+            open_window(round(t, 1), app, title, wine)
+        else:
+            app = rng.choice(SYNTHETIC_APPS)[0]
+            events.append({'t': t, 'type': 'focus', 'wid': windows[app][0]})
+            t += rng.choice((rng.uniform(1, 8), rng.expovariate(1 / 600)))
+        t = round(t, 1)
+    return FocusTrace(start, events, duration)
+
+def run_engine(engine, trace, log_dir, save_interval, afk_timer):
+    """Replays the trace into one tracking loop. Returns (wall seconds, ticks)."""
+    clock = VirtualClock(trace.start)
+    backend = ReplayBackend(trace, clock)
+    if engine == 'background':
+        tracker = BackgroundTracker(0, save_interval, afk_timer, backend,
+                                    log_dir=log_dir, clock=clock, system=backend)
+    else:
+        import config
+        from core.tracker_worker import TrackerWorker
+        config.LOG_DIR = Path(log_dir)
+        clock.advance(0.0) # Let the backend see the windows open at t = 0
+        tracker = TrackerWorker(MANUAL_TARGET, 0, save_interval, afk_timer, backend, clock=clock, system=backend)
+    clock.call_at(trace.duration, tracker.stop)
+
+    t0 = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        tracker.run()
+    return time.perf_counter() - t0, clock.waits
+
+def read_results(log_dir):
+    """Rows written (without the random session ID) and playtime per app."""
+    rows = []
+    for path in sorted(Path(log_dir).glob("*/activity_*.csv")):
+        for line in path.read_text(encoding="utf-8").splitlines()[1:]:
+            if line:
+                rows.append(log_parser.split_row(line)[:log_parser.LEGACY_COLUMNS])
+    playtime = {}
+    for fields in rows:
+        h, m, s = map(int, fields[3].split(":"))
+        playtime[fields[4]] = playtime.get(fields[4], 0) + h * 3600 + m * 60 + s
+    digest = hashlib.sha256("\n".join(";".join(fields) for fields in rows).encode("utf-8")).hexdigest()
+    return {'rows': len(rows), 'rows_sha256': digest, 'playtime': dict(sorted(playtime.items()))}
+
+def main():
+    parser = argparse.ArgumentParser(description="Replays a focus trace through the tracking loops")
+    parser.add_argument("--trace", help="Recorded trace (default: a synthetic day)")
+    parser.add_argument("--hours", type=float, default=24, help="Length of the synthetic trace")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--engines", default="background,manual",
+                        help="Comma separated: background (BackgroundTracker), manual (TrackerWorker, needs PyQt6)")
+    parser.add_argument("--save-interval", type=int, default=5, help="Minutes, like LOG_PERIODIC_SAVE")
+    parser.add_argument("--afk-timer", type=int, default=3, help="Minutes, like AFK_TIMER")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument("--update-baseline", action="store_true", help="Write the results to --baseline instead")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    trace = FocusTrace.load(args.trace) if args.trace else synthetic_trace(args.hours, args.seed)
+    report = {'trace': {'events': len(trace.events), 'hours': round(trace.duration / 3600, 2)}}
+    results = {}
+    for engine in args.engines.split(","):
+        with tempfile.TemporaryDirectory() as log_dir:
+            try:
+                wall, ticks = run_engine(engine, trace, log_dir, args.save_interval, args.afk_timer)
+            except ImportError as e:
+                report[engine] = {'skipped': str(e)}
+                continue
+            results[engine] = read_results(log_dir)
+        report[engine] = {
+            'wall_s': round(wall, 3),
+            'ticks': ticks,
+            'tick_us': round(wall / max(ticks, 1) * 1e6, 2),
+            'speedup': round(trace.duration / wall),
+            **results[engine],
+        }
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(json.dumps(report, indent=2, ensure_ascii=False) + "\n")
+
+    if not args.baseline:
+        return 0
+    if args.update_baseline or not Path(args.baseline).exists():
+        Path(args.baseline).write_text(json.dumps(results, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+    failed = False
+    for engine, result in results.items():
+        expected = baseline.get(engine)
+        if expected is None:
+            print(f"{engine}: not in the baseline")
+        elif expected != result:
+            failed = True
+            print(f"{engine}: DIFFERENT from the baseline")
+            for key in ('rows', 'rows_sha256', 'playtime'):
+                if expected.get(key) != result.get(key):
+                    print(f"  {key}: expected {expected.get(key)}, got {result.get(key)}")
+        else:
+            print(f"{engine}: identical to the baseline")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+"""
+Startup cost of the GUI modules: import time and resident memory, each
+measured in a fresh interpreter. The matplotlib Qt canvas (what the
+Statistics tab used to import) is measured on its own for comparison.
+
+Usage: python -m benchmarks.bench_startup [--repeat 5] [--output startup.json]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+TARGETS = {
+    'core.log_manager': "import core.log_manager",
+    'ui.charts': "import ui.charts",
+    'ui.tabs.stats_tab': "import ui.tabs.stats_tab",
+    'ui.main_window': "import ui.main_window",
+    'main_window_shown': (
+        "from PyQt6.QtWidgets import QApplication; app = QApplication([]);"
+        "from ui.main_window import MainWindow; from core.tracker_service import TrackerService;"
+        "from core.data_manager import DataManager;"
+        "w = MainWindow(TrackerService(), DataManager()); w.show(); app.processEvents()"
+    ),
+    'matplotlib_qtagg (reference)': (
+        "import matplotlib.pyplot; from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg"
+    ),
+}
+
+SNIPPET = """
+import time
+t0 = time.perf_counter()
+{code}
+elapsed = time.perf_counter() - t0
+rss_kb = 0
+with open('/proc/self/status') as f:
+    for line in f:
+        if line.startswith('VmRSS:'):
+            rss_kb = int(line.split()[1])
+print(elapsed, rss_kb, flush=True)
+# Leave without tearing down: threads still running (queries started by the
+# window) aren't part of the startup cost
+import os
+os._exit(0)
+"""
+
+def measure(code, repeat):
+    env = dict(os.environ, QT_QPA_PLATFORM=os.environ.get('QT_QPA_PLATFORM', 'offscreen'))
+    times, rss = [], []
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, "-c", SNIPPET.format(code=code)],
+            capture_output=True, text=True, env=env, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        )
+        if result.returncode != 0:
+            return {'error': result.stderr.strip().splitlines()[-1] if result.stderr.strip() else 'failed'}
+        elapsed, rss_kb = result.stdout.split()[-2:]
+        times.append(float(elapsed))
+        rss.append(int(rss_kb))
+    return {'import_ms': round(min(times) * 1000, 1), 'rss_mb': round(min(rss) / 1024, 1)}
+
+def main():
+    parser = argparse.ArgumentParser(description="Measures GUI startup cost")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    report = {name: measure(code, args.repeat) for name, code in TARGETS.items()}
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Generates a synthetic log/YYYY-MM/activity_*.csv history for benchmarks.
+
+Usage: python -m benchmarks.history_generator OUTPUT_DIR [--years 2] [--apps 40] ...
+"""
+import argparse
+import json
+import random
+from datetime import datetime, timedelta
+from pathlib import Path
+
+HEADER = "Timestamp_Start;Timestamp_End;Duration;ActiveTime;App;Title;Status;Tags\n"
+
+GAME_TITLES = [
+    "ひぐらしのなく頃に", "東方紅魔郷 ～ the Embodiment of Scarlet Devil", "原神",
+    "STEINS;GATE", "ペルソナ5 ザ・ロイヤル", "逆転裁判", "魔法使いの夜", "Elden Ring",
+    "Hollow Knight", "月姫 -A piece of blue glass moon-", "Ys VIII", "Dorfromantik",
+]
+DESKTOP_APPS = [
+    ("firefox", "Mozilla Firefox"), ("konsole", "~ : bash — Konsole"),
+    ("dolphin", "Home — Dolphin"), ("steam", "Steam"), ("discord", "Discord"),
+    ("kate", "notes.txt — Kate"),
+]
+
+def format_duration(seconds):
+    return f"{seconds // 3600}:{(seconds % 3600) // 60:02d}:{seconds % 60:02d}"
+
+def make_games(count, rng):
+    games = []
+    for i in range(count):
+        title = GAME_TITLES[i % len(GAME_TITLES)]
+        if i >= len(GAME_TITLES):
+            title = f"{title} {i // len(GAME_TITLES) + 1}"
+        games.append((f"game{i:03d}.exe", title))
+    rng.shuffle(games)
+    return games
+
+def generate_history(log_dir, years=2, apps=40, sessions_per_day=6, background_churn=30,
+                     end=None, seed=1, write_metadata=True):
+    """
+    Writes the tree and returns a dict with dataset statistics.
+    sessions_per_day: game sessions (status Manual) per day.
+    background_churn: extra short background-mode sessions per day (focus switches).
+    """
+    rng = random.Random(seed)
+    log_dir = Path(log_dir)
+    log_dir.mkdir(parents=True, exist_ok=True)
+
+    end = end or datetime.now()
+    day = end.replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=int(365 * years))
+    games = make_games(max(1, apps - len(DESKTOP_APPS)), rng)
+    last_played = {}
+    files = rows = size = 0
+
+    while day <= end:
+        # A handful of games are "current" at any time, like a real backlog
+        window = games[(day.toordinal() // 30) % len(games):][:4] or games[:4]
+        entries = []
+        t = day + timedelta(hours=rng.randint(7, 12))
+
+        for _ in range(sessions_per_day):
+            app, title = rng.choice(window)
+            entries.append((t, rng.randint(600, 3 * 3600), app, title, "Manual"))
+            t += timedelta(seconds=entries[-1][1] + rng.randint(60, 1800))
+
+        for _ in range(background_churn):
+            app, title = rng.choice(DESKTOP_APPS + window)
+            entries.append((t, rng.randint(5, 240), app, title, "Background"))
+            t += timedelta(seconds=entries[-1][1] + rng.randint(1, 120))
+
+        entries.sort()
+        lines = [HEADER]
+        for start, length, app, title, status in entries:
+            active = rng.randint(length // 2, length)
+            stop = start + timedelta(seconds=length)
+            lines.append(
+                f"{start:%Y-%m-%d %H:%M:%S};{stop:%Y-%m-%d %H:%M:%S};"
+                f"{format_duration(length)};{format_duration(active)};"
+                f"{app};{title};{status};\n"
+            )
+            last_played[app] = {"time": stop.isoformat(), "last_title": title}
+
+        folder = log_dir / day.strftime('%Y-%m')
+        folder.mkdir(exist_ok=True)
+        text = "".join(lines)
+        (folder / f"activity_{day:%Y-%m-%d}.csv").write_text(text, encoding="utf-8")
+        files += 1
+        rows += len(entries)
+        size += len(text.encode("utf-8"))
+        day += timedelta(days=1)
+
+    if write_metadata:
+        (log_dir / ".last_played.json").write_text(
+            json.dumps(last_played, indent=4, ensure_ascii=False), encoding="utf-8"
+        )
+
+    return {"files": files, "rows": rows, "bytes": size, "apps": len(last_played)}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("output", help="Target log directory")
+    parser.add_argument("--years", type=float, default=2)
+    parser.add_argument("--apps", type=int, default=40)
+    parser.add_argument("--sessions", type=int, default=6, help="Game sessions per day")
+    parser.add_argument("--churn", type=int, default=30, help="Background-mode sessions per day")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    stats = generate_history(args.output, args.years, args.apps, args.sessions, args.churn, seed=args.seed)
+    print(json.dumps(stats))
+
+if __name__ == "__main__":
+    main()
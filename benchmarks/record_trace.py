@@ -0,0 +1,28 @@
+"""
+Records the live desktop (windows, their processes, focus, AFK) as a focus
+trace for bench_replay. Stop with Ctrl+C or --minutes.
+
+Usage: python -m benchmarks.record_trace my_day.jsonl [--minutes 60] [--interval 1] [--afk-timer 3]
+"""
+import argparse
+import signal
+from core.focus_trace import TraceRecorder
+from core.utils_factory import get_desktop_utils
+
+def main():
+    parser = argparse.ArgumentParser(description="Records the desktop focus as a replayable trace")
+    parser.add_argument("path", help="Trace file to write (JSON lines)")
+    parser.add_argument("--minutes", type=float, help="Stop after this long (default: Ctrl+C)")
+    parser.add_argument("--interval", type=float, default=1.0, help="Seconds between polls")
+    parser.add_argument("--afk-timer", type=int, default=0, help="Minutes, records AFK with swayidle when > 0")
+    args = parser.parse_args()
+
+    recorder = TraceRecorder(get_desktop_utils(), interval=args.interval, afk_timeout=args.afk_timer * 60)
+    signal.signal(signal.SIGINT, lambda *_: recorder.stop())
+    duration = args.minutes * 60 if args.minutes else None
+    print(f"Recording to {args.path}, Ctrl+C to stop")
+    count = recorder.record(args.path, duration)
+    print(f"{count} events written to {args.path}")
+
+if __name__ == "__main__":
+    main()
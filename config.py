@@ -11,6 +11,9 @@ SETTINGS_FILE = BASE_DIR / "settings.ini"
 LOG_DIR = BASE_DIR / "log"
 NOTES_DIR = BASE_DIR / "notes"
 AFK_FILE = Path("/tmp/timetracker_afk_detection_file")
+# Control/query API of the running tracker (core/control_server.py, main.py ctl).
+# Without XDG_RUNTIME_DIR the folder is created 0700 by the control server
+CONTROL_SOCKET = Path(os.environ.get("XDG_RUNTIME_DIR") or f"/tmp/playtimetracker-{os.getuid()}") / "playtimetracker.sock"
 
 # Ensure directories exist
 LOG_DIR.mkdir(parents=True, exist_ok=True)
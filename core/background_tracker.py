@@ -0,0 +1,254 @@
+import threading
+import config
+from core.system_utils import SystemUtils
+from core.clock import SYSTEM_CLOCK
+from core.live_settings import SettingsChannel
+from core.log_manager import LogManager
+from core.log_writer import LogWriter
+from core import log_parser, metrics
+
+WORKER = {'worker': 'background'}
+FOCUS_POLL = metrics.histogram("focus_poll_seconds", "Active window lookups of the tracking loops", WORKER)
+TICKS = metrics.counter("tick_wakeups_total", "Tracking loop wakeups", WORKER)
+AFK_HELP = "AFK transitions seen by the tracking loops"
+AFK_STARTED = metrics.counter("afk_transitions_total", AFK_HELP, {**WORKER, 'to': 'afk'})
+AFK_RESUMED = metrics.counter("afk_transitions_total", AFK_HELP, {**WORKER, 'to': 'active'})
+
+class BackgroundTracker:
+    """
+    Background mode tracking loop (every focused app), plain Python: run() blocks
+    until stop(). Used by the GUI through TrackerBgWorker and directly by the
+    headless daemon (core/daemon.py), so it must never import Qt.
+    """
+    def __init__(self, refresh_interval, save_interval, afk_timer, desktop_utils, on_log=None, log_dir=None, on_saved=None,
+                 clock=None, system=None):
+        self.utils = desktop_utils
+        # Time and process/AFK lookups, replaced by the focus trace replays (core/focus_trace.py)
+        self.clock = clock or SYSTEM_CLOCK
+        self.system = system or SystemUtils
+        self.on_log = on_log
+        
+        # Configuration
+        self.refresh_interval = int(refresh_interval)
+        self.save_interval = int(save_interval) * 60
+        self.afk_timer = int(afk_timer) * 60
+        self.start_tracking_threshold = 5
+        # New intervals from update_settings(), applied by the loop
+        self.settings = SettingsChannel()
+        
+        self._stop_event = threading.Event()
+        self.logger = LogManager(log_dir or config.LOG_DIR)
+        # on_saved gets the session-saved events of the writer thread
+        self.writer = LogWriter(self.logger, on_saved=on_saved)
+
+        # Current Session State
+        self.current_wid = None  # Cache the ID to detect changes cheaply
+        self.current_process = None
+        self.current_title = None
+        self.session_start = None
+        self.session_id = None
+        self.session_playtime = 0
+        self.session_line_exists = False
+        
+        # AFK State
+        self.was_afk = False
+
+    @property
+    def running(self):
+        return not self._stop_event.is_set()
+
+    def log(self, message):
+        print(f"[BG] {message}")
+        if self.on_log:
+            self.on_log(message)
+
+    def run(self):
+        self.log(f"Background Tracking Started. AFK Threshold: {self.afk_timer}s")
+
+        if self.afk_timer > 0:
+            self.system.start_afk_daemon(self.afk_timer)
+
+        self.writer.start()
+
+        last_tick = self.clock.monotonic()
+        last_log_update = last_tick
+        last_save_time = last_tick
+        last_window_check = 0
+        accumulator = 0.0
+
+        # Initial detection
+        self._detect_switch()
+
+        while self.running:
+            TICKS.inc()
+            update = self.settings.take()
+            if update:
+                self._apply_settings(*update)
+
+            now = self.clock.monotonic()
+            delta = now - last_tick
+            last_tick = now
+            accumulator += delta
+
+            # AFK Logic 
+            is_afk, _ = self.system.get_afk_status()
+
+            if is_afk and not self.was_afk:
+                self.log("Status: AFK (Paused)")
+                AFK_STARTED.inc()
+                if self.afk_timer > 0:
+                    # Subtract the threshold time that leaked into the session
+                    self.session_playtime = max(0, self.session_playtime - self.afk_timer)
+                    self._trigger_log_save() 
+                self.was_afk = True
+            elif not is_afk and self.was_afk:
+                self.log("Status: Resumed")
+                AFK_RESUMED.inc()
+                self.was_afk = False
+
+            # Window Switch Detection
+            if now - last_window_check >= 1.0:
+                self._detect_switch()
+                last_window_check = now
+
+            # Increment timer every second if focused and not AFK
+            if accumulator >= 1.0:
+                seconds_passed = int(accumulator)
+                accumulator -= seconds_passed
+
+                if self.current_process and not is_afk:
+                    self.session_playtime += seconds_passed
+            
+            # UI logging
+            #if self.refresh_interval > 0 and (now - last_log_update) >= self.refresh_interval and not is_afk:
+            #    print(f"Session playtime: {self.logger.format_duration(self.session_playtime)}")
+            #    last_log_update = now
+
+            # Autosave
+            if self.save_interval > 0 and (now - last_save_time) >= self.save_interval:
+                if self.current_process and not is_afk:
+                    self._trigger_log_save()
+                    last_save_time = now
+
+            # Returns right away when stop() is called
+            self.clock.wait(self._stop_event, 0.1)
+
+        self.system.stop_afk_daemon()
+        if self.current_process:
+            self._trigger_log_save(is_final=True)
+        self.writer.stop()
+        self.log(f"Log writer: {self.writer.stats()}")
+        self.log("Background Tracking Stopped.")
+
+    def _apply_settings(self, refresh_interval, save_interval, afk_timer):
+        """
+        Takes new intervals without ending the session: the autosave deadline
+        moves with save_interval, swayidle restarts only if the threshold changed.
+        """
+        self.refresh_interval = refresh_interval
+        self.save_interval = save_interval * 60
+        if afk_timer * 60 != self.afk_timer:
+            self.system.stop_afk_daemon()
+            self.afk_timer = afk_timer * 60
+            if self.afk_timer > 0:
+                self.system.start_afk_daemon(self.afk_timer)
+        self.log(f"Settings applied: save every {self.save_interval}s, AFK Threshold: {self.afk_timer}s")
+
+    def _detect_switch(self):
+        """
+        Check if active window has changed.
+        Initialize session for new process
+        """
+        try:
+            with FOCUS_POLL.time():
+                active_wid = self.utils.get_active_window_id()
+            
+            # if no change do nothing
+            if not active_wid or active_wid == self.current_wid:
+                return
+
+            # Logic when Switched tabs
+            
+            # Save the previous session
+            if self.current_process:
+                self._trigger_log_save(is_final=True)
+
+            # Get data from new window
+            pid = self.utils.get_window_pid(active_wid)
+            if not pid:
+                # If we can't get a PID just reset tracking
+                self.current_wid = active_wid
+                self.current_process = None
+                return
+
+            process_name = self.system.get_app_name_from_pid(pid)
+            _, title = self.utils.find_window_by_pid(pid)
+            
+            # For sub processes without title
+            if not title: title = "Unknown"
+
+            # Initialize new session state
+            self.current_wid = active_wid
+            self.current_process = process_name
+            self.current_title = title
+            self.session_start = self.clock.now()
+            self.session_id = log_parser.new_session_id()
+            self.session_playtime = 0
+            self.session_line_exists = False
+            
+            self.log(f"Switched to: {title} ({process_name})")
+
+        except Exception as e:
+            self.log(f"Tracking Error: {e}")
+            pass
+
+    def _trigger_log_save(self, is_final=False):
+        if not self.current_process: return
+
+        if self.session_playtime < self.start_tracking_threshold:
+            return
+
+        now = self.clock.now()
+        wall_duration = int((now - self.session_start).total_seconds())
+
+        session_data = {
+            'start': self.session_start,
+            'end': now,
+            'duration': wall_duration,
+            'active_time': self.session_playtime,
+            'app': self.current_process,
+            'title': self.current_title,
+            'status': "Background",
+            'tags': "",
+            'id': self.session_id
+        }
+
+        self.writer.submit(session_data, is_update=self.session_line_exists, final=is_final)
+        self.session_line_exists = True
+
+        readable = self.logger.format_duration(self.session_playtime)
+        self.log(f"Saved: {self.current_process} - Time: {readable}")
+
+    def snapshot(self):
+        """Current session and focus state (control API), safe from any thread."""
+        start = self.session_start
+        return {
+            'mode': 'background',
+            'app': self.current_process,
+            'title': self.current_title,
+            'session_id': self.session_id,
+            'session_start': start.isoformat(timespec='seconds') if start else None,
+            'session_seconds': self.session_playtime,
+            'saved_seconds': self.writer.saved_active(self.session_id),
+            'focused': self.current_process is not None,
+            'afk': self.was_afk,
+        }
+
+    def update_settings(self, refresh_interval, save_interval, afk_timer):
+        """Thread safe, same units as the constructor. Applied on the next tick."""
+        self.settings.put(refresh_interval, save_interval, afk_timer)
+
+    def stop(self):
+        """Thread and signal handler safe, run() returns after the final save."""
+        self._stop_event.set()
+        
\ No newline at end of file
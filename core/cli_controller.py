@@ -1,8 +1,15 @@
 import os
-from PyQt6.QtCore import QObject, QTimer
+import threading
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+import config
 from core.system_utils import SystemUtils
+from core.log_manager import LogManager
+from core.control_server import ControlServer, TodayTotals, tracker_commands
 
 class CliController(QObject):
+    # Runs a call from a control server thread on the GUI thread
+    _gui_call = pyqtSignal(object)
+
     def __init__(self, main_window, tracker_service, data_manager):
         super().__init__()
         self.window = main_window
@@ -10,18 +17,11 @@ class CliController(QObject):
         self.data = data_manager
         self.auto_timer = None
         self.target_process = None
+        self.control_server = None
+        self._gui_call.connect(self._run_gui_call)
 
     def handle_args(self, args):
-        if args.background:
-            print("Launching in Background Mode...")
-
-            refresh = self.data.settings.get('LOG_REFRESH_TIMER', 60)
-            save = self.data.settings.get('LOG_PERIODIC_SAVE', 5)
-            afk = self.data.settings.get('AFK_TIMER', 0)
-
-            self.tracker.background_tracking(refresh, save, afk)
-            return
-
+        # --background runs headless (core/daemon.py) and never gets here
         if args.target:
             self.start_auto_tracking(args.target)
 
@@ -54,4 +54,56 @@ class CliController(QObject):
             self.auto_timer.stop()
             self.window.tracking_tab.append_log(f"Success! Found Window: {title}")
             print(f"Success! Found Window: {title}")
-            self.window.tracking_tab.start_tracking_with_params(title)
\ No newline at end of file
+            self.window.tracking_tab.start_tracking_with_params(title)
+
+    # --- Control API (main.py ctl) ---
+
+    def start_control_server(self):
+        totals = TodayTotals(LogManager(config.LOG_DIR))
+        self.tracker.session_saved.connect(totals.on_saved)
+        commands = tracker_commands(
+            self._running_tracker, totals,
+            start=lambda target: self.call_in_gui(self._start_target, target),
+            stop=lambda: self.call_in_gui(self._stop_tracking),
+        )
+        self.control_server = ControlServer(commands)
+        try:
+            self.control_server.start()
+        except (RuntimeError, OSError) as e:
+            print(f"[CTL] Control socket disabled: {e}")
+            self.control_server = None
+
+    def stop_control_server(self):
+        if self.control_server:
+            self.control_server.stop()
+            self.control_server = None
+
+    def _running_tracker(self):
+        worker = self.tracker.worker
+        return worker if worker is not None and worker.isRunning() else None
+
+    def _start_target(self, title):
+        self.window.tracking_tab.start_tracking_with_params(title)
+        return {'tracking': self._running_tracker() is not None}
+
+    def _stop_tracking(self):
+        self.window.tracking_tab.stop_tracking()
+        return {'tracking': False}
+
+    def call_in_gui(self, fn, *args, timeout=10.0):
+        """Runs fn(*args) on the GUI thread and returns its result (control server threads)."""
+        call = {'fn': fn, 'args': args, 'done': threading.Event()}
+        self._gui_call.emit(call)
+        if not call['done'].wait(timeout):
+            raise TimeoutError("The GUI did not answer in time")
+        if 'error' in call:
+            raise call['error']
+        return call['result']
+
+    def _run_gui_call(self, call):
+        try:
+            call['result'] = call['fn'](*call['args'])
+        except Exception as e:
+            call['error'] = e
+        finally:
+            call['done'].set()
@@ -1,14 +1,19 @@
 import argparse
+import sys
 import config
 
+CTL_COMMANDS = ("ping", "status", "today", "flush", "start", "stop")
+
 class CliHandler:
     def __init__(self):
         # The description appears at the top of the help menu
         self.parser = argparse.ArgumentParser(
             description="PlayTimeTracker - A game time tracking utility for KDE Wayland 6.",
-            formatter_class=argparse.RawDescriptionHelpFormatter
+            formatter_class=argparse.RawDescriptionHelpFormatter,
+            epilog="Query or control a running tracker: main.py ctl {" + ",".join(CTL_COMMANDS) + "} [title]"
         )
         self._setup_args()
+        self.ctl_parser = self._ctl_parser()
 
     def _setup_args(self):
         self.parser.add_argument(
@@ -33,5 +38,66 @@ class CliHandler:
             help="Start tracking all applications in background mode no UI."
         )
 
-    def parse(self):
-        return self.parser.parse_args()
\ No newline at end of file
+        # Log maintenance
+        self.parser.add_argument(
+            "--seal-months",
+            action="store_true",
+            help="Convert every closed month of logs into a compact binary archive and exit."
+        )
+
+        self.parser.add_argument(
+            "--unseal",
+            metavar="YYYY-MM",
+            help="Re-expand the archive of a sealed month into daily CSV files (for manual editing) and exit."
+        )
+
+        self.parser.add_argument(
+            "--startup-profile",
+            action="store_true",
+            help="Print how long imports and the construction of each tab take."
+        )
+
+        self.parser.add_argument(
+            "--profile",
+            nargs="?",
+            const="",
+            metavar="DIR",
+            help="Sample every thread's stack and traced memory while running, reports written to DIR (default profile/<date>) on exit."
+        )
+
+        self.parser.add_argument(
+            "--profile-interval",
+            type=float,
+            default=10,
+            metavar="MS",
+            help="Milliseconds between --profile stack samples (default 10)."
+        )
+
+    def _ctl_parser(self):
+        parser = argparse.ArgumentParser(
+            prog="main.py ctl",
+            description="Sends a command to the running tracker (GUI or --background) and prints the JSON reply."
+        )
+        parser.add_argument(
+            "ctl_command",
+            choices=CTL_COMMANDS,
+            metavar="command",
+            help="ping | status (current session and focus) | today (today's totals) | flush (write pending saves now) | start TITLE | stop"
+        )
+        parser.add_argument(
+            "target",
+            nargs="?",
+            help="Window title to track, for start."
+        )
+        return parser
+
+    def parse(self, argv=None):
+        argv = sys.argv[1:] if argv is None else argv
+        # "ctl" can't be a subparser: the optional positional target would take it
+        if argv[:1] == ["ctl"]:
+            args = self.ctl_parser.parse_args(argv[1:])
+            args.command = "ctl"
+            return args
+        args = self.parser.parse_args(argv)
+        args.command = None
+        return args
\ No newline at end of file
@@ -0,0 +1,68 @@
+import heapq
+import itertools
+import time
+from datetime import datetime, timedelta
+
+class SystemClock:
+    """Real time, what the tracking loops use outside of replays."""
+    def monotonic(self):
+        return time.monotonic()
+
+    def now(self):
+        return datetime.now()
+
+    def sleep(self, seconds):
+        time.sleep(seconds)
+
+    def wait(self, event, seconds):
+        """event.wait(seconds): True if the event is set."""
+        return event.wait(seconds)
+
+SYSTEM_CLOCK = SystemClock()
+
+class VirtualClock:
+    """
+    Clock only moved forward by the loop waiting on it: sleep()/wait() return at
+    once after advancing the time, so a day of tracking replays in seconds.
+    Time is kept in integer microseconds, the same waits always give the same
+    readings. Meant for one tracking loop (the thread calling sleep/wait).
+    """
+    # monotonic() starts here, like a machine that has been up for a while
+    # (the loops compare against 0 for their first checks)
+    MONOTONIC_ORIGIN = 100000.0
+
+    def __init__(self, start):
+        self.start = start        # Wall clock datetime at elapsed 0
+        self.elapsed_us = 0
+        self.waits = 0            # sleep()/wait() calls, one per loop tick
+        self._alarms = []         # heap of (elapsed_us, order, callback)
+        self._order = itertools.count() # Tiebreak: same-time alarms run in call_at order
+
+    @property
+    def elapsed(self):
+        return self.elapsed_us / 1e6
+
+    def monotonic(self):
+        return self.MONOTONIC_ORIGIN + self.elapsed
+
+    def now(self):
+        return self.start + timedelta(microseconds=self.elapsed_us)
+
+    def sleep(self, seconds):
+        self.advance(seconds)
+
+    def wait(self, event, seconds):
+        if not event.is_set():
+            self.advance(seconds)
+        return event.is_set()
+
+    def advance(self, seconds):
+        self.elapsed_us += round(seconds * 1e6)
+        self.waits += 1
+        while self._alarms and self._alarms[0][0] <= self.elapsed_us:
+            _, _, callback = heapq.heappop(self._alarms)
+            callback()
+
+    def call_at(self, seconds, callback):
+        """Runs callback() once elapsed reaches seconds (e.g. the tracker's stop())."""
+        heapq.heappush(self._alarms, (round(seconds * 1e6), next(self._order), callback))
@@ -0,0 +1,206 @@
+import json
+import os
+import socket
+import socketserver
+import stat
+import threading
+from datetime import date
+import config
+
+# Longest request line accepted, requests are a few dozen bytes
+MAX_REQUEST = 65536
+
+class TodayTotals:
+    """
+    Playtime of today per app, kept in memory from the LogWriter session-saved
+    events. The logs are read once, on the first query; events arriving before
+    that are already on disk by then and are skipped.
+
+    The running session's unsaved playtime is added on top. What it saved so
+    far is already in the logs: saved starts from the tracker's saved_seconds
+    the first time the session is seen (after the logs were read), then
+    follows its events.
+    """
+    def __init__(self, log_manager):
+        self.log_manager = log_manager
+        self.lock = threading.Lock()
+        self.day = None
+        self.totals = {} # {app: seconds}
+        self.saved = {}  # {session id: active seconds saved today}
+
+    def on_saved(self, event):
+        with self.lock:
+            if self.day is None or event['day'] != self.day:
+                return
+            self.totals[event['app']] = self.totals.get(event['app'], 0) + event['delta']
+            if event['id']:
+                self.saved[event['id']] = event['saved']
+
+    def snapshot(self, session=None):
+        """
+        {app: seconds} of today. session: tracker snapshot() whose playtime not
+        saved yet (session_seconds - saved_seconds) is added to its app.
+        """
+        with self.lock:
+            today = date.today()
+            if self.day != today:
+                summary = self.log_manager.get_global_summary("Today")
+                self.totals = {app: seconds for app, seconds, _ in summary}
+                self.saved = {}
+                self.day = today
+            totals = dict(self.totals)
+            if session and session.get('app') and session.get('session_start', '')[:10] == today.isoformat():
+                saved = self.saved.setdefault(session['session_id'], session.get('saved_seconds', 0))
+                unsaved = session['session_seconds'] - saved
+                if unsaved > 0:
+                    totals[session['app']] = totals.get(session['app'], 0) + unsaved
+        return totals
+
+def tracker_commands(get_tracker, totals, start=None, stop=None):
+    """
+    Commands of the tracker API: {name: fn(request) -> reply fields}.
+    get_tracker returns the running tracker (with snapshot() and writer) or None.
+    start(target) / stop() are omitted where they make no sense.
+    """
+    def status(request):
+        tracker = get_tracker()
+        if tracker is None:
+            return {'tracking': False}
+        return {'tracking': True, **tracker.snapshot()}
+
+    def today(request):
+        tracker = get_tracker()
+        apps = totals.snapshot(tracker.snapshot() if tracker else None)
+        return {
+            'day': date.today().isoformat(),
+            'total_seconds': sum(apps.values()),
+            'apps': dict(sorted(apps.items(), key=lambda x: x[1], reverse=True)),
+        }
+
+    def flush(request):
+        tracker = get_tracker()
+        if tracker is None:
+            return {'flushed': False}
+        return {'flushed': tracker.writer.flush(timeout=float(request.get('timeout', 5)))}
+
+    commands = {
+        'ping': lambda request: {'version': config.VERSION},
+        'status': status,
+        'today': today,
+        'flush': flush,
+    }
+    if start is not None:
+        def start_command(request):
+            target = request.get('target')
+            if not target:
+                raise ValueError("start needs a 'target' window title")
+            return start(target) or {}
+        commands['start'] = start_command
+    if stop is not None:
+        commands['stop'] = lambda request: stop() or {}
+    return commands
+
+class _ControlHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        while True:
+            line = self.rfile.readline(MAX_REQUEST)
+            if not line:
+                return
+            if not line.strip():
+                continue
+            reply = self.server.dispatch(line)
+            self.wfile.write(json.dumps(reply, default=str).encode() + b"\n")
+            self.wfile.flush()
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+class ControlServer:
+    """
+    Local control/query API of a running tracker (GUI or background): a Unix
+    socket in the user's runtime directory speaking line-delimited JSON.
+    Each request is one object with a 'cmd' key, e.g. {"cmd": "status"}; each
+    reply is one object with 'ok' and either the command's fields or 'error'.
+    Commands answer from memory, see tracker_commands().
+    """
+    def __init__(self, commands, path=None):
+        self.commands = commands
+        self.path = str(path or config.CONTROL_SOCKET)
+        self.server = None
+        self.thread = None
+
+    def start(self):
+        """
+        Starts serving in a daemon thread. RuntimeError if another tracker owns
+        the socket or its folder isn't private to this user.
+        """
+        _private_folder(os.path.dirname(self.path))
+        if os.path.exists(self.path):
+            if _is_listening(self.path):
+                raise RuntimeError(f"Another tracker is already listening on {self.path}")
+            # Left behind by a tracker that didn't exit cleanly
+            os.unlink(self.path)
+
+        # The socket is created 0600, there is no moment where others can connect
+        umask = os.umask(0o177)
+        try:
+            self.server = _UnixServer(self.path, _ControlHandler)
+        finally:
+            os.umask(umask)
+        self.server.dispatch = self.dispatch
+        self.thread = threading.Thread(target=self.server.serve_forever, name="ControlServer", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        if self.server is None:
+            return
+        self.server.shutdown()
+        self.server.server_close()
+        self.server = None
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+    def dispatch(self, line):
+        """One request line -> reply dict."""
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("request must be a JSON object")
+            command = self.commands.get(request.get('cmd'))
+            if command is None:
+                raise ValueError(f"unknown command {request.get('cmd')!r}, expected one of {sorted(self.commands)}")
+            return {'ok': True, **command(request)}
+        except Exception as e:
+            return {'ok': False, 'error': str(e)}
+
+def _private_folder(folder):
+    """Creates folder (0700) if missing, RuntimeError if it isn't owned by this user and closed to others."""
+    os.makedirs(folder, mode=0o700, exist_ok=True)
+    st = os.lstat(folder)
+    if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or st.st_mode & 0o077:
+        raise RuntimeError(f"{folder} must be a folder owned by this user with mode 0700")
+
+def _is_listening(path):
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(path)
+        return True
+    except OSError:
+        return False
+
+def send_command(cmd, path=None, timeout=5.0, **params):
+    """
+    Client side: sends one request to the running tracker and returns its reply.
+    OSError (e.g. ConnectionRefusedError, FileNotFoundError) when none is running.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(str(path or config.CONTROL_SOCKET))
+        sock.sendall(json.dumps({'cmd': cmd, **params}).encode() + b"\n")
+        with sock.makefile('rb') as f:
+            line = f.readline(MAX_REQUEST)
+    if not line:
+        raise ConnectionError("The tracker closed the connection without replying")
+    return json.loads(line)
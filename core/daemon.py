@@ -0,0 +1,54 @@
+import signal
+import config
+from core import metrics
+from core.background_tracker import BackgroundTracker
+from core.control_server import ControlServer, TodayTotals, tracker_commands
+from core.data_manager import DataManager
+from core.live_settings import SettingsWatcher, tracker_listener
+from core.log_manager import LogManager
+from core.utils_factory import get_desktop_utils
+
+def run_daemon(data_manager=None):
+    """
+    Headless background mode (main.py --background): tracks every focused app
+    without Qt until SIGTERM/SIGINT, suitable for a systemd user service.
+    Returns the process exit code.
+    """
+    data = data_manager or DataManager()
+    try:
+        desktop_utils = get_desktop_utils()
+    except RuntimeError as e:
+        print(f"Critical Startup Error: {e}")
+        return 1
+
+    print("Launching in Background Mode...")
+    refresh = data.settings.get('LOG_REFRESH_TIMER', 60)
+    save = data.settings.get('LOG_PERIODIC_SAVE', 5)
+    afk = data.settings.get('AFK_TIMER', 0)
+    exporter = metrics.configure(data.settings)
+    totals = TodayTotals(LogManager(config.LOG_DIR))
+    tracker = BackgroundTracker(refresh, save, afk, desktop_utils, on_saved=totals.on_saved)
+    # Edits of settings.ini apply to the running tracker
+    data.add_settings_listener(tracker_listener(data, tracker.update_settings))
+    watcher = SettingsWatcher(data).start()
+
+    # "stop" ends the daemon, "start" doesn't apply: every app is tracked
+    server = ControlServer(tracker_commands(lambda: tracker, totals, stop=tracker.stop))
+    try:
+        server.start()
+    except (RuntimeError, OSError) as e:
+        print(f"[CTL] Control socket disabled: {e}")
+
+    def request_stop(signum, frame):
+        tracker.stop()
+
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+
+    # Blocks until stopped, the final save is flushed before returning
+    tracker.run()
+    watcher.stop()
+    server.stop()
+    if exporter:
+        exporter.stop()
+    return 0
@@ -1,29 +1,56 @@
 import os
 import datetime
+import threading
 from pathlib import Path
 import config
 from collections import OrderedDict
 
 class DataManager:
     def __init__(self):
-        self.settings = {'LOG_REFRESH_TIMER': 0, 'ENABLE_ONLY_WINE': 0, 'LOG_PERIODIC_SAVE': 0, 'AFK_TIMER': 0}
+        self.settings = {
+            'LOG_REFRESH_TIMER': 0, 'ENABLE_ONLY_WINE': 0, 'LOG_PERIODIC_SAVE': 0, 'AFK_TIMER': 0,
+            'CONSOLE_MAX_LINES': 5000, 'METRICS_PORT': 0, 'METRICS_FILE': ''
+        }
+        self.defaults = dict(self.settings)
+        self._listeners = []
+        self._reload_lock = threading.Lock()
         self.load_settings()
 
     def load_settings(self):
+        """Reads settings.ini (missing keys get their default), returns {key: value} of what changed."""
+        settings = dict(self.defaults)
         if config.SETTINGS_FILE.exists():
             content = config.SETTINGS_FILE.read_text()
             for line in content.splitlines():
                 if '=' in line and not line.strip().startswith('#'):
                     key, val = map(str.strip, line.split('=', 1))
-                    if key in self.settings:
+                    if key in settings:
                         try:
-                            self.settings[key] = int(val)
+                            settings[key] = int(val)
                         except ValueError:
-                            self.settings[key] = val
+                            settings[key] = val
+        changed = {key: val for key, val in settings.items() if self.settings[key] != val}
+        # Swapped whole, readers on other threads never see a half-loaded dict
+        self.settings = settings
+        return changed
+
+    def reload_settings(self):
+        """Re-reads settings.ini and passes what changed to the listeners (on this thread)."""
+        with self._reload_lock:
+            changed = self.load_settings()
+            if changed:
+                print(f"[SETTINGS] Reloaded: {', '.join(f'{k}={v}' for k, v in changed.items())}")
+                for listener in list(self._listeners):
+                    listener(changed)
+        return changed
+
+    def add_settings_listener(self, callback):
+        """callback(changed) after each reload that changed something: {key: new value}."""
+        self._listeners.append(callback)
 
     def save_settings_text(self, text):
         config.SETTINGS_FILE.write_text(text, encoding='utf-8')
-        self.load_settings()
+        self.reload_settings()
 
     def get_note(self, app_name):
         note_file = config.NOTES_DIR / f"notes_{app_name}.txt"
@@ -0,0 +1,226 @@
+"""
+Focus traces: what the desktop looked like over time (windows, their pids and
+processes, the focused window, AFK), recorded from a live desktop backend and
+replayed deterministically into the tracking loops with a VirtualClock.
+
+A trace file is JSON lines: a header, then one event per change, then an end:
+    {"type": "trace", "version": 1, "start": "2026-01-05T08:00:00"}
+    {"t": 0.0, "type": "process", "pid": "4242", "app": "game.exe", "wine": true}
+    {"t": 0.0, "type": "window", "wid": "{...}", "title": "Game", "pid": "4242"}
+    {"t": 12.0, "type": "focus", "wid": "{...}"}          (wid null: nothing focused)
+    {"t": 600.0, "type": "afk", "afk": true}
+    {"t": 900.0, "type": "close", "wid": "{...}"}
+    {"t": 3600.0, "type": "end"}
+t is seconds since the start of the recording.
+"""
+import json
+import ntpath
+import threading
+from datetime import datetime
+from core.clock import SYSTEM_CLOCK
+from core.desktop_utils_interface import DesktopUtilsInterface
+from core.system_utils import SystemUtils
+
+TRACE_VERSION = 1
+
+class FocusTrace:
+    def __init__(self, start, events, duration):
+        self.start = start       # datetime of t = 0
+        self.events = events     # [event dict] sorted by t
+        self.duration = duration # seconds
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding="utf-8") as f:
+            header = json.loads(f.readline())
+            if header.get('type') != 'trace' or header.get('version') != TRACE_VERSION:
+                raise ValueError(f"{path} is not a version {TRACE_VERSION} focus trace")
+            events = [json.loads(line) for line in f if line.strip()]
+        duration = events[-1]['t'] if events else 0.0
+        events = [e for e in events if e['type'] != 'end']
+        return cls(datetime.fromisoformat(header['start']), events, duration)
+
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            writer = TraceWriter(f, self.start)
+            for event in self.events:
+                writer.write(event)
+            writer.end(self.duration)
+
+class TraceWriter:
+    def __init__(self, f, start):
+        self.f = f
+        self.count = 0
+        self._line({'type': 'trace', 'version': TRACE_VERSION, 'start': start.isoformat(timespec='seconds')})
+
+    def write(self, event):
+        self._line(event)
+        self.count += 1
+
+    def end(self, t):
+        self._line({'t': t, 'type': 'end'})
+
+    def _line(self, obj):
+        self.f.write(json.dumps(obj, ensure_ascii=False) + "\n")
+
+class TraceRecorder:
+    """
+    Polls a live desktop backend every interval seconds and writes the changes
+    as a focus trace. system provides the AFK status and the process names
+    (SystemUtils, the swayidle observer is started when afk_timeout > 0).
+    """
+    def __init__(self, desktop_utils, system=SystemUtils, clock=SYSTEM_CLOCK, interval=1.0, afk_timeout=0):
+        self.utils = desktop_utils
+        self.system = system
+        self.clock = clock
+        self.interval = interval
+        self.afk_timeout = afk_timeout
+        self._stop_event = threading.Event()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def record(self, path, duration=None):
+        """Records until stop() or for duration seconds. Returns the number of events."""
+        if self.afk_timeout > 0:
+            self.system.start_afk_daemon(self.afk_timeout)
+        windows, processes = {}, set()
+        focus, afk = None, False
+        t0 = self.clock.monotonic()
+        with open(path, "w", encoding="utf-8") as f:
+            writer = TraceWriter(f, self.clock.now())
+            try:
+                while True:
+                    t = round(self.clock.monotonic() - t0, 3)
+                    current = self._windows()
+                    for wid, (title, pid) in current.items():
+                        if pid not in processes and pid.isdigit() and pid != "0":
+                            processes.add(pid)
+                            writer.write({
+                                't': t, 'type': 'process', 'pid': pid,
+                                'app': self.system.get_app_name_from_pid(pid),
+                                'wine': self.system.is_wine_or_proton(int(pid)),
+                            })
+                        if windows.get(wid) != (title, pid):
+                            writer.write({'t': t, 'type': 'window', 'wid': wid, 'title': title, 'pid': pid})
+                    for wid in windows.keys() - current.keys():
+                        writer.write({'t': t, 'type': 'close', 'wid': wid})
+                    windows = current
+
+                    active = self.utils.get_active_window_id()
+                    if active != focus:
+                        focus = active
+                        writer.write({'t': t, 'type': 'focus', 'wid': active})
+
+                    is_afk, _ = self.system.get_afk_status()
+                    if is_afk != afk:
+                        afk = is_afk
+                        writer.write({'t': t, 'type': 'afk', 'afk': is_afk})
+                    f.flush()
+
+                    if duration is not None and t >= duration:
+                        break
+                    if self.clock.wait(self._stop_event, self.interval):
+                        break
+            finally:
+                writer.end(round(self.clock.monotonic() - t0, 3))
+                if self.afk_timeout > 0:
+                    self.system.stop_afk_daemon()
+        return writer.count
+
+    def _windows(self):
+        windows = {}
+        for wid in self.utils.get_all_window_ids():
+            windows[wid] = (self.utils.get_window_name(wid), str(self.utils.get_window_pid(wid)))
+        return windows
+
+class ReplayBackend(DesktopUtilsInterface):
+    """
+    Desktop backend and SystemUtils stand-in answering from a focus trace at
+    the clock's time. Pass it as both desktop_utils and system to a tracker
+    driven by the same VirtualClock.
+    """
+    def __init__(self, trace, clock):
+        self.trace = trace
+        self.clock = clock
+        self._next = 0
+        self.windows = {}   # {wid: (title, pid)}
+        self.processes = {} # {pid: (app, wine)}
+        self.focus = None
+        self.afk_since = None
+
+    def _sync(self):
+        t = self.clock.elapsed
+        events = self.trace.events
+        while self._next < len(events) and events[self._next]['t'] <= t:
+            event = events[self._next]
+            self._next += 1
+            kind = event['type']
+            if kind == 'window':
+                self.windows[event['wid']] = (event['title'], event['pid'])
+            elif kind == 'close':
+                self.windows.pop(event['wid'], None)
+            elif kind == 'focus':
+                self.focus = event['wid']
+            elif kind == 'afk':
+                self.afk_since = event['t'] if event['afk'] else None
+            elif kind == 'process':
+                self.processes[event['pid']] = (event['app'], event['wine'])
+
+    # --- DesktopUtilsInterface ---
+
+    def get_all_window_ids(self):
+        self._sync()
+        return list(self.windows)
+
+    def get_window_name(self, wid):
+        self._sync()
+        return self.windows.get(wid, ("Unknown", "0"))[0]
+
+    def get_window_pid(self, wid):
+        self._sync()
+        return self.windows.get(wid, ("Unknown", "0"))[1]
+
+    def get_active_window_id(self):
+        self._sync()
+        return self.focus
+
+    def find_window_id_by_title(self, target_title):
+        self._sync()
+        return next((wid for wid, (title, _) in self.windows.items() if title == target_title), None)
+
+    def find_window_by_pid(self, target_pid):
+        self._sync()
+        target_pid = str(target_pid)
+        return next(((wid, title) for wid, (title, pid) in self.windows.items() if pid == target_pid), (None, None))
+
+    # --- SystemUtils ---
+
+    def get_afk_status(self):
+        self._sync()
+        if self.afk_since is None:
+            return False, 0
+        return True, int(self.clock.elapsed - self.afk_since)
+
+    def get_app_name_from_pid(self, pid):
+        self._sync()
+        return self.processes.get(str(pid), ("Unknown", False))[0]
+
+    def is_wine_or_proton(self, pid):
+        self._sync()
+        return self.processes.get(str(pid), ("Unknown", False))[1]
+
+    def get_pid_by_name(self, process_name):
+        """pid of an open window whose process is process_name, like pgrep -f."""
+        self._sync()
+        name = ntpath.basename(process_name)
+        for _, pid in self.windows.values():
+            if self.processes.get(pid, ("", False))[0] == name:
+                return pid
+        return None
+
+    def start_afk_daemon(self, timeout_seconds):
+        return None
+
+    def stop_afk_daemon(self):
+        pass
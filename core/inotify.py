@@ -0,0 +1,108 @@
+"""
+Minimal inotify binding (ctypes on libc, no dependency): watch descriptors
+on files or folders, events read with a timeout, and wake() to unblock a
+reader thread that should stop. Linux only, available() tells.
+"""
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+from collections import namedtuple
+
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+
+# struct inotify_event: int wd; uint32 mask, cookie, len; char name[len]
+_HEADER = struct.Struct("iIII")
+
+Event = namedtuple("Event", "wd mask cookie name")
+
+_libc = None
+
+def _load():
+    global _libc
+    if _libc is None:
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        _libc = libc
+    return _libc
+
+def available():
+    try:
+        return hasattr(_load(), "inotify_init1")
+    except OSError:
+        return False
+
+class Inotify:
+    def __init__(self):
+        self._libc = _load()
+        self.fd = self._check(self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC))
+        self._wake_r, self._wake_w = os.pipe2(os.O_NONBLOCK | os.O_CLOEXEC)
+
+    def _check(self, result):
+        if result < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        return result
+
+    def add_watch(self, path, mask):
+        """Watch descriptor of path, the same one if it was already watched."""
+        return self._check(self._libc.inotify_add_watch(self.fd, os.fsencode(path), mask))
+
+    def remove_watch(self, wd):
+        # EINVAL when the kernel already dropped it (deleted folder)
+        self._libc.inotify_rm_watch(self.fd, wd)
+
+    def read(self, timeout=None):
+        """Pending events, waiting up to timeout seconds (None: until one or wake()). [] if none."""
+        ready, _, _ = select.select([self.fd, self._wake_r], [], [], timeout)
+        if self._wake_r in ready:
+            try:
+                os.read(self._wake_r, 64)
+            except BlockingIOError:
+                pass
+        if self.fd not in ready:
+            return []
+
+        events = []
+        while True:
+            try:
+                data = os.read(self.fd, 65536)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, cookie, length = _HEADER.unpack_from(data, offset)
+                offset += _HEADER.size
+                name = data[offset:offset + length].rstrip(b"\0")
+                offset += length
+                events.append(Event(wd, mask, cookie, os.fsdecode(name)))
+        return events
+
+    def wake(self):
+        """Makes a blocked read() return, from any thread."""
+        try:
+            os.write(self._wake_w, b"\0")
+        except BlockingIOError:
+            pass
+
+    def close(self):
+        for fd in (self.fd, self._wake_r, self._wake_w):
+            os.close(fd)
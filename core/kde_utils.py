@@ -6,6 +6,11 @@ import tempfile
 import os
 from core.system_utils import SystemUtils
 from core.desktop_utils_interface import DesktopUtilsInterface
+from core import metrics
+
+KWIN_SCRIPT = metrics.histogram("kwin_script_seconds", "KWin script round trips (load, run, read the journal)")
+KWIN_SCRIPT_ERRORS = metrics.counter("kwin_script_errors_total", "KWin script round trips that failed")
+JOURNALCTL = metrics.histogram("journalctl_seconds", "journalctl calls reading the KWin script output")
 
 class KdeUtils(DesktopUtilsInterface):
     def __init__(self):
@@ -48,6 +53,14 @@ class KdeUtils(DesktopUtilsInterface):
 
     def _run_kwin_script(self, js_code):
         """ Helper to execute JS and get journal output."""
+        with KWIN_SCRIPT.time():
+            try:
+                return self._kwin_script_round_trip(js_code)
+            except Exception:
+                KWIN_SCRIPT_ERRORS.inc()
+                raise
+
+    def _kwin_script_round_trip(self, js_code):
         script_name = f"tracker-{uuid.uuid4().hex[:8]}"
         start_time = "-2s"
         temp_path = None
@@ -66,11 +79,12 @@ class KdeUtils(DesktopUtilsInterface):
             # Short delay
             time.sleep(0.05)
 
-            return subprocess.check_output([
-                "journalctl", "--since", start_time, "--user",
-                "-u", "plasma-kwin_wayland.service",
-                "--output=cat", "-q" # -q for quiet/faster
-            ], text=True)
+            with JOURNALCTL.time():
+                return subprocess.check_output([
+                    "journalctl", "--since", start_time, "--user",
+                    "-u", "plasma-kwin_wayland.service",
+                    "--output=cat", "-q" # -q for quiet/faster
+                ], text=True)
         finally:
             if temp_path: os.remove(temp_path)
             if script_id != -1:
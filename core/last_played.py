@@ -0,0 +1,132 @@
+import atexit
+import json
+import os
+import threading
+from pathlib import Path
+
+class LastPlayedStore:
+    """
+    In-memory owner of log/.last_played.json ({app: {"time", "last_title"}}).
+
+    There is one store per file in the process (see for_path), updates are
+    O(1) dict writes and the file is rewritten atomically (temp file + rename)
+    on a debounce timer and at exit, instead of on every new session.
+    """
+    _stores = {}
+    _stores_lock = threading.Lock()
+
+    @classmethod
+    def for_path(cls, path, debounce=5.0):
+        path = Path(path).resolve()
+        with cls._stores_lock:
+            store = cls._stores.get(path)
+            if store is None:
+                store = cls._stores[path] = cls(path, debounce)
+            return store
+
+    def __init__(self, path, debounce=5.0):
+        self.path = Path(path)
+        self.debounce = debounce
+        self.lock = threading.RLock()
+        self._data = None  # Loaded lazily
+        self._mtime = None # Of the file as we last read/wrote it
+        self._complete = False # False while only holding updates made after the file went missing
+        self._dirty = False
+        self._timer = None
+        atexit.register(self.flush)
+
+    def load(self):
+        """
+        Makes sure the data is in memory. The file is only read again if
+        another process changed it, returns False if it doesn't exist
+        (the caller should rebuild it with replace()).
+        """
+        with self.lock:
+            if self._dirty:
+                return self._complete
+            mtime = self._file_mtime()
+            if mtime is None:
+                self._data = None
+                return False
+            if self._data is not None and mtime == self._mtime:
+                return True
+            try:
+                self._data = self._read()
+                self._mtime = mtime
+                self._complete = True
+                return True
+            except Exception as e:
+                print(f"[LOG ERROR] {e}")
+                return False
+
+    def _read(self):
+        return json.loads(self.path.read_text(encoding="utf-8"))
+
+    def _file_mtime(self):
+        try:
+            return self.path.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def update(self, app_name, time_iso, title):
+        with self.lock:
+            if self._data is None and not self.load():
+                self._data = {}
+                self._complete = False
+            # Store clean App Name as Key, but save Title inside
+            self._data[app_name] = {"time": time_iso, "last_title": title}
+            self._schedule()
+
+    def replace(self, data):
+        """Replaces the whole content (rebuild from the logs) and writes it right away."""
+        with self.lock:
+            # Updates made in memory since the file went missing are newer
+            for app, entry in (self._data or {}).items():
+                if app not in data or entry['time'] > data[app]['time']:
+                    data[app] = entry
+            self._data = dict(data)
+            self._complete = True
+            self._dirty = True
+            self.flush()
+
+    def sorted_apps(self):
+        """[(app, data)] most recently played first."""
+        with self.lock:
+            # Sort keys by their ISO timestamp values in reverse
+            return sorted((self._data or {}).items(), key=lambda x: x[1]['time'], reverse=True)
+
+    def _schedule(self):
+        self._dirty = True
+        if self._timer is None:
+            self._timer = threading.Timer(self.debounce, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        """Writes pending changes now (atomic replace)."""
+        with self.lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._dirty or self._data is None:
+                return
+            # Keep entries another process wrote since we read the file
+            mtime = self._file_mtime()
+            if mtime is not None and mtime != self._mtime:
+                try:
+                    for app, data in self._read().items():
+                        if app not in self._data or data['time'] > self._data[app]['time']:
+                            self._data[app] = data
+                except Exception:
+                    pass
+            tmp_path = self.path.with_name(self.path.name + ".tmp")
+            try:
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(self._data, f, indent=4, ensure_ascii=False)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.path)
+                self._mtime = self._file_mtime()
+                self._dirty = False
+            except OSError as e:
+                print(f"[LOG ERROR] {e}")
@@ -0,0 +1,111 @@
+"""
+Settings changed while tracking: settings.ini is watched (inotify on its
+folder, mtime polling without it) and reloaded through DataManager, whose
+listeners push the tracker intervals to the running loop over a
+SettingsChannel. The loop applies them on its next tick, so the session
+goes on instead of being saved and restarted.
+"""
+import os
+import threading
+import config
+from core import inotify
+
+# Settings the tracking loops apply live, in the order of their constructor arguments
+TRACKER_KEYS = ('LOG_REFRESH_TIMER', 'LOG_PERIODIC_SAVE', 'AFK_TIMER')
+# Seconds between mtime checks without inotify
+POLL_INTERVAL = 2.0
+
+def tracker_settings(settings):
+    """(refresh_interval, save_interval, afk_timer) as the trackers take them."""
+    return tuple(settings.get(key, 0) for key in TRACKER_KEYS)
+
+def tracker_listener(data_manager, update):
+    """DataManager listener calling update(refresh, save, afk) when one of them changed."""
+    def listener(changed):
+        if any(key in changed for key in TRACKER_KEYS):
+            update(*tracker_settings(data_manager.settings))
+    return listener
+
+class SettingsChannel:
+    """
+    Latest tracker settings handed from any thread to a tracking loop, which
+    take()s them once per tick. Only the newest values are kept.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = None
+
+    def put(self, refresh_interval, save_interval, afk_timer):
+        with self._lock:
+            self._pending = (int(refresh_interval), int(save_interval), int(afk_timer))
+
+    def take(self):
+        """The pending (refresh, save, afk) or None."""
+        # Unlocked test first, the common case costs no lock
+        if self._pending is None:
+            return None
+        with self._lock:
+            pending, self._pending = self._pending, None
+        return pending
+
+class SettingsWatcher:
+    """Calls data_manager.reload_settings() whenever settings.ini is written, from its own thread."""
+    def __init__(self, data_manager, path=None):
+        self.data = data_manager
+        self.path = path or config.SETTINGS_FILE
+        self._stop_event = threading.Event()
+        self._inotify = None
+        self._thread = None
+
+    def start(self):
+        if inotify.available():
+            try:
+                self._inotify = inotify.Inotify()
+                # The folder: editors save by renaming a new file over the old one
+                self._inotify.add_watch(self.path.parent, inotify.IN_CLOSE_WRITE | inotify.IN_MOVED_TO)
+            except OSError as e:
+                print(f"[SETTINGS] inotify unavailable ({e}), polling {self.path.name}")
+                if self._inotify:
+                    self._inotify.close()
+                self._inotify = None
+        target = self._watch if self._inotify else self._poll
+        self._thread = threading.Thread(target=target, name="SettingsWatcher", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop_event.set()
+        if self._inotify:
+            self._inotify.wake()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        if self._inotify:
+            self._inotify.close()
+            self._inotify = None
+
+    def _watch(self):
+        while not self._stop_event.is_set():
+            events = self._inotify.read()
+            if any(e.name == self.path.name or e.mask & inotify.IN_Q_OVERFLOW for e in events):
+                self._reload()
+
+    def _poll(self):
+        last = self._mtime()
+        while not self._stop_event.wait(POLL_INTERVAL):
+            mtime = self._mtime()
+            if mtime != last:
+                last = mtime
+                self._reload()
+
+    def _mtime(self):
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _reload(self):
+        try:
+            self.data.reload_settings()
+        except Exception as e:
+            print(f"[SETTINGS] Reload failed: {e}")
@@ -0,0 +1,290 @@
+"""
+In-memory catalog of a log folder: the daily CSVs and month archives with
+their size and mtime, filled by one cold scan and then kept current by
+inotify on log/ and every month folder. Queries list and check files from it
+without touching the disk, and caches subscribe to changes of the files they
+hold instead of statting them all.
+
+Without inotify (or if watching fails) the catalog is not live and
+LogManager goes back to listing and statting the folders itself.
+"""
+import os
+import re
+import threading
+import weakref
+from pathlib import Path
+from core import inotify
+
+MONTH_FOLDER_RE = re.compile(r"^\d{4}-\d{2}$")
+DAY_FILE_RE = re.compile(r"^activity_(\d{4}-\d{2}-\d{2})\.csv$")
+ARCHIVE_FILE_RE = re.compile(r"^archive_(\d{4}-\d{2})\.bin$")
+
+ROOT_EVENTS = inotify.IN_CREATE | inotify.IN_DELETE | inotify.IN_MOVED_FROM | inotify.IN_MOVED_TO \
+    | inotify.IN_DELETE_SELF | inotify.IN_MOVE_SELF | inotify.IN_ONLYDIR
+MONTH_EVENTS = inotify.IN_CREATE | inotify.IN_DELETE | inotify.IN_MOVED_FROM | inotify.IN_MOVED_TO \
+    | inotify.IN_MODIFY | inotify.IN_CLOSE_WRITE | inotify.IN_ATTRIB | inotify.IN_ONLYDIR
+
+class LogCatalog:
+    """
+    Files are keyed like the session table: 'YYYY-MM-DD' for a daily CSV,
+    'YYYY-MM' for a month archive. Entries are (path, signature), signature
+    being (mtime_ns, size) as LogManager compares them.
+
+    There is one catalog per folder in the process (see for_path), its watcher
+    thread runs until stop() or exit.
+    """
+    _catalogs = {}
+    _catalogs_lock = threading.Lock()
+
+    @classmethod
+    def for_path(cls, log_dir):
+        log_dir = Path(log_dir).resolve()
+        with cls._catalogs_lock:
+            catalog = cls._catalogs.get(log_dir)
+            if catalog is not None and catalog._inotify and not catalog.live:
+                # Its folder was deleted or moved away: watch the current one
+                catalog.stop()
+                catalog = None
+            if catalog is None:
+                catalog = cls._catalogs[log_dir] = cls(log_dir).start()
+            return catalog
+
+    def __init__(self, log_dir):
+        self.log_dir = Path(log_dir)
+        self.lock = threading.RLock()
+        self.live = False   # True while inotify keeps the entries current
+        self.days = {}      # {'YYYY-MM-DD': (path, signature)}
+        self.archives = {}  # {'YYYY-MM': (path, signature)}
+        self.months = set() # Month folder names
+        self._inotify = None
+        self._watches = {}  # {wd: month folder name, None for log_dir}
+        self._thread = None
+        self._stop_event = threading.Event()
+        self._subscribers = {} # {token: (key or None, weak callback)}
+        self._next_token = 0
+
+    def start(self):
+        """Watches then cold scans (nothing created in between is missed). Returns self."""
+        if not inotify.available():
+            return self
+        try:
+            self._inotify = inotify.Inotify()
+            self._watches[self._inotify.add_watch(self.log_dir, ROOT_EVENTS)] = None
+        except OSError as e:
+            print(f"[LOG] Log catalog not live, inotify failed: {e}")
+            self._close_inotify()
+            return self
+        self.rescan()
+        self.live = True
+        self._thread = threading.Thread(target=self._watch, name="LogCatalog", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop_event.set()
+        self.live = False
+        if self._inotify:
+            self._inotify.wake()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        self._close_inotify()
+
+    def _close_inotify(self):
+        if self._inotify:
+            self._inotify.close()
+            self._inotify = None
+        self._watches = {}
+
+    # --- Queries ---
+
+    def files(self, first_day=None, last_day=None):
+        """Daily CSV paths with first_day <= day <= last_day (dates or None), oldest first."""
+        first = first_day.isoformat() if first_day else ""
+        last = last_day.isoformat() if last_day else "9999"
+        with self.lock:
+            return [path for day, (path, _) in sorted(self.days.items()) if first <= day <= last]
+
+    def month_names(self):
+        with self.lock:
+            return sorted(self.months)
+
+    def archive(self, month):
+        """Path of the month's archive or None."""
+        entry = self.archives.get(month)
+        return entry[0] if entry else None
+
+    def signature(self, key):
+        """(mtime_ns, size) of a day or archive key, None if it doesn't exist."""
+        entry = self.days.get(key) if len(key) == 10 else self.archives.get(key)
+        return entry[1] if entry else None
+
+    # --- Change notifications ---
+
+    def subscribe(self, callback, key=None):
+        """
+        callback(key) after the file of key changed, appeared or was removed
+        (every file if key is None). Called on the watcher thread, or on the
+        thread calling refresh(). Held weakly: a bound method doesn't keep its
+        object alive. Returns a token for unsubscribe().
+        """
+        ref = weakref.WeakMethod(callback) if hasattr(callback, "__self__") else weakref.ref(callback)
+        with self.lock:
+            token = self._next_token
+            self._next_token += 1
+            self._subscribers[token] = (key, ref)
+        return token
+
+    def unsubscribe(self, token):
+        with self.lock:
+            self._subscribers.pop(token, None)
+
+    def _notify(self, keys):
+        with self.lock:
+            subscribers = list(self._subscribers.items())
+        for token, (wanted, ref) in subscribers:
+            callback = ref()
+            if callback is None:
+                self.unsubscribe(token)
+                continue
+            for key in keys:
+                if wanted is None or wanted == key:
+                    callback(key)
+
+    # --- Updates ---
+
+    def refresh(self, path):
+        """
+        Re-reads one file's entry (writers call it right after writing, so their
+        own process doesn't wait for the inotify event). Returns its signature.
+        """
+        path = Path(path)
+        with self.lock:
+            key, changed = self._update(path.parent.name, path.name)
+            signature = self.signature(key) if key else None
+        if changed:
+            self._notify([key])
+        return signature
+
+    def rescan(self):
+        """Cold scan of every month folder, notifies the keys that differ from before."""
+        days, archives, months = {}, {}, set()
+        try:
+            folders = [e.name for e in os.scandir(self.log_dir) if e.is_dir() and MONTH_FOLDER_RE.match(e.name)]
+        except OSError:
+            folders = []
+        for month in folders:
+            self._watch_month(month)
+            months.add(month)
+            for key, entry, is_day in self._scan_month(month):
+                (days if is_day else archives)[key] = entry
+
+        with self.lock:
+            changed = [k for k in days.keys() | self.days.keys() if days.get(k) != self.days.get(k)]
+            changed += [k for k in archives.keys() | self.archives.keys() if archives.get(k) != self.archives.get(k)]
+            self.days, self.archives, self.months = days, archives, months
+        if changed:
+            self._notify(changed)
+
+    def _scan_month(self, month):
+        """(key, entry, is_day) of the files in a month folder."""
+        folder = self.log_dir / month
+        try:
+            entries = list(os.scandir(folder))
+        except OSError:
+            return
+        for e in entries:
+            match = DAY_FILE_RE.match(e.name) or ARCHIVE_FILE_RE.match(e.name)
+            if not match:
+                continue
+            try:
+                st = e.stat()
+            except OSError:
+                continue
+            yield match.group(1), (folder / e.name, (st.st_mtime_ns, st.st_size)), e.name.startswith("activity_")
+
+    def _watch_month(self, month):
+        if not self._inotify:
+            return
+        try:
+            self._watches[self._inotify.add_watch(self.log_dir / month, MONTH_EVENTS)] = month
+        except OSError:
+            pass
+
+    def _update(self, month, name):
+        """Stats one file into its entry. Returns (key or None, changed)."""
+        match = DAY_FILE_RE.match(name) or ARCHIVE_FILE_RE.match(name)
+        if not match or not MONTH_FOLDER_RE.match(month):
+            return None, False
+        key = match.group(1)
+        table = self.days if name.startswith("activity_") else self.archives
+        path = self.log_dir / month / name
+        try:
+            st = os.stat(path)
+            entry = (path, (st.st_mtime_ns, st.st_size))
+        except OSError:
+            entry = None
+        if table.get(key) == entry:
+            return key, False
+        if entry is None:
+            del table[key]
+        else:
+            table[key] = entry
+            self.months.add(month)
+        return key, True
+
+    def _drop_month(self, month):
+        with self.lock:
+            self.months.discard(month)
+            keys = [k for k in self.days if k.startswith(month)] + ([month] if month in self.archives else [])
+            for key in keys:
+                self.days.pop(key, None)
+                self.archives.pop(key, None)
+        return keys
+
+    def _watch(self):
+        while not self._stop_event.is_set():
+            events = self._inotify.read()
+            changed = set()
+            for event in events:
+                if event.mask & inotify.IN_Q_OVERFLOW:
+                    # Events were lost: start over from the disk
+                    self.rescan()
+                    changed.clear()
+                    break
+                month = self._watches.get(event.wd, "")
+                if month is None:
+                    changed.update(self._root_event(event))
+                elif event.mask & inotify.IN_IGNORED:
+                    # Month folder removed or renamed, its watch is gone
+                    self._watches.pop(event.wd, None)
+                elif month:
+                    with self.lock:
+                        key, was_changed = self._update(month, event.name)
+                    if was_changed:
+                        changed.add(key)
+            if changed:
+                self._notify(sorted(changed))
+
+    def _root_event(self, event):
+        if event.mask & (inotify.IN_DELETE_SELF | inotify.IN_MOVE_SELF):
+            print("[LOG] Log folder moved or deleted, log catalog not live anymore")
+            self.live = False
+            self._stop_event.set()
+            return []
+        if not (event.mask & inotify.IN_ISDIR) or not MONTH_FOLDER_RE.match(event.name):
+            return []
+        if event.mask & (inotify.IN_DELETE | inotify.IN_MOVED_FROM):
+            return self._drop_month(event.name)
+
+        # New month folder: watch it, then list what was written before the watch
+        self._watch_month(event.name)
+        keys = []
+        with self.lock:
+            self.months.add(event.name)
+            for key, entry, is_day in self._scan_month(event.name):
+                table = self.days if is_day else self.archives
+                if table.get(key) != entry:
+                    table[key] = entry
+                    keys.append(key)
+        return keys
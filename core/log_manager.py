@@ -1,15 +1,50 @@
 import os
-import json
-import csv
+import re
+import calendar
+import fcntl
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from datetime import datetime, timedelta
+from datetime import datetime, date, time, timedelta
+from itertools import groupby
+from core import log_parser, month_archive, metrics
+from core.session_table import SessionTable
+from core.log_catalog import LogCatalog
+from core.last_played import LastPlayedStore
+
+MONTH_FOLDER_RE = re.compile(r"^\d{4}-\d{2}$")
+# Bounded ranges up to this many days are resolved by building the file paths directly
+DIRECT_LOOKUP_DAYS = 62
+# Columns kept in the in-memory session table
+SESSION_FIELDS = ('start', 'end', 'active', 'app', 'title')
+# Session table key suffix for days read from a month archive
+ARCHIVE_KEY = "#archive"
+# Chart resolutions, finest first: (name, max days per bucket)
+SERIES_RESOLUTIONS = (('day', 1), ('week', 7), ('month', 31), ('year', 366))
+
+SAVE_SECONDS = metrics.histogram("save_seconds", "LogManager.save_session duration (lock, write, table update)")
+SAVE_BYTES = metrics.counter("save_bytes_written_total", "Bytes written to the daily logs by save_session")
+SAVES_HELP = "Sessions saved, by how the line was written"
+SAVES_APPENDED = metrics.counter("saves_total", SAVES_HELP, {'write': 'append'})
+SAVES_REWRITTEN = metrics.counter("saves_total", SAVES_HELP, {'write': 'rewrite'})
 
 class LogManager:
     def __init__(self, log_dir):
         self.log_dir = Path(log_dir)
         self.log_dir.mkdir(parents=True, exist_ok=True)
-        self.header = "Timestamp_Start;Timestamp_End;Duration;ActiveTime;App;Title;Status;Tags\n"
+        self.header = "Timestamp_Start;Timestamp_End;Duration;ActiveTime;App;Title;Status;Tags;ID\n"
+        # Header of the files written before session IDs
+        self.legacy_header = "Timestamp_Start;Timestamp_End;Duration;ActiveTime;App;Title;Status;Tags\n"
         self.metadata_file = self.log_dir / ".last_played.json"
+        self.last_played = LastPlayedStore.for_path(self.metadata_file)
+        # Shared with the other LogManagers of the folder, the history is loaded once
+        self.sessions = SessionTable.for_path(self.log_dir)
+        # File listing and signatures from memory while the catalog is live
+        self.catalog = LogCatalog.for_path(self.log_dir)
+        self._changed_keys = set()  # Catalog keys changed since the last sync
+        self._changed_lock = threading.Lock()
+        self._synced_spans = set()  # (first day, last day) ranges in sync, nothing changed in them since
+        self.catalog.subscribe(self._on_file_changed)
 
     def format_duration(self, seconds):
         """Converts seconds to H:MM:SS."""
@@ -19,24 +54,151 @@ class LogManager:
         s = seconds % 60
         return f"{h}:{m:02d}:{s:02d}"
 
-    def get_daily_file(self, date_obj):
+    def get_daily_file(self, date_obj, create=True):
         """
         Returns the path for logs/YYYY-MM/activity_YYYY-MM-DD.csv
+        create=False skips creating the month folder (read paths, no I/O).
         """
         month_folder = self.log_dir / date_obj.strftime('%Y-%m')
         # Create folder if missing
-        month_folder.mkdir(parents=True, exist_ok=True) 
+        if create:
+            month_folder.mkdir(parents=True, exist_ok=True) 
         
         return month_folder / f"activity_{date_obj.strftime('%Y-%m-%d')}.csv"
 
+    def get_log_files(self, start=None, end=None):
+        """
+        Returns the daily files whose date falls inside [start, end), oldest first.
+        start/end are datetimes (or dates), None means unbounded on that side.
+        Only month folders and day filenames inside the range are looked at,
+        files outside of it are never listed or opened.
+        """
+        first_day = self._to_date(start) if start is not None else None
+        last_day = self._last_day_before(end) if end is not None else None
+
+        if first_day and last_day and first_day > last_day:
+            return []
+
+        if self.catalog.live:
+            return self.catalog.files(first_day, last_day)
+
+        # Short bounded range: build the paths directly, no directory listing
+        if first_day and last_day and (last_day - first_day).days < DIRECT_LOOKUP_DAYS:
+            files = []
+            day = first_day
+            while day <= last_day:
+                path = self.get_daily_file(day, create=False)
+                if path.is_file():
+                    files.append(path)
+                day += timedelta(days=1)
+            return files
+
+        first_month = first_day.strftime('%Y-%m') if first_day else None
+        last_month = last_day.strftime('%Y-%m') if last_day else None
+        first_name = f"activity_{first_day.isoformat()}.csv" if first_day else None
+        last_name = f"activity_{last_day.isoformat()}.csv" if last_day else None
+
+        files = []
+        for month in self._month_names(first_day, last_day):
+            # Filenames only need checking on the boundary months
+            check_first = first_month == month
+            check_last = last_month == month
+            folder = self.log_dir / month
+            try:
+                names = sorted(
+                    e.name for e in os.scandir(folder)
+                    if e.name.startswith("activity_") and e.name.endswith(".csv")
+                )
+            except OSError:
+                continue
+            for name in names:
+                if check_first and name < first_name: continue
+                if check_last and name > last_name: continue
+                files.append(folder / name)
+        return files
+
+    def _month_names(self, first_day=None, last_day=None):
+        """Month folder names (YYYY-MM) overlapping [first_day, last_day], oldest first."""
+        if first_day and last_day:
+            months = []
+            year, month = first_day.year, first_day.month
+            while (year, month) <= (last_day.year, last_day.month):
+                months.append(f"{year:04d}-{month:02d}")
+                year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+            return months
+
+        if self.catalog.live:
+            months = self.catalog.month_names()
+        else:
+            try:
+                months = sorted(
+                    d.name for d in os.scandir(self.log_dir)
+                    if d.is_dir() and MONTH_FOLDER_RE.match(d.name)
+                )
+            except OSError:
+                return []
+        if first_day:
+            months = [m for m in months if m >= first_day.strftime('%Y-%m')]
+        if last_day:
+            months = [m for m in months if m <= last_day.strftime('%Y-%m')]
+        return months
+
+    def get_archives(self, start=None, end=None):
+        """Sealed month archives overlapping [start, end), oldest first."""
+        first_day = self._to_date(start) if start is not None else None
+        last_day = self._last_day_before(end) if end is not None else None
+        current_month = date.today().strftime('%Y-%m')
+
+        archives = []
+        for month in self._month_names(first_day, last_day):
+            # The running month is never sealed
+            if month >= current_month:
+                continue
+            if self.catalog.live:
+                path = self.catalog.archive(month)
+                if path:
+                    archives.append(path)
+                continue
+            path = month_archive.archive_path(self.log_dir / month)
+            if path.is_file():
+                archives.append(path)
+        return archives
+
+    def _to_date(self, value):
+        return value.date() if isinstance(value, datetime) else value
+
+    def _last_day_before(self, end):
+        """Last calendar day covered by the exclusive upper bound end."""
+        if isinstance(end, datetime):
+            if end.time() == time(0, 0):
+                return end.date() - timedelta(days=1)
+            return end.date()
+        return end - timedelta(days=1)
+
+    def timeframe_range(self, timeframe, now=None):
+        """Maps the UI timeframe names to a (start, end) datetime range, end exclusive."""
+        now = now or datetime.now()
+        midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        tomorrow = midnight + timedelta(days=1)
+        if timeframe == "Today":
+            return midnight, tomorrow
+        elif timeframe == "Last 7 Days":
+            return now - timedelta(days=7), tomorrow
+        elif timeframe == "Last 30 Days":
+            return now - timedelta(days=30), tomorrow
+        return None, None
+
+    @metrics.timed(SAVE_SECONDS)
     def save_session(self, session_data, is_update=False):
         """
         Saves or updates a log entry.
-        session_data: dict containing all columns
-        is_update: If True, replaces the last line in the file
+        session_data: dict containing all columns, 'id' is the stable session ID
+        (generated if missing)
+        is_update: If True, replaces the line of that session ID in the file
         """
         start_dt = session_data['start']
         log_file = self.get_daily_file(start_dt)
+        session_id = session_data.get('id') or log_parser.new_session_id()
         
         # Prepare the line
         line = (
@@ -44,131 +206,573 @@ class LogManager:
             f"{session_data['end'].strftime('%Y-%m-%d %H:%M:%S')};"
             f"{self.format_duration(session_data['duration'])};"
             f"{self.format_duration(session_data['active_time'])};"
-            f"{session_data['app']};"
-            f"{session_data['title']};"
-            f"{session_data['status']};"
-            f"{session_data['tags']}\n"
-        )
+            f"{log_parser.clean_field(session_data['app'])};"
+            f"{log_parser.clean_title(session_data['title'])};"
+            f"{log_parser.clean_field(session_data['status'])};"
+            f"{log_parser.clean_field(session_data['tags'])};"
+            f"{session_id}\n"
+        ).encode("utf-8")
 
         try:
-            # Ensure file and header exist
-            if not log_file.exists() or log_file.stat().st_size == 0:
-                log_file.write_text(self.header, encoding="utf-8")
-
-            if not is_update:
-                # Append new session
-                with open(log_file, "a", encoding="utf-8") as f:
-                    f.write(line)
-                self._update_last_played_cache(session_data['app'], session_data['title'])
-            else:
-                # Overwrite the last line (Periodic Save)
-                content = log_file.read_text(encoding="utf-8").splitlines()
-                if len(content) > 1: # Don't overwrite header
-                    content[-1] = line.strip()
-                    log_file.write_text("\n".join(content) + "\n", encoding="utf-8")
+            file_key = start_dt.strftime('%Y-%m-%d')
+            # Signature check, write and table update in one critical section: a query
+            # thread syncing in between would reparse the new line and append it twice
+            with self.sessions.lock:
+                with self._locked(log_file) as f:
+                    # Only keep the session table in sync incrementally if it was up to date before
+                    table_in_sync = self.sessions.is_loaded(file_key, self._signature(log_file))
+                    replaced_last = False
+
+                    size = f.seek(0, os.SEEK_END)
+                    written = 0
+                    # Ensure header exists
+                    if size == 0:
+                        written += f.write(self.header.encode("utf-8"))
+                    elif self._last_byte(f, size) != b"\n":
+                        written += f.write(b"\n")
+
+                    found = self._find_record(f, session_id) if is_update else None
+                    if found is None:
+                        # New session, or the updated one is gone (deleted by hand): append
+                        f.seek(0, os.SEEK_END)
+                        written += f.write(line)
+                        SAVES_APPENDED.inc()
+                        if not is_update:
+                            self._update_last_played_cache(session_data['app'], session_data['title'])
+                    else:
+                        # Periodic save: rewrite that record (normally the last line) and what follows it
+                        line_start, rest = found
+                        f.seek(line_start)
+                        written += f.write(line + rest)
+                        f.truncate()
+                        SAVES_REWRITTEN.inc()
+                        replaced_last = not rest
+                    SAVE_BYTES.inc(written)
+
+                if table_in_sync:
+                    record = (
+                        log_parser.datetime_to_epoch(start_dt),
+                        log_parser.datetime_to_epoch(session_data['end']),
+                        int(session_data['active_time']),
+                        session_data['app'],
+                        session_data['title'],
+                    )
+                    # Also updates the catalog now, not when the inotify event comes in
+                    signature = self.catalog.refresh(log_file)
+                    if replaced_last:
+                        self.sessions.update_last(file_key, *record, signature=signature)
+                    elif found is None:
+                        self.sessions.append(file_key, *record, signature=signature)
+                    else:
+                        self.sessions.drop_file(file_key)
                 else:
-                    # Fallback if file was somehow cleared
-                    with open(log_file, "a", encoding="utf-8") as f:
-                        f.write(line)
-            
+                    self.catalog.refresh(log_file)
+                    self.sessions.drop_file(file_key)
+
             return log_file
         except Exception as e:
             print(f"[LOG ERROR] {e}")
             return None
 
+    @contextmanager
+    def _locked(self, log_file):
+        """
+        Opens (creating it if needed) a daily file read/write under an exclusive
+        flock. Every writer (tracker saves and Logs tab edits) goes through here.
+        """
+        fd = os.open(log_file, os.O_RDWR | os.O_CREAT, 0o644)
+        with os.fdopen(fd, "r+b") as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield f
+                f.flush()
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    def _last_byte(self, f, size):
+        f.seek(size - 1)
+        return f.read(1)
+
+    def _find_record(self, f, session_id, tail_size=65536):
+        """
+        Locates the line of session_id, looking at the end of the file first.
+        Returns (line start offset, bytes after the line) or None.
+        """
+        needle = f";{session_id}\n".encode("utf-8")
+        size = f.seek(0, os.SEEK_END)
+        chunk_start = max(0, size - tail_size)
+        while True:
+            f.seek(chunk_start)
+            data = f.read()
+            pos = data.rfind(needle)
+            if pos != -1:
+                line_start = data.rfind(b"\n", 0, pos) + 1
+                # A line cut by the chunk boundary: read from the beginning
+                if line_start > 0 or chunk_start == 0:
+                    return chunk_start + line_start, data[pos + len(needle):]
+            if chunk_start == 0:
+                return None
+            chunk_start = 0
+
+    def apply_edits(self, date_str, updates=None, deletes=(), inserts=()):
+        """
+        Record level edits of one daily file, under the same lock as the tracker saves.
+        updates: {session ID: [Timestamp_Start, ..., Tags]}, deletes: session IDs,
+        inserts: rows to add. Rows keep their ID (rows written before IDs get a new one).
+        Only the bytes from the first changed record on are rewritten, rows of
+        other apps before it are left untouched. Returns the number of changed records.
+        """
+        updates = updates or {}
+        deletes = set(deletes)
+        log_file = self.get_daily_file(date.fromisoformat(date_str), create=False)
+        if not log_file.exists():
+            if month_archive.archive_path(log_file.parent).exists():
+                raise RuntimeError(f"{date_str[:7]} is sealed. Run 'main.py --unseal {date_str[:7]}' to edit it.")
+            if not inserts:
+                return 0
+            log_file.parent.mkdir(parents=True, exist_ok=True)
+
+        with self._locked(log_file) as f:
+            lines = f.read().decode("utf-8").splitlines(keepends=True)
+            if not lines:
+                lines = [self.header]
+            elif not lines[-1].endswith("\n"):
+                lines[-1] += "\n"
+            new_lines = list(lines)
+            first_changed = None
+            changed = 0
+
+            for i, session_id in enumerate(log_parser.session_ids(lines)):
+                if session_id is None:
+                    continue
+                if session_id in deletes:
+                    new_lines[i] = ""
+                elif session_id in updates:
+                    row = updates[session_id]
+                    if session_id.startswith("L"):
+                        # Legacy IDs are content hashes, an edited row gets a real one
+                        if ";".join(row[:log_parser.LEGACY_COLUMNS]) + "\n" != lines[i]:
+                            new_lines[i] = self._row_to_line(row)
+                    else:
+                        new_lines[i] = self._row_to_line(row, session_id)
+                if new_lines[i] != lines[i]:
+                    changed += 1
+                    first_changed = i if first_changed is None else first_changed
+
+            for row in inserts:
+                new_lines.append(self._row_to_line(row))
+                changed += 1
+                first_changed = len(lines) if first_changed is None else first_changed
+
+            if first_changed is None:
+                return 0
+
+            offset = sum(len(l.encode("utf-8")) for l in lines[:first_changed])
+            f.seek(offset)
+            f.write("".join(new_lines[first_changed:]).encode("utf-8"))
+            f.truncate()
+
+        self.catalog.refresh(log_file)
+        self.sessions.drop_file(date_str)
+        return changed
+
+    def apply_batch(self, edits):
+        """
+        edits: {date_str: (updates, deletes)} as for apply_edits, applied in one pass
+        over the days. Returns the number of files actually modified.
+        """
+        touched = 0
+        for date_str, (updates, deletes) in sorted(edits.items()):
+            if self.apply_edits(date_str, updates=updates, deletes=deletes):
+                touched += 1
+        return touched
+
+    def update_session(self, date_str, session_id, row):
+        return self.apply_edits(date_str, updates={session_id: row})
+
+    def delete_session(self, date_str, session_id):
+        return self.apply_edits(date_str, deletes=[session_id])
+
+    def insert_session(self, date_str, row):
+        return self.apply_edits(date_str, inserts=[row])
+
+    def _row_to_line(self, row, session_id=None):
+        """[Timestamp_Start, ..., Tags(, ID)] -> CSV line with a session ID."""
+        fields = [
+            log_parser.clean_title(value) if i == log_parser.FIELD_INDEX['title'] else log_parser.clean_field(value)
+            for i, value in enumerate(row[:log_parser.LEGACY_COLUMNS])
+        ]
+        fields += [""] * (log_parser.LEGACY_COLUMNS - len(fields))
+        fields.append(session_id or log_parser.new_session_id())
+        return ";".join(fields) + "\n"
+
+    def _signature(self, path):
+        """Cheap change detector for a log file, None if missing."""
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _file_signature(self, path, key):
+        """_signature from the catalog while it is live (no stat)."""
+        return self.catalog.signature(key) if self.catalog.live else self._signature(path)
+
+    def _on_file_changed(self, key):
+        """Catalog notification (any thread): key is a day or a month archive."""
+        with self._changed_lock:
+            self._changed_keys.add(key)
+
+    def _span_in_sync(self, span):
+        """
+        True if the live catalog saw no change in span since it was last synced.
+        Spans holding a changed file are forgotten.
+        """
+        if not self.catalog.live:
+            self._synced_spans.clear()
+            return False
+        with self._changed_lock:
+            changed, self._changed_keys = self._changed_keys, set()
+        if changed:
+            self._synced_spans = {
+                (first, last) for first, last in self._synced_spans
+                if not any((first is None or key >= first[:len(key)]) and (last is None or key <= last)
+                           for key in changed)
+            }
+        return span in self._synced_spans
+
+    def _sync_sessions(self, start=None, end=None):
+        """
+        Makes sure every file of [start, end) is loaded in the session table,
+        reparsing only the files that changed on disk since they were loaded.
+        With a live catalog, a range with no file change since its last sync
+        is skipped without looking at its files.
+        """
+        with self.sessions.lock:
+            first = self._to_date(start).isoformat() if start is not None else None
+            last = self._last_day_before(end).isoformat() if end is not None else None
+            span = (first, last)
+            if self._span_in_sync(span):
+                return
+
+            wanted = set()
+            for log_file in self.get_log_files(start, end):
+                file_key = log_file.stem.replace("activity_", "")
+                wanted.add(file_key)
+                signature = self._file_signature(log_file, file_key)
+                if signature is None or self.sessions.is_loaded(file_key, signature):
+                    continue
+                try:
+                    records = log_parser.read_records(log_file, SESSION_FIELDS)
+                except Exception as e:
+                    print(f"[LOG ERROR] Error reading {log_file}: {e}")
+                    records = []
+                self.sessions.load_file(file_key, records, signature)
+
+            for archive in self.get_archives(start, end):
+                wanted.update(self._sync_archive(archive))
+
+            # Forget files of the range that were deleted
+            for file_key in list(self.sessions.file_signatures):
+                if file_key in wanted: continue
+                if first and file_key[:10] < first: continue
+                if last and file_key[:10] > last: continue
+                self.sessions.drop_file(file_key)
+
+            for month in list(self.sessions.archives):
+                if self.catalog.live:
+                    exists = self.catalog.archive(month) is not None
+                else:
+                    exists = month_archive.archive_path(self.log_dir / month).is_file()
+                if not exists:
+                    del self.sessions.archives[month]
+
+            if self.catalog.live:
+                self._synced_spans.add(span)
+
+    def get_data_version(self, start=None, end=None):
+        """
+        Version of the logged data in [start, end) (bumped on any change, see
+        SessionTable.version), for caches of query results.
+        """
+        with self.sessions.lock:
+            self._sync_sessions(start, end)
+            return self.sessions.version
+
+    def _sync_archive(self, path):
+        """Loads a month archive into the session table if it changed, returns its day keys."""
+        month = path.parent.name
+        signature = self._file_signature(path, month)
+        loaded = self.sessions.archives.get(month)
+        if loaded and loaded[0] == signature:
+            return loaded[1]
+
+        try:
+            with month_archive.MonthArchive(path) as archive:
+                # Records are stored sorted by day, one table key per day
+                slices = [
+                    (log_parser.day_to_date(day).isoformat() + ARCHIVE_KEY, signature, sum(1 for _ in rows))
+                    for day, rows in groupby(archive.column('day'))
+                ]
+                self.sessions.load_columns(
+                    slices, archive.column('start'), archive.column('end'), archive.column('active'),
+                    archive.column('app'), archive.column('title'), archive.strings
+                )
+        except (OSError, month_archive.ArchiveError) as e:
+            print(f"[LOG ERROR] Error reading {path}: {e}")
+            return []
+
+        keys = [key for key, _, _ in slices]
+        self.sessions.archives[month] = (signature, keys)
+        return keys
+
+    def seal_month(self, month):
+        """
+        Converts a closed month folder (YYYY-MM) into its binary archive and
+        removes the daily CSVs. Returns the number of archived sessions.
+        Raises ValueError, sealing nothing, if a file would not come back
+        byte for byte from unseal_month (files without any row are not restored).
+        """
+        if not MONTH_FOLDER_RE.match(month) or month >= date.today().strftime('%Y-%m'):
+            raise ValueError(f"Only closed months can be sealed: {month}")
+
+        folder = self.log_dir / month
+        path = month_archive.archive_path(folder)
+        csv_files = sorted(folder.glob("activity_*.csv"))
+        if not csv_files:
+            return 0
+
+        records = []
+        # Sealing again after new CSVs appeared merges them into the archive
+        if path.exists():
+            with month_archive.MonthArchive(path) as archive:
+                records.extend(archive.records())
+
+        for log_file in csv_files:
+            day = log_parser.datetime_to_epoch(
+                datetime.fromisoformat(log_file.stem.replace("activity_", ""))
+            ) // log_parser.DAY_SECONDS
+            # Kept exact: \r\n, blank lines, other headers and number formats would be lost
+            text = log_file.read_bytes().decode("utf-8")
+            lines = text.split("\n")
+            # Strict: a row that can't be represented exactly must not be dropped silently
+            try:
+                rows = [
+                    (start, end, duration, active, day, app, title, status, tags, session_id)
+                    for start, end, duration, active, app, title, status, tags, session_id
+                    in log_parser.iter_records(lines, strict=True)
+                ]
+            except ValueError as e:
+                raise ValueError(f"{log_file.name}: {e}")
+            if rows and self._day_text(rows) != text:
+                restored = self._day_text(rows).split("\n")
+                line = next(i for i, (a, b) in enumerate(zip(lines + [None], restored + [None])) if a != b)
+                raise ValueError(f"{log_file.name} line {line + 1} would not be restored as is: {lines[line:line + 1]}")
+            records.extend(rows)
+
+        # Stable sort keeps the original row order inside each day
+        records.sort(key=lambda r: r[4])
+        month_archive.write_archive(path, records)
+
+        with month_archive.MonthArchive(path) as archive:
+            if archive.count != len(records):
+                raise month_archive.ArchiveError(f"Verification failed for {path}")
+
+        for log_file in csv_files:
+            log_file.unlink()
+        return len(records)
+
+    def seal_closed_months(self):
+        """Seals every closed month that still has daily CSVs (months that would not unseal as is are skipped). Returns {month: sessions}."""
+        current_month = date.today().strftime('%Y-%m')
+        sealed = {}
+        for month in self._month_names():
+            if month >= current_month:
+                continue
+            if any((self.log_dir / month).glob("activity_*.csv")):
+                try:
+                    sealed[month] = self.seal_month(month)
+                except ValueError as e:
+                    print(f"[LOG] Not sealing {month}: {e}")
+        return sealed
+
+    def unseal_month(self, month):
+        """
+        Re-expands a month archive into daily CSVs (for manual editing) and
+        removes it. Returns the number of restored sessions.
+        """
+        folder = self.log_dir / month
+        path = month_archive.archive_path(folder)
+        if not path.is_file():
+            raise FileNotFoundError(f"No archive for {month}")
+
+        with month_archive.MonthArchive(path) as archive:
+            records = list(archive.records())
+
+        for day, rows in groupby(records, key=lambda r: r[4]):
+            log_file = self.get_daily_file(log_parser.day_to_date(day), create=False)
+            text = self._day_text(list(rows))
+            # Rows added after sealing stay after the archived ones
+            if log_file.exists():
+                text += "".join(l + "\n" for l in log_file.read_text(encoding="utf-8").splitlines()[1:] if l.strip())
+            tmp_file = log_file.with_suffix(".tmp")
+            with open(tmp_file, "w", encoding="utf-8", newline="") as f:
+                f.write(text)
+            os.replace(tmp_file, log_file)
+
+        path.unlink()
+        return len(records)
+
+    def _day_text(self, rows):
+        """A daily file as unseal_month writes it from archive rows, legacy header if no row has an ID."""
+        header = self.header if any(row[9] for row in rows) else self.legacy_header
+        return header + "".join(self._archive_row_to_line(row) + "\n" for row in rows)
+
+    def _archive_row_to_line(self, row):
+        start, end, duration, active, _, app, title, status, tags, session_id = row
+        fields = [
+            log_parser.format_timestamp(start), log_parser.format_timestamp(end),
+            self.format_duration(duration), self.format_duration(active),
+            app, title, status, tags
+        ]
+        # Rows sealed before session IDs existed are restored without one
+        if session_id:
+            fields.append(session_id)
+        return ";".join(fields)
+
     def get_total_app_playtime(self, app_name):
         """
         Scans logs to find total playtime for a specific app.
         """
-        total_seconds = 0
-        try:
-            # Use rglob to search inside all YYYY-MM folders
-            for log_file in self.log_dir.rglob("activity_*.csv"):
-                lines = log_file.read_text(encoding="utf-8").splitlines()
-                for line in lines[1:]:
-                    parts = line.split(";")
-                    if len(parts) >= 5 and parts[4] == app_name:
-                        h, m, s = map(int, parts[3].split(":"))
-                        total_seconds += h * 3600 + m * 60 + s
-        except Exception:
-            pass
-        return total_seconds
+        with self.sessions.lock:
+            self._sync_sessions()
+            return self.sessions.total(app_name)
 
     def get_all_tracked_apps(self):
         """Returns a unique list of App (exe) names found in all daily logs."""
-        apps = set()
-        for log_file in self.log_dir.rglob("activity_*.csv"):
-            try:
-                lines = log_file.read_text(encoding="utf-8").splitlines()
-                for line in lines[1:]: # Skip header
-                    parts = line.split(";")
-                    if len(parts) >= 5:
-                        apps.add(parts[4]) # Column: App (exe)
-            except Exception: continue
-        return sorted(list(apps))
-
-    def get_stats_for_app(self, combined_name):
-        """Returns total_seconds and a dict of {date: hours} for the individual graph."""
-        total_seconds = 0
-        daily_data = {}
+        with self.sessions.lock:
+            self._sync_sessions()
+            return self.sessions.app_names()
 
+    def get_stats_for_app(self, combined_name, start=None, end=None):
+        """
+        Returns total_seconds and a dict of {date: hours} for the individual graph.
+        start/end optionally restrict the sessions to [start, end).
+        """
         # Extract actual process name
-        target_process = self._extract_process(combined_name)
+        target_process = self.extract_process(combined_name)
         if not target_process:
             return 0, {}
 
-        for log_file in self.log_dir.rglob("activity_*.csv"):
-            try:
-                with open(log_file, mode='r', encoding='utf-8') as f:
-                    reader = csv.DictReader(f, delimiter=';')
-                    for row in reader:
-                        # Match the process name column
-                        if row.get('App') == target_process:
-                            active_time_str = row.get('ActiveTime', '0:0:0')
-                            seconds = self._duration_to_seconds(active_time_str)
-                            total_seconds += seconds
-
-                            # Group by date for the graph
-                            try:
-                                date_str = row['Timestamp_Start'].split(' ')[0]
-                                date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-                                daily_data[date_obj] = daily_data.get(date_obj, 0) + (seconds / 3600)
-                            except (KeyError, ValueError):
-                                continue
-            except Exception as e:
-                print(f"[LOG ERROR] Error reading {log_file}: {e}")
-                continue
+        lo, hi = self._epoch_bounds(start, end)
+        with self.sessions.lock:
+            self._sync_sessions(start, end)
+            daily_seconds = self.sessions.group_totals('day', target_process, lo, hi)
 
+        total_seconds = sum(daily_seconds.values())
+        daily_data = {
+            datetime.combine(log_parser.day_to_date(day), time(0, 0)): seconds / 3600
+            for day, seconds in daily_seconds.items()
+        }
         return total_seconds, daily_data
 
-    def _update_last_played_cache(self, app_name, title):
-        """Updates the timestamp in the hidden JSON cache."""
-        cache = {}
-        if self.metadata_file.exists():
-            try:
-                cache = json.loads(self.metadata_file.read_text(encoding="utf-8"))
-            except Exception: pass
-        
-        # Store clean App Name as Key, but save Title inside
-        cache[app_name] = {
-            "time": datetime.now().isoformat(),
-            "last_title": title
+    def get_app_series(self, combined_name, start=None, end=None, max_bars=120):
+        """
+        Playtime of one app pre-aggregated for a chart of at most max_bars bars.
+        start/end (dates, end exclusive) restrict the range, default is the whole history.
+        The resolution is the finest of SERIES_RESOLUTIONS that fits max_bars.
+        Returns a dict:
+            total_seconds: whole history
+            first, last: first and last played day (None if never played)
+            start, end: range covered by the buckets
+            resolution: 'day', 'week', 'month' or 'year'
+            buckets: [(bucket start date, bucket length in days, hours)] chronological
+        """
+        target_process = self.extract_process(combined_name)
+        daily_seconds = {}
+        if target_process:
+            with self.sessions.lock:
+                self._sync_sessions()
+                daily_seconds = self.sessions.group_totals('day', target_process)
+
+        series = {
+            'total_seconds': sum(daily_seconds.values()),
+            'first': None, 'last': None,
+            'start': start, 'end': end,
+            'resolution': 'day', 'buckets': [],
         }
-        
-        with open(self.metadata_file, "w", encoding="utf-8") as f:
-            json.dump(cache, f, indent=4, ensure_ascii=False)
+        if not daily_seconds:
+            return series
+
+        first_day, last_day = min(daily_seconds), max(daily_seconds)
+        lo = self._day_number(start) if start else first_day
+        hi = self._day_number(end) if end else last_day + 1
+        series.update(first=log_parser.day_to_date(first_day), last=log_parser.day_to_date(last_day),
+                      start=log_parser.day_to_date(lo), end=log_parser.day_to_date(hi))
+
+        span = max(hi - lo, 1)
+        resolution = next(
+            (name for name, days in SERIES_RESOLUTIONS if -(-span // days) <= max_bars),
+            SERIES_RESOLUTIONS[-1][0]
+        )
+        series['resolution'] = resolution
+
+        buckets = {}
+        for day, seconds in daily_seconds.items():
+            if lo <= day < hi:
+                key = self._bucket_start(day, resolution)
+                buckets[key] = buckets.get(key, 0) + seconds
+        series['buckets'] = [
+            (bucket, self._bucket_days(bucket, resolution), buckets[bucket] / 3600)
+            for bucket in sorted(buckets)
+        ]
+        return series
+
+    def _day_number(self, value):
+        return (self._to_date(value) - log_parser.EPOCH.date()).days
+
+    def _bucket_start(self, day, resolution):
+        """Day number -> date the bucket holding it starts."""
+        if resolution == 'week':
+            # 1970-01-01 was a Thursday, weeks start on Monday
+            day -= (day + 3) % 7
+        d = log_parser.day_to_date(day)
+        if resolution == 'month':
+            return d.replace(day=1)
+        if resolution == 'year':
+            return d.replace(month=1, day=1)
+        return d
+
+    def _bucket_days(self, bucket, resolution):
+        if resolution == 'week':
+            return 7
+        if resolution == 'month':
+            return calendar.monthrange(bucket.year, bucket.month)[1]
+        if resolution == 'year':
+            return 366 if calendar.isleap(bucket.year) else 365
+        return 1
+
+    def _update_last_played_cache(self, app_name, title):
+        """Updates the last played entry in memory, the JSON file is written debounced."""
+        self.last_played.update(app_name, datetime.now().isoformat(), title)
+
+    def rebuild_last_played(self):
+        """Recreates the hidden JSON cache from the latest session of every app."""
+        with self.sessions.lock:
+            self._sync_sessions()
+            latest = self.sessions.latest_sessions()
+        self.last_played.replace({
+            app: {"time": log_parser.epoch_to_datetime(end).isoformat(), "last_title": title}
+            for app, (end, title) in latest.items()
+        })
 
     def get_apps_sorted_by_latest(self):
         """Returns app names sorted by their last played timestamp."""
-        if not self.metadata_file.exists():
-            # Fallback to read all logs if JSON doesn't exist
-            return self.get_all_tracked_apps()
-
         try:
-            cache = json.loads(self.metadata_file.read_text(encoding="utf-8"))
-            # Sort keys by their ISO timestamp values in reverse
-            sorted_apps = sorted(cache.items(), key=lambda x: x[1]['time'], reverse=True)
-            return [f"{data['last_title']} - {app}" for app, data in sorted_apps]
+            if not self.last_played.load():
+                # JSON doesn't exist: rebuild it once from the logs
+                self.rebuild_last_played()
+            return [f"{data['last_title']} - {app}" for app, data in self.last_played.sorted_apps()]
         except Exception as e:
             print(f"[LOG ERROR] {e}")
             return self.get_all_tracked_apps()
@@ -176,87 +780,112 @@ class LogManager:
     def get_grouped_logs_for_app(self, combined_name):
         """
         Returns an OrderedDict: { "2026-01-18": [rows], "2026-01-17": [rows] }
+        Rows are the 8 CSV columns followed by the session ID (see apply_edits).
         """
         from collections import OrderedDict
+        days = self.get_log_days_for_app(combined_name)
+        grouped_data = self.get_logs_for_days(combined_name, days)
+        return OrderedDict((day, grouped_data[day]) for day in days if day in grouped_data)
+
+    def get_log_days_for_app(self, combined_name):
+        """
+        Days ('YYYY-MM-DD') the app was played, most recent first, from the session
+        table. The first call parses the whole history: keep it off the GUI thread.
+        """
+        target_process = self.extract_process(combined_name)
+        with self.sessions.lock:
+            self._sync_sessions()
+            keys = self.sessions.files_with_app(target_process)
+        return sorted({key[:10] for key in keys}, reverse=True)
+
+    def get_logs_for_days(self, combined_name, date_strs):
+        """
+        Rows of the app for the given days only: { "2026-01-18": [rows] }
+        (same rows as get_grouped_logs_for_app), for paged loading.
+        """
         grouped_data = {}
 
         # FIX: Extract the actual exe name before searching
-        target_process = self._extract_process(combined_name)
+        target_process = self.extract_process(combined_name)
+        wanted = set(date_strs)
 
-        for log_file in self.log_dir.rglob("activity_*.csv"):
+        # Days of sealed months come from their archive
+        for month in sorted({day[:7] for day in wanted}):
+            path = month_archive.archive_path(self.log_dir / month)
+            if not path.is_file():
+                continue
             try:
+                with month_archive.MonthArchive(path) as archive:
+                    for row in archive.records():
+                        if row[5] != target_process:
+                            continue
+                        date_str = log_parser.day_to_date(row[4]).isoformat()
+                        if date_str in wanted:
+                            line = self._archive_row_to_line(row)
+                            parts = log_parser.split_row(line)[:log_parser.LEGACY_COLUMNS]
+                            parts.append(row[9] or log_parser.session_ids([line])[0])
+                            grouped_data.setdefault(date_str, []).append(parts)
+            except (OSError, month_archive.ArchiveError):
+                continue
+
+        for date_str in sorted(wanted):
+            log_file = self.get_daily_file(date.fromisoformat(date_str), create=False)
+            try:
+                if not log_file.exists(): continue
                 lines = log_file.read_text(encoding="utf-8").splitlines()
                 if len(lines) < 2: continue
                 
-                # Extract date from filename (activity_YYYY-MM-DD.csv)
-                date_str = log_file.stem.replace("activity_", "")
-                
                 day_rows = []
-                for line in lines[1:]:
-                    parts = line.split(";")
-                    if len(parts) >= 5 and parts[4] == target_process:
-                        day_rows.append(parts)
+                for line, session_id in zip(lines, log_parser.session_ids(lines)):
+                    parts = log_parser.split_row(line)
+                    if session_id is not None and len(parts) >= 5 and parts[4] == target_process:
+                        parts = parts[:log_parser.LEGACY_COLUMNS]
+                        parts += [""] * (log_parser.LEGACY_COLUMNS - len(parts))
+                        day_rows.append(parts + [session_id])
                 
                 if day_rows:
-                    grouped_data[date_str] = day_rows
+                    grouped_data.setdefault(date_str, []).extend(day_rows)
             except Exception: continue
-            
-        # Sort by date descending
-        return OrderedDict(sorted(grouped_data.items(), reverse=True))
 
-    def _extract_process(self, combined_name):
-        """Helper to get process from title"""
+        return grouped_data
+
+    def extract_process(self, combined_name):
+        """Process name of a combo box entry ("Title - process" or "process")."""
         if not combined_name: return ""
         if " - " in combined_name:
             return combined_name.rsplit(" - ", 1)[-1].strip()
         return combined_name.strip()
 
+    def _epoch_bounds(self, start, end):
+        """Converts an optional [start, end) range to local epoch seconds."""
+        lo = log_parser.datetime_to_epoch(self._to_datetime(start)) if start is not None else None
+        hi = log_parser.datetime_to_epoch(self._to_datetime(end)) if end is not None else None
+        return lo, hi
+
+    def _to_datetime(self, value):
+        return value if isinstance(value, datetime) else datetime.combine(value, time(0, 0))
+
     def _duration_to_seconds(self, duration_str):
         """Converts H:M:S string (e.g. '0:01:12' or '01:02:03') to total seconds."""
         if not duration_str or duration_str == "None":
             return 0
-        try:
-            parts = list(map(int, duration_str.split(':')))
-            if len(parts) == 3: # H:M:S
-                return parts[0] * 3600 + parts[1] * 60 + parts[2]
-            elif len(parts) == 2: # M:S
-                return parts[0] * 60 + parts[1]
-            return 0
-        except (ValueError, TypeError):
-            return 0
+        return log_parser.parse_duration(duration_str)
 
-    def get_global_summary(self, timeframe="All Time"):
-        """Aggregates all apps for the summary table across all folders."""
-        summary = {} # {app_name: seconds}
-        titles = {}  # {app_name: latest_title}
-        now = datetime.now()
-        
-        start_filter = None
-        if timeframe == "Today":
-            start_filter = now.replace(hour=0, minute=0, second=0, microsecond=0)
-        elif timeframe == "Last 7 Days":
-            start_filter = now - timedelta(days=7)
-        elif timeframe == "Last 30 Days":
-            start_filter = now - timedelta(days=30)
+    def get_global_summary(self, timeframe="All Time", start=None, end=None):
+        """
+        Aggregates all apps for the summary table.
+        An explicit start/end range [start, end) takes precedence over timeframe.
+        """
+        if start is None and end is None:
+            start, end = self.timeframe_range(timeframe)
 
-        for log_file in self.log_dir.rglob("activity_*.csv"):
-            try:
-                with log_file.open(mode='r', encoding='utf-8') as f:
-                    reader = csv.DictReader(f, delimiter=';')
-                    for row in reader:
-                        start_dt = datetime.strptime(row['Timestamp_Start'], '%Y-%m-%d %H:%M:%S')
-                        if start_filter and start_dt < start_filter:
-                            continue
-                        
-                        app = row.get('App')
-                        if not app: continue
-                        
-                        seconds = self._duration_to_seconds(row.get('ActiveTime', '0:0:0'))
-                        summary[app] = summary.get(app, 0) + seconds
-                        # Keep the most recent title found
-                        titles[app] = row.get('Title', '')
-            except Exception: continue
+        lo, hi = self._epoch_bounds(start, end)
+        with self.sessions.lock:
+            self._sync_sessions(start, end)
+            summary = self.sessions.group_totals('app', None, lo, hi) # {app_name: seconds}
+            titles = self.sessions.latest_titles(lo, hi)              # {app_name: latest_title}
+        summary.pop("", None)
 
         # Return list of tuples: (app_name, total_seconds, latest_title)
         sorted_data = sorted(summary.items(), key=lambda x: x[1], reverse=True)
-        return [(app, seconds, titles.get(app, "")) for app, seconds in sorted_data]
\ No newline at end of file
+        return [(app, seconds, titles.get(app, "")) for app, seconds in sorted_data]
@@ -0,0 +1,185 @@
+"""
+Specialized parser for the daily activity files.
+
+Layout: Timestamp_Start;Timestamp_End;Duration;ActiveTime;App;Title;Status;Tags;ID
+ID (the stable session ID) is missing on rows written before it existed.
+Titles may contain ';' (window titles like "STEINS;GATE"): the columns after
+the title are counted from the end of the row, an ID being recognized by its
+format (new_session_id). The other fields never contain ';' (clean_field).
+Timestamps are fixed width ('YYYY-MM-DD HH:MM:SS') so they are sliced instead of
+going through strptime, and they are returned as integer "local epoch" seconds
+(naive local time counted from 1970-01-01 00:00), which keeps day bucketing a
+plain integer division.
+"""
+import re
+import uuid
+import zlib
+from datetime import datetime, timedelta
+
+EPOCH = datetime(1970, 1, 1)
+DAY_SECONDS = 86400
+
+FIELDS = ('start', 'end', 'duration', 'active', 'app', 'title', 'status', 'tags', 'id')
+FIELD_INDEX = {name: i for i, name in enumerate(FIELDS)}
+# Number of columns of rows written before session IDs
+LEGACY_COLUMNS = 8
+
+SESSION_ID_RE = re.compile(r"[0-9a-f]{16}")
+
+# 'YYYY-MM-DD' -> days since epoch, rows of one file share very few dates
+_day_cache = {}
+
+def _days_from_civil(y, m, d):
+    """Days since 1970-01-01 for a proleptic Gregorian date."""
+    y -= m <= 2
+    era = y // 400
+    yoe = y - era * 400
+    doy = (153 * (m + (-3 if m > 2 else 9)) + 2) // 5 + d - 1
+    doe = yoe * 365 + yoe // 4 - yoe // 100 + doy
+    return era * 146097 + doe - 719468
+
+def parse_timestamp(ts):
+    """'YYYY-MM-DD HH:MM:SS' -> local epoch seconds."""
+    days = _day_cache.get(ts[:10])
+    if days is None:
+        days = _days_from_civil(int(ts[0:4]), int(ts[5:7]), int(ts[8:10]))
+        _day_cache[ts[:10]] = days
+    return days * DAY_SECONDS + int(ts[11:13]) * 3600 + int(ts[14:16]) * 60 + int(ts[17:19])
+
+def parse_duration(value):
+    """'H:MM:SS' (or 'M:SS') -> seconds, 0 when empty or malformed."""
+    first = value.find(':')
+    if first == -1:
+        return 0
+    second = value.find(':', first + 1)
+    try:
+        if second == -1:
+            return int(value[:first]) * 60 + int(value[first + 1:])
+        return int(value[:first]) * 3600 + int(value[first + 1:second]) * 60 + int(value[second + 1:])
+    except ValueError:
+        return 0
+
+def _raw(value):
+    return value
+
+CONVERTERS = {
+    'start': parse_timestamp,
+    'end': parse_timestamp,
+    'duration': parse_duration,
+    'active': parse_duration,
+    'app': _raw,
+    'title': _raw,
+    'status': _raw,
+    'tags': _raw,
+    'id': _raw,
+}
+
+def new_session_id():
+    return uuid.uuid4().hex[:16]
+
+def is_session_id(value):
+    return len(value) == 16 and SESSION_ID_RE.fullmatch(value) is not None
+
+def clean_field(value):
+    """A column other than the title as written to the file: no ';' nor line break."""
+    return clean_title(value).replace(";", ",")
+
+def clean_title(value):
+    """The title as written to the file: ';' is kept (see split_row), line breaks aren't."""
+    return str(value).replace("\r", " ").replace("\n", " ")
+
+def split_row(line):
+    """
+    Columns of a row, the title joined back if it contained ';'. Rows with more
+    than LEGACY_COLUMNS columns come back with exactly len(FIELDS) ('' ID for a
+    legacy row), shorter rows as they are.
+    """
+    parts = line.split(';')
+    count = len(parts)
+    if count <= LEGACY_COLUMNS:
+        return parts
+    has_id = is_session_id(parts[-1])
+    if count == len(FIELDS) and has_id:
+        return parts
+    # Status, Tags (and ID) are the last columns, everything between App and them is the title
+    tail = 3 if has_id else 2
+    parts[5:count - tail] = [';'.join(parts[5:count - tail])]
+    if not has_id:
+        parts.append('')
+    return parts
+
+def session_ids(lines):
+    """
+    Session ID of every line (None for the header and blank lines).
+    Rows written before IDs existed get a content based 'L<crc32>' ID
+    ('-n' appended for the nth identical line), stable while the row is unchanged.
+    """
+    ids = []
+    seen = {}
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if not line.strip() or line.startswith('Timestamp_Start'):
+            ids.append(None)
+            continue
+        parts = split_row(line)
+        if len(parts) > LEGACY_COLUMNS and parts[LEGACY_COLUMNS]:
+            ids.append(parts[LEGACY_COLUMNS])
+            continue
+        sid = f"L{zlib.crc32(line.encode('utf-8')):08x}"
+        count = seen.get(sid, 0)
+        seen[sid] = count + 1
+        ids.append(sid if count == 0 else f"{sid}-{count}")
+    return ids
+
+def format_timestamp(epoch):
+    """Local epoch seconds -> 'YYYY-MM-DD HH:MM:SS'."""
+    return f"{EPOCH + timedelta(seconds=epoch):%Y-%m-%d %H:%M:%S}"
+
+def epoch_to_datetime(epoch):
+    return EPOCH + timedelta(seconds=epoch)
+
+def datetime_to_epoch(dt):
+    return (dt - EPOCH) // timedelta(seconds=1)
+
+def day_to_date(day):
+    """Day number (epoch // DAY_SECONDS) -> date."""
+    return (EPOCH + timedelta(days=day)).date()
+
+def iter_records(lines, fields=FIELDS, app=None, strict=False):
+    """
+    Yields one tuple per row holding only the requested fields, in order.
+    With app set, rows of other apps are skipped before any conversion.
+    Header, blank and malformed rows are skipped, or raise ValueError when strict
+    (rows must then also have every column).
+    """
+    columns = [(FIELD_INDEX[name], CONVERTERS[name]) for name in fields]
+    # Rows shorter than this can't hold every requested column (ID is optional)
+    min_len = max(min(max(i for i, _ in columns) + 1, LEGACY_COLUMNS), FIELD_INDEX['app'] + 1)
+    pad = 'id' in fields
+
+    for line in lines:
+        if not line or line.startswith('Timestamp_Start'):
+            continue
+        parts = line.split(';')
+        if len(parts) > LEGACY_COLUMNS:
+            parts = split_row(line)
+        elif strict and len(parts) != LEGACY_COLUMNS:
+            raise ValueError(f"Unexpected column count: {line!r}")
+        if len(parts) < min_len:
+            continue
+        if pad and len(parts) == LEGACY_COLUMNS:
+            parts.append('')
+        if app is not None and parts[4] != app:
+            continue
+        try:
+            yield tuple([conv(parts[i]) for i, conv in columns])
+        except (ValueError, IndexError):
+            if strict:
+                raise ValueError(f"Malformed row: {line!r}")
+            continue
+
+def read_records(path, fields=FIELDS, app=None, strict=False):
+    """Parses a whole daily file, returns a list of tuples (see iter_records)."""
+    with open(path, 'r', encoding='utf-8') as f:
+        lines = f.read().splitlines()
+    return list(iter_records(lines, fields, app, strict))
@@ -0,0 +1,180 @@
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+
+# Sessions whose saved playtime is remembered for the on_saved deltas. A session
+# is forgotten after its final save, this bounds the ones that never get one.
+MAX_TRACKED_SESSIONS = 64
+
+class LogWriter(threading.Thread):
+    """
+    Dedicated thread persisting sessions for the tracker workers.
+
+    submit() only enqueues, so the tracking loop never waits on the disk.
+    Consecutive updates of the same in-flight session are coalesced into one
+    write, pending writes are flushed every flush_interval seconds with one
+    fsync per touched file, and stop() returns only after a durable flush.
+
+    on_saved, if given, is called from the writer thread after each write
+    with a session-saved event (see _saved_event), so views can add the new
+    playtime to their aggregates without reading the logs back.
+    """
+    def __init__(self, logger, flush_interval=2.0, on_saved=None):
+        super().__init__(name="LogWriter", daemon=True)
+        self.logger = logger
+        self.flush_interval = flush_interval
+        self.on_saved = on_saved
+        self._queue = queue.SimpleQueue()
+        self._pending = [] # [session key, session_data, is_update, final], writer thread only
+        self._saved_active = OrderedDict() # {session key: active seconds on disk}, written by the writer thread only
+
+        # Stats
+        self.submitted = 0
+        self.coalesced = 0
+        self.written = 0
+        self.flushes = 0
+        self.max_queue_depth = 0
+        self.last_flush_latency = 0.0
+        self.max_flush_latency = 0.0
+        self.max_submit_latency = 0.0
+
+    @property
+    def queue_depth(self):
+        """Saves submitted but not yet written."""
+        return self._queue.qsize() + len(self._pending)
+
+    def saved_active(self, session_id):
+        """Active seconds of the session already written (0 before its first save). Any thread."""
+        return self._saved_active.get(session_id, 0)
+
+    def submit(self, session_data, is_update=False, final=False):
+        """Queues a save_session call, returns immediately. final: last save of that session."""
+        t0 = time.perf_counter()
+        self._queue.put(('save', (dict(session_data), final), is_update))
+        self.submitted += 1
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+        self.max_submit_latency = max(self.max_submit_latency, time.perf_counter() - t0)
+
+    def flush(self, timeout=None):
+        """Blocks until everything submitted so far is on disk."""
+        done = threading.Event()
+        self._queue.put(('flush', done, None))
+        return done.wait(timeout)
+
+    def stop(self):
+        """Flushes durably and ends the thread."""
+        if self.is_alive():
+            self._queue.put(('stop', None, None))
+            self.join()
+
+    def stats(self):
+        return {
+            'queue_depth': self.queue_depth,
+            'max_queue_depth': self.max_queue_depth,
+            'submitted': self.submitted,
+            'coalesced': self.coalesced,
+            'written': self.written,
+            'flushes': self.flushes,
+            'last_flush_ms': round(self.last_flush_latency * 1000, 3),
+            'max_flush_ms': round(self.max_flush_latency * 1000, 3),
+            'max_submit_us': round(self.max_submit_latency * 1e6, 1),
+        }
+
+    def run(self):
+        next_flush = time.monotonic() + self.flush_interval
+        while True:
+            timeout = max(0.0, next_flush - time.monotonic())
+            try:
+                kind, payload, is_update = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                self._flush()
+                next_flush = time.monotonic() + self.flush_interval
+                continue
+
+            if kind == 'save':
+                self._add(*payload, is_update)
+                continue
+
+            self._flush()
+            # Explicit flush/stop also persists the debounced last played cache
+            self.logger.last_played.flush()
+            next_flush = time.monotonic() + self.flush_interval
+            if kind == 'flush':
+                payload.set()
+            elif kind == 'stop':
+                return
+
+    def _add(self, session_data, final, is_update):
+        key = session_data.get('id') or (session_data['app'], session_data['start'])
+        if is_update and self._pending and self._pending[-1][0] == key:
+            # Same in-flight session: only the latest state needs writing.
+            # The pending entry keeps its own is_update (a new line stays an append).
+            self._pending[-1][1] = session_data
+            self._pending[-1][3] = final
+            self.coalesced += 1
+        else:
+            self._pending.append([key, session_data, is_update, final])
+
+    def _flush(self):
+        if not self._pending:
+            return
+        t0 = time.perf_counter()
+        touched = set()
+        for key, session_data, is_update, final in self._pending:
+            log_file = self.logger.save_session(session_data, is_update=is_update)
+            if log_file:
+                touched.add(log_file)
+                self._notify_saved(key, session_data)
+            if final:
+                self._saved_active.pop(key, None)
+        self.written += len(self._pending)
+        self._pending = []
+
+        for log_file in touched:
+            try:
+                fd = os.open(log_file, os.O_RDONLY)
+                try:
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+            except OSError as e:
+                print(f"[LOG ERROR] fsync {log_file}: {e}")
+
+        self.flushes += 1
+        self.last_flush_latency = time.perf_counter() - t0
+        self.max_flush_latency = max(self.max_flush_latency, self.last_flush_latency)
+
+    def _notify_saved(self, key, session_data):
+        active = int(session_data['active_time'])
+        delta = active - self._saved_active.get(key, 0)
+        self._saved_active[key] = active
+        self._saved_active.move_to_end(key)
+        if len(self._saved_active) > MAX_TRACKED_SESSIONS:
+            self._saved_active.popitem(last=False)
+        if self.on_saved is None or delta == 0:
+            return
+        try:
+            self.on_saved(self._saved_event(session_data, delta, active))
+        except Exception as e:
+            print(f"[LOG ERROR] on_saved: {e}")
+
+    def _saved_event(self, session_data, delta, saved):
+        """
+        Session-saved event, playtime counts on the day the session started:
+            id, app, title: the session
+            start: session start (datetime), day: its date
+            delta: active seconds added since the previous save (negative when
+                   an AFK correction took some back)
+            saved: active seconds of the session on disk after this save
+        """
+        return {
+            'id': session_data.get('id'),
+            'app': session_data['app'],
+            'title': session_data['title'],
+            'start': session_data['start'],
+            'day': session_data['start'].date(),
+            'delta': delta,
+            'saved': saved,
+        }
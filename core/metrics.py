@@ -0,0 +1,251 @@
+"""
+Counters and latency histograms of the tracking hot path (KWin round trips,
+journalctl, /proc reads, focus polls, saves, AFK transitions, loop wakeups),
+exposed in the Prometheus text format over HTTP on localhost and/or as a
+periodically rewritten file (settings METRICS_PORT / METRICS_FILE).
+
+Disabled (the default) every inc()/observe()/time() returns after one flag
+test, so the instrumentation can stay in the loops, and http.server is not
+even imported.
+"""
+import functools
+import os
+import threading
+import time
+from bisect import bisect_left
+
+PREFIX = "playtimetracker_"
+# Seconds, from a cached KWin lookup to a slow journalctl
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+enabled = False
+_registry = {} # {(name, labels): metric}, creation order is the output order
+_registry_lock = threading.Lock()
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name, help, labels):
+        self.name, self.help, self.labels = name, help, labels
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        if not enabled:
+            return
+        with self._lock:
+            self.value += amount
+
+    def samples(self):
+        return [(self.name, self.labels, self.value)]
+
+class _Timer:
+    __slots__ = ("histogram", "t0")
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.t0)
+        return False
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NULL_TIMER = _NullTimer()
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name, help, labels, buckets=LATENCY_BUCKETS):
+        self.name, self.help, self.labels = name, help, labels
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1) # Last one is +Inf
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        if not enabled:
+            return
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def time(self):
+        """Context manager observing the duration of its block."""
+        return _Timer(self) if enabled else _NULL_TIMER
+
+    def samples(self):
+        with self._lock:
+            counts, total, count = list(self.counts), self.sum, self.count
+        samples = []
+        cumulative = 0
+        for bound, n in zip(self.buckets + (float("inf"),), counts):
+            cumulative += n
+            le = "+Inf" if bound == float("inf") else f"{bound:g}"
+            samples.append((self.name + "_bucket", self.labels + (("le", le),), cumulative))
+        samples.append((self.name + "_sum", self.labels, total))
+        samples.append((self.name + "_count", self.labels, count))
+        return samples
+
+def _get(cls, name, help, labels, **kwargs):
+    labels = tuple(sorted((labels or {}).items()))
+    key = (PREFIX + name, labels)
+    with _registry_lock:
+        metric = _registry.get(key)
+        if metric is None:
+            metric = _registry[key] = cls(PREFIX + name, help, labels, **kwargs)
+        return metric
+
+def counter(name, help, labels=None):
+    """Module-level counter, the same object for the same name and labels."""
+    return _get(Counter, name, help, labels)
+
+def histogram(name, help, labels=None, buckets=LATENCY_BUCKETS):
+    return _get(Histogram, name, help, labels, buckets=buckets)
+
+def timed(histogram):
+    """Decorator observing each call's duration in histogram."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not enabled:
+                return fn(*args, **kwargs)
+            with _Timer(histogram):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def render():
+    """Every metric in the Prometheus text exposition format."""
+    with _registry_lock:
+        metrics = list(_registry.values())
+    lines = []
+    described = set()
+    for metric in metrics:
+        if metric.name not in described:
+            described.add(metric.name)
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+        for name, labels, value in metric.samples():
+            label_text = ",".join(f'{k}="{v}"' for k, v in labels)
+            # repr keeps every digit of large counters and sums
+            lines.append(f"{name}{{{label_text}}} {value!r}" if label_text else f"{name} {value!r}")
+    return "\n".join(lines) + "\n"
+
+# --- Exposition ---
+
+def _http_server(port):
+    """ThreadingHTTPServer serving render() on 127.0.0.1:port, imported only when a port is set."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path not in ("/", "/metrics"):
+                self.send_error(404)
+                return
+            body = render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), MetricsHandler)
+    server.daemon_threads = True
+    return server
+
+class MetricsExporter:
+    """Serves /metrics on 127.0.0.1:port and/or rewrites path every interval seconds."""
+    def __init__(self, port=0, path=None, interval=15):
+        self.port = int(port or 0)
+        self.path = path or None
+        self.interval = interval
+        self._server = None
+        self._stop_event = threading.Event()
+        self._threads = []
+
+    def start(self):
+        """
+        Starts the endpoint and the file writer that are configured. A port
+        that can't be bound only disables the endpoint. Returns True if
+        anything is exported.
+        """
+        if self.port:
+            try:
+                self._server = _http_server(self.port)
+            except OSError as e:
+                print(f"[METRICS] Not serving on port {self.port}: {e}")
+            else:
+                self._spawn(self._server.serve_forever, "MetricsHTTP")
+                print(f"[METRICS] Serving http://127.0.0.1:{self.port}/metrics")
+        if self.path:
+            self._spawn(self._write_loop, "MetricsFile")
+            print(f"[METRICS] Writing {self.path} every {self.interval}s")
+        return bool(self._threads)
+
+    def stop(self):
+        self._stop_event.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def _spawn(self, target, name):
+        thread = threading.Thread(target=target, name=name, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def _write_loop(self):
+        while True:
+            self.write_file()
+            if self._stop_event.wait(self.interval):
+                self.write_file()
+                return
+
+    def write_file(self):
+        # Readers (node_exporter textfile collector) never see a partial file
+        tmp = f"{self.path}.tmp"
+        try:
+            with open(tmp, "w") as f:
+                f.write(render())
+            os.replace(tmp, self.path)
+        except OSError as e:
+            print(f"[METRICS] Could not write {self.path}: {e}")
+
+def configure(settings):
+    """
+    Enables the metrics and starts their exporter when METRICS_PORT or
+    METRICS_FILE is set. Returns the running MetricsExporter or None.
+    """
+    global enabled
+    port = settings.get('METRICS_PORT', 0)
+    path = settings.get('METRICS_FILE', '')
+    if not port and not path:
+        return None
+    enabled = True
+    exporter = MetricsExporter(port if isinstance(port, int) else 0, str(path) if path else None)
+    if not exporter.start():
+        print("[METRICS] Exporter disabled")
+        enabled = False
+        return None
+    return exporter
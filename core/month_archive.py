@@ -0,0 +1,151 @@
+"""
+Compact binary archive for closed months (log/YYYY-MM/archive_YYYY-MM.bin).
+
+Every session is a fixed size record stored column by column (all starts,
+then all ends, ...) so a column is a single contiguous little-endian block
+read through mmap: array.frombytes loads it in one copy without any per-row
+allocation. Strings (app, title, status, tags) are interned in a
+table at the end of the file and records hold their index.
+Version 1 archives (written before session IDs) are still readable.
+
+Layout:
+    header   '<4sHHQQ'  magic, version, column count, record count, string table offset
+    columns  COLUMNS in order, record count values each
+    strings  '<I' count, then '<I' length + utf-8 bytes per string
+"""
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+MAGIC = b"PTTA"
+VERSION = 2
+HEADER = struct.Struct('<4sHHQQ')
+U32 = struct.Struct('<I')
+
+# (name, array typecode), record = start;end;duration;active;day;app;title;status;tags;id
+COLUMNS = (
+    ('start', 'q'), ('end', 'q'),
+    ('duration', 'i'), ('active', 'i'), ('day', 'i'),
+    ('app', 'I'), ('title', 'I'), ('status', 'I'), ('tags', 'I'), ('id', 'I'),
+)
+VERSION_COLUMNS = {1: COLUMNS[:-1], 2: COLUMNS}
+STRING_COLUMNS = ('app', 'title', 'status', 'tags', 'id')
+
+class ArchiveError(Exception):
+    pass
+
+def archive_path(month_folder):
+    return month_folder / f"archive_{month_folder.name}.bin"
+
+def write_archive(path, records):
+    """
+    records: (start, end, duration, active, day, app, title, status, tags, id) tuples,
+    timestamps in local epoch seconds, day = day number of the source daily file,
+    id = '' for rows without session ID.
+    Written to a temp file, fsynced and renamed so a crash never leaves half an archive.
+    """
+    strings = {}
+    columns = {name: array(code) for name, code in COLUMNS}
+    names = [name for name, _ in COLUMNS]
+
+    for record in records:
+        for name, value in zip(names, record):
+            if name in STRING_COLUMNS:
+                value = strings.setdefault(value, len(strings))
+            columns[name].append(value)
+
+    count = len(columns['start'])
+    body = bytearray()
+    for name, _ in COLUMNS:
+        column = columns[name]
+        if sys.byteorder == 'big':
+            column.byteswap()
+        body += column.tobytes()
+
+    string_table = bytearray(U32.pack(len(strings)))
+    for value in strings:
+        encoded = value.encode('utf-8')
+        string_table += U32.pack(len(encoded)) + encoded
+
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(COLUMNS), count, HEADER.size + len(body)))
+        f.write(body)
+        f.write(string_table)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return count
+
+class MonthArchive:
+    """Read-only view of an archive file. Use as a context manager."""
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ArchiveError(f"Empty archive: {path}")
+
+        magic, version, ncols, self.count, strings_offset = HEADER.unpack_from(self._map, 0)
+        self.columns = VERSION_COLUMNS.get(version)
+        if magic != MAGIC or self.columns is None or ncols != len(self.columns):
+            self.close()
+            raise ArchiveError(f"Unsupported archive: {path}")
+
+        self._offsets = {}
+        offset = HEADER.size
+        for name, code in self.columns:
+            self._offsets[name] = (offset, code)
+            offset += self.count * array(code).itemsize
+
+        self.strings = self._read_strings(strings_offset)
+
+    def _read_strings(self, offset):
+        (count,) = U32.unpack_from(self._map, offset)
+        offset += U32.size
+        strings = []
+        for _ in range(count):
+            (length,) = U32.unpack_from(self._map, offset)
+            offset += U32.size
+            strings.append(self._map[offset:offset + length].decode('utf-8'))
+            offset += length
+        return strings
+
+    def column(self, name):
+        """A column as an array.array, one bulk copy out of the mapping."""
+        offset, code = self._offsets[name]
+        values = array(code)
+        end = offset + self.count * values.itemsize
+        with memoryview(self._map) as view, view[offset:end] as block:
+            values.frombytes(block)
+        if sys.byteorder == 'big':
+            values.byteswap()
+        return values
+
+    def records(self):
+        """Yields (start, end, duration, active, day, app, title, status, tags, id) with strings resolved."""
+        columns = [self.column(name) for name, _ in self.columns]
+        strings = self.strings
+        string_positions = [i for i, (name, _) in enumerate(self.columns) if name in STRING_COLUMNS]
+        missing = ('',) * (len(COLUMNS) - len(self.columns))
+        for row in zip(*columns):
+            row = list(row)
+            for i in string_positions:
+                row[i] = strings[row[i]]
+            yield tuple(row) + missing
+
+    def close(self):
+        if getattr(self, '_map', None) is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
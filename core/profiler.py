@@ -0,0 +1,187 @@
+"""
+Low overhead profiling for long sessions (main.py --profile): a thread samples
+the stack of every other thread at a fixed interval (no tracing, the profiled
+code runs at full speed between samples) and tracemalloc snapshots are taken
+periodically. Reports are written per thread on exit.
+"""
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from datetime import datetime
+import config
+
+# Deepest stack recorded per sample
+MAX_DEPTH = 64
+# Rows of each report table
+TOP = 30
+
+class SamplingProfiler:
+    def __init__(self, output_dir, interval=0.01, memory_interval=60.0, memory_frames=1):
+        self.output_dir = output_dir
+        self.interval = interval
+        self.memory_interval = memory_interval
+        self.memory_frames = memory_frames
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._labels = {} # {code object: "function (file:line)"}
+
+        # Per thread name
+        self.rounds = 0             # Sampling passes over all threads
+        self.samples = Counter()    # {thread: samples}
+        self.self_time = {}         # {thread: Counter({function: samples at the top of the stack})}
+        self.total_time = {}        # {thread: Counter({function: samples anywhere in the stack})}
+        self.stacks = Counter()     # {"thread;outer;...;inner": samples}, collapsed stacks
+
+        self.memory_timeline = []   # [(seconds since start, traced bytes, peak bytes)]
+        self.first_snapshot = None
+        self.last_snapshot = None
+        self.started = None
+        self.sample_cost = 0.0      # Seconds spent sampling, to report the overhead
+
+    def start(self):
+        self.started = time.monotonic()
+        if self.memory_interval > 0:
+            tracemalloc.start(self.memory_frames)
+            self._take_snapshot()
+        self._thread = threading.Thread(target=self._run, name="SamplingProfiler", daemon=True)
+        self._thread.start()
+        print(f"[PROFILE] Sampling every {self.interval * 1000:g} ms, report in {self.output_dir}")
+        return self
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+        if tracemalloc.is_tracing():
+            self._take_snapshot()
+            tracemalloc.stop()
+
+    def _run(self):
+        own = threading.get_ident()
+        next_snapshot = time.monotonic() + self.memory_interval
+        while not self._stop_event.wait(self.interval):
+            t0 = time.perf_counter()
+            self._sample(own)
+            self.sample_cost += time.perf_counter() - t0
+            if self.memory_interval > 0 and time.monotonic() >= next_snapshot:
+                self._take_snapshot()
+                next_snapshot = time.monotonic() + self.memory_interval
+
+    def _sample(self, own):
+        self.rounds += 1
+        names = {t.ident: t.name for t in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            thread = names.get(ident, f"thread-{ident}")
+            stack = []
+            while frame is not None and len(stack) < MAX_DEPTH:
+                stack.append(self._label(frame.f_code))
+                frame = frame.f_back
+            if not stack:
+                continue
+
+            self.samples[thread] += 1
+            self.self_time.setdefault(thread, Counter())[stack[0]] += 1
+            # Recursion counts once per sample
+            self.total_time.setdefault(thread, Counter()).update(set(stack))
+            self.stacks[";".join([thread] + stack[::-1])] += 1
+
+    def _label(self, code):
+        label = self._labels.get(code)
+        if label is None:
+            path = code.co_filename
+            if path.startswith(str(config.BASE_DIR)):
+                path = os.path.relpath(path, config.BASE_DIR)
+            else:
+                path = os.path.basename(path)
+            label = self._labels[code] = f"{code.co_name} ({path}:{code.co_firstlineno})"
+        return label
+
+    def _take_snapshot(self):
+        current, peak = tracemalloc.get_traced_memory()
+        self.memory_timeline.append((time.monotonic() - self.started, current, peak))
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        ))
+        if self.first_snapshot is None:
+            self.first_snapshot = snapshot
+        self.last_snapshot = snapshot
+
+    # --- Reports ---
+
+    def write_report(self):
+        """Writes summary.txt, threads/<name>.txt, stacks.txt and memory.txt. Returns the folder."""
+        os.makedirs(os.path.join(self.output_dir, "threads"), exist_ok=True)
+        elapsed = time.monotonic() - self.started
+        total = sum(self.samples.values())
+
+        lines = [
+            f"Duration: {elapsed:.1f} s, interval {self.interval * 1000:g} ms",
+            f"Sampling cost: {self.sample_cost:.3f} s ({self.sample_cost / max(elapsed, 1e-9):.2%} of the run)",
+            "Wall-clock samples: threads blocked in a wait or a subprocess are counted too.",
+            "",
+            f"{'Thread':<30} {'Samples':>8} {'Share':>7}",
+        ]
+        for thread, count in self.samples.most_common():
+            lines.append(f"{thread:<30} {count:>8} {count / max(total, 1):>7.1%}")
+            self._write(os.path.join("threads", f"{_file_name(thread)}.txt"), self._thread_report(thread))
+        self._write("summary.txt", lines)
+
+        self._write("stacks.txt", [f"{stack} {count}" for stack, count in self.stacks.most_common()])
+        if self.last_snapshot is not None:
+            self._write("memory.txt", self._memory_report())
+        print(f"[PROFILE] Report written to {self.output_dir}")
+        return self.output_dir
+
+    def _thread_report(self, thread):
+        count = self.samples[thread]
+        seconds = count / max(self.rounds, 1) * (time.monotonic() - self.started)
+        lines = [f"{thread}: {count} samples (~{seconds:.1f} s alive)", ""]
+        for title, table in (("Self (top of the stack)", self.self_time[thread]),
+                             ("Total (anywhere in the stack)", self.total_time[thread])):
+            lines.append(f"{title}:")
+            for function, n in table.most_common(TOP):
+                lines.append(f"  {n:>8} {n / count:>7.1%}  {function}")
+            lines.append("")
+        return lines
+
+    def _memory_report(self):
+        lines = ["Traced memory over time (s, current, peak):"]
+        for seconds, current, peak in self.memory_timeline:
+            lines.append(f"  {seconds:>9.1f} {_size(current):>10} {_size(peak):>10}")
+
+        lines += ["", f"Top {TOP} allocations at exit (by line):"]
+        for stat in self.last_snapshot.statistics("lineno")[:TOP]:
+            lines.append(f"  {_size(stat.size):>10} {stat.count:>8} blocks  {stat.traceback}")
+
+        lines += ["", f"Top {TOP} growth since start (by line):"]
+        for stat in self.last_snapshot.compare_to(self.first_snapshot, "lineno")[:TOP]:
+            lines.append(f"  {_size(stat.size_diff):>10} {stat.count_diff:>+8} blocks  {stat.traceback}")
+        return lines
+
+    def _write(self, name, lines):
+        with open(os.path.join(self.output_dir, name), "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+
+def default_output_dir():
+    return str(config.BASE_DIR / "profile" / datetime.now().strftime("%Y-%m-%d_%H-%M-%S"))
+
+def _file_name(thread):
+    return "".join(c if c.isalnum() or c in "-_." else "_" for c in thread)
+
+def _size(n):
+    sign = "-" if n < 0 else ""
+    n = abs(n)
+    for unit in ("B", "KiB", "MiB"):
+        if n < 1024:
+            return f"{sign}{n:.0f} {unit}" if unit == "B" else f"{sign}{n:.1f} {unit}"
+        n /= 1024
+    return f"{sign}{n:.1f} GiB"
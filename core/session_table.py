@@ -0,0 +1,379 @@
+"""
+Columnar in-memory store of all logged sessions.
+
+Columns are array.array buffers (int64 start/end, int32 active seconds and
+dictionary encoded app/title/file codes). Appending is O(1) and, when NumPy
+is installed, queries run vectorized over zero-copy views of the same
+buffers; otherwise the pure Python loops below are used. NumPy is imported by
+the first vectorized query, so processes that only log (the daemon) don't
+load it.
+
+Files are keyed by their 'YYYY-MM-DD' day, every session lives in the file
+of the day it started.
+
+There is one table per log folder in the process (see for_path): every
+LogManager of that folder shares the loaded history.
+"""
+import importlib.util
+import threading
+from array import array
+from pathlib import Path
+from core.log_parser import DAY_SECONDS, day_to_date
+
+HAVE_NUMPY = importlib.util.find_spec("numpy") is not None
+np = None # numpy once _numpy() imported it
+
+def _numpy():
+    global np
+    if np is None:
+        import numpy
+        np = numpy
+    return np
+
+HOUR_SECONDS = 3600
+
+class StringPool:
+    """Dictionary encoding: string <-> small int code."""
+    def __init__(self):
+        self.codes = {}
+        self.values = []
+
+    def encode(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self.codes[value] = code
+            self.values.append(value)
+        return code
+
+class SessionTable:
+    GROUPS = ('app', 'day', 'week', 'hour')
+    _tables = {}
+    _tables_lock = threading.Lock()
+
+    @classmethod
+    def for_path(cls, log_dir):
+        log_dir = Path(log_dir).resolve()
+        with cls._tables_lock:
+            table = cls._tables.get(log_dir)
+            if table is None:
+                table = cls._tables[log_dir] = cls()
+            return table
+
+    def __init__(self, use_numpy=True):
+        self.lock = threading.RLock()
+        self.use_numpy = use_numpy and HAVE_NUMPY
+        self.apps = StringPool()
+        self.titles = StringPool()
+        self.files = StringPool()
+        self.file_signatures = {} # {file key: signature}, loaded files only
+        self.archives = {}        # {month: (signature, [day keys])}, loaded month archives
+        self.version = 0          # Bumped on every change, for result caches
+        self._clear_columns()
+
+    def _clear_columns(self):
+        self.starts = array('q')
+        self.ends = array('q')
+        self.active = array('i')
+        self.app_codes = array('i')
+        self.title_codes = array('i')
+        self.file_codes = array('i')
+        self.live = array('b')
+        self._file_rows = {} # {file code: [row indexes in file order]}
+        self._dead = 0
+
+    def __len__(self):
+        return len(self.starts) - self._dead
+
+    # --- Loading ---
+
+    def is_loaded(self, file_key, signature=None):
+        current = self.file_signatures.get(file_key)
+        if signature is None:
+            return current is not None
+        return current == signature
+
+    def load_file(self, file_key, records, signature):
+        """
+        Replaces every row of file_key with records
+        (start, end, active, app, title) tuples in file order.
+        """
+        with self.lock:
+            self._drop_rows(file_key)
+            if records:
+                self._extend(file_key, records)
+            self.file_signatures[file_key] = signature
+            self.version += 1
+            self._maybe_compact()
+
+    def load_columns(self, slices, starts, ends, active, apps, titles, strings):
+        """
+        Bulk load of already columnar data (month archives).
+        slices: [(file_key, signature, row count)] in row order.
+        apps/titles: codes into strings, re-encoded into this table's pools.
+        """
+        with self.lock:
+            app_map, title_map = {}, {}
+            first = len(self.starts)
+            for file_key, signature, count in slices:
+                self._drop_rows(file_key)
+                file_code = self.files.encode(file_key)
+                row = len(self.file_codes)
+                self._file_rows.setdefault(file_code, []).extend(range(row, row + count))
+                self.file_codes.extend([file_code] * count)
+                self.file_signatures[file_key] = signature
+            self.starts.extend(starts)
+            self.ends.extend(ends)
+            self.active.extend(active)
+            for code in apps:
+                mapped = app_map.get(code)
+                if mapped is None:
+                    mapped = app_map[code] = self.apps.encode(strings[code])
+                self.app_codes.append(mapped)
+            for code in titles:
+                mapped = title_map.get(code)
+                if mapped is None:
+                    mapped = title_map[code] = self.titles.encode(strings[code])
+                self.title_codes.append(mapped)
+            self.live.extend([1] * (len(self.starts) - first))
+            self.version += 1
+            self._maybe_compact()
+
+    def drop_file(self, file_key):
+        with self.lock:
+            if self._drop_rows(file_key):
+                self.version += 1
+            self.file_signatures.pop(file_key, None)
+            self._maybe_compact()
+
+    def append(self, file_key, start, end, active, app, title, signature=None):
+        """Adds one session at the end of file_key (new log line)."""
+        with self.lock:
+            self._append(file_key, start, end, active, app, title)
+            if signature is not None:
+                self.file_signatures[file_key] = signature
+            self.version += 1
+
+    def update_last(self, file_key, start, end, active, app, title, signature=None):
+        """Replaces the last session of file_key (periodic save of the last line)."""
+        with self.lock:
+            rows = self._file_rows.get(self.files.encode(file_key))
+            if not rows:
+                self._append(file_key, start, end, active, app, title)
+            else:
+                i = rows[-1]
+                self.starts[i] = start
+                self.ends[i] = end
+                self.active[i] = active
+                self.app_codes[i] = self.apps.encode(app)
+                self.title_codes[i] = self.titles.encode(title)
+            if signature is not None:
+                self.file_signatures[file_key] = signature
+            self.version += 1
+
+    def _append(self, file_key, start, end, active, app, title):
+        file_code = self.files.encode(file_key)
+        self._file_rows.setdefault(file_code, []).append(len(self.starts))
+        self.starts.append(start)
+        self.ends.append(end)
+        self.active.append(active)
+        self.app_codes.append(self.apps.encode(app))
+        self.title_codes.append(self.titles.encode(title))
+        self.file_codes.append(file_code)
+        self.live.append(1)
+
+    def _extend(self, file_key, records):
+        """Bulk version of _append, one column at a time."""
+        starts, ends, active, apps, titles = zip(*records)
+        file_code = self.files.encode(file_key)
+        first = len(self.starts)
+        self._file_rows.setdefault(file_code, []).extend(range(first, first + len(starts)))
+        self.starts.extend(starts)
+        self.ends.extend(ends)
+        self.active.extend(active)
+        self.app_codes.extend([self.apps.encode(a) for a in apps])
+        self.title_codes.extend([self.titles.encode(t) for t in titles])
+        self.file_codes.extend([file_code] * len(starts))
+        self.live.extend([1] * len(starts))
+
+    def _drop_rows(self, file_key):
+        code = self.files.codes.get(file_key)
+        rows = self._file_rows.pop(code, None) if code is not None else None
+        if not rows:
+            return False
+        for i in rows:
+            self.live[i] = 0
+        self._dead += len(rows)
+        return True
+
+    def _maybe_compact(self):
+        """Rebuilds the columns once a quarter of the rows are dead."""
+        if self._dead < 1024 or self._dead * 4 < len(self.starts):
+            return
+        old = (self.starts, self.ends, self.active, self.app_codes, self.title_codes, self.file_codes, self.live)
+        self._clear_columns()
+        for start, end, active, app, title, file_code, live in zip(*old):
+            if not live:
+                continue
+            self._file_rows.setdefault(file_code, []).append(len(self.starts))
+            self.starts.append(start)
+            self.ends.append(end)
+            self.active.append(active)
+            self.app_codes.append(app)
+            self.title_codes.append(title)
+            self.file_codes.append(file_code)
+            self.live.append(1)
+
+    # --- Queries ---
+
+    def app_code(self, app):
+        return self.apps.codes.get(app)
+
+    def group_totals(self, by, app=None, lo=None, hi=None):
+        """
+        Sums active seconds grouped by 'app' (app name), 'day' (day number),
+        'week' (day number of the Monday) or 'hour' (hour of day 0-23).
+        app restricts to one app, lo/hi to starts inside [lo, hi) in local epoch seconds.
+        """
+        if by not in self.GROUPS:
+            raise ValueError(f"Unknown grouping: {by}")
+        with self.lock:
+            app_code = None
+            if app is not None:
+                app_code = self.apps.codes.get(app)
+                if app_code is None:
+                    return {}
+            if self.use_numpy:
+                totals = self._group_numpy(by, app_code, lo, hi)
+            else:
+                totals = self._group_python(by, app_code, lo, hi)
+            if by == 'app':
+                return {self.apps.values[code]: seconds for code, seconds in totals.items()}
+            return totals
+
+    def total(self, app=None, lo=None, hi=None):
+        return sum(self.group_totals('app', app, lo, hi).values())
+
+    def latest_titles(self, lo=None, hi=None):
+        """{app: title of its latest session} for sessions inside [lo, hi)."""
+        with self.lock:
+            latest = {}
+            for i in self._rows(None, lo, hi):
+                app = self.app_codes[i]
+                best = latest.get(app)
+                if best is None or self.starts[i] >= self.starts[best]:
+                    latest[app] = i
+            return {
+                self.apps.values[app]: self.titles.values[self.title_codes[i]]
+                for app, i in latest.items()
+            }
+
+    def latest_sessions(self):
+        """{app: (end, title)} of the most recent session of every app."""
+        with self.lock:
+            latest = {}
+            for i in self._rows(None, None, None):
+                app = self.app_codes[i]
+                best = latest.get(app)
+                if best is None or self.ends[i] >= self.ends[best]:
+                    latest[app] = i
+            return {
+                self.apps.values[app]: (self.ends[i], self.titles.values[self.title_codes[i]])
+                for app, i in latest.items()
+            }
+
+    def app_names(self):
+        with self.lock:
+            codes = {self.app_codes[i] for i in self._rows(None, None, None)}
+            return sorted(self.apps.values[c] for c in codes)
+
+    def files_with_app(self, app):
+        """File keys holding at least one session of app."""
+        with self.lock:
+            code = self.apps.codes.get(app)
+            if code is None:
+                return set()
+            return {
+                self.files.values[file_code]
+                for file_code, rows in self._file_rows.items()
+                if any(self.app_codes[i] == code for i in rows)
+            }
+
+    def _rows(self, app_code, lo, hi):
+        """Live row indexes matching the filters (pure Python path)."""
+        starts, apps, live = self.starts, self.app_codes, self.live
+        for i in self._candidate_rows(lo, hi):
+            if not live[i]:
+                continue
+            if app_code is not None and apps[i] != app_code:
+                continue
+            if lo is not None and starts[i] < lo:
+                continue
+            if hi is not None and starts[i] >= hi:
+                continue
+            yield i
+
+    def _candidate_rows(self, lo, hi):
+        """For short ranges only the rows of the files of those days are visited."""
+        if lo is None or hi is None or hi - lo > 62 * DAY_SECONDS:
+            return range(len(self.starts))
+        first = day_to_date(lo // DAY_SECONDS).isoformat()
+        last = day_to_date((hi - 1) // DAY_SECONDS).isoformat()
+        rows = []
+        for key, code in self.files.codes.items():
+            # key[:10]: archived days are keyed 'YYYY-MM-DD#archive'
+            if first <= key[:10] <= last:
+                rows.extend(self._file_rows.get(code, ()))
+        return sorted(rows)
+
+    def _group_key(self, by, start, app_code):
+        if by == 'app':
+            return app_code
+        day = start // DAY_SECONDS
+        if by == 'day':
+            return day
+        if by == 'week':
+            # 1970-01-01 was a Thursday
+            return day - (day + 3) % 7
+        return (start % DAY_SECONDS) // HOUR_SECONDS
+
+    def _group_python(self, by, app_code, lo, hi):
+        totals = {}
+        for i in self._rows(app_code, lo, hi):
+            key = self._group_key(by, self.starts[i], self.app_codes[i])
+            totals[key] = totals.get(key, 0) + self.active[i]
+        return totals
+
+    def _group_numpy(self, by, app_code, lo, hi):
+        if not self.starts:
+            return {}
+        np = _numpy()
+        starts = np.frombuffer(self.starts, dtype=np.int64)
+        apps = np.frombuffer(self.app_codes, dtype=np.int32)
+        active = np.frombuffer(self.active, dtype=np.int32)
+
+        mask = np.frombuffer(self.live, dtype=np.int8).astype(bool)
+        if app_code is not None:
+            mask &= apps == app_code
+        if lo is not None:
+            mask &= starts >= lo
+        if hi is not None:
+            mask &= starts < hi
+
+        weights = active[mask].astype(np.int64)
+        if by == 'app':
+            keys = apps[mask]
+        else:
+            day = starts[mask] // DAY_SECONDS
+            if by == 'day':
+                keys = day
+            elif by == 'week':
+                keys = day - (day + 3) % 7
+            else:
+                keys = (starts[mask] % DAY_SECONDS) // HOUR_SECONDS
+
+        if not len(keys):
+            return {}
+        unique, inverse = np.unique(keys, return_inverse=True)
+        sums = np.bincount(inverse, weights=weights)
+        return {int(k): int(v) for k, v in zip(unique, sums)}
@@ -0,0 +1,48 @@
+import time
+from contextlib import contextmanager
+
+class StartupProfile:
+    """
+    Named durations of the startup phases (--startup-profile), printed by report().
+    Phases finishing after the report (tabs built on first activation) are printed
+    as they happen. Disabled, every method is a no-op.
+    """
+    def __init__(self, enabled=False, origin=None):
+        self.enabled = enabled
+        # perf_counter() value the marks are relative to (start of main.py)
+        self.origin = time.perf_counter() if origin is None else origin
+        self.entries = [] # [(name, seconds)]
+        self.reported = False
+
+    @contextmanager
+    def section(self, name):
+        if not self.enabled:
+            yield
+            return
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - t0)
+
+    def add(self, name, seconds):
+        if not self.enabled:
+            return
+        self.entries.append((name, seconds))
+        if self.reported:
+            print(self._line(name, seconds))
+
+    def mark(self, name):
+        """Time elapsed since the origin."""
+        self.add(name, time.perf_counter() - self.origin)
+
+    def report(self):
+        if not self.enabled or self.reported:
+            return
+        print("[STARTUP] Startup profile:")
+        for name, seconds in self.entries:
+            print(self._line(name, seconds))
+        self.reported = True
+
+    def _line(self, name, seconds):
+        return f"[STARTUP] {name:<40} {seconds * 1000:8.1f} ms"
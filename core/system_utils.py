@@ -4,7 +4,19 @@ import ntpath
 import shutil
 import time
 import config
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
+from core import metrics
+
+# Concurrent "ps eww" calls when filtering the window list on wine processes
+CLASSIFY_WORKERS = 8
+
+PROC_READ_HELP = "Reads of /proc/<pid> files and the AFK marker file"
+PROC_EXE = metrics.histogram("proc_read_seconds", PROC_READ_HELP, {'file': 'exe'})
+PROC_CMDLINE = metrics.histogram("proc_read_seconds", PROC_READ_HELP, {'file': 'cmdline'})
+AFK_FILE_READ = metrics.histogram("proc_read_seconds", PROC_READ_HELP, {'file': 'afk'})
+PS_ENVIRON = metrics.histogram("ps_environ_seconds", "ps eww calls classifying wine/proton processes")
+PGREP = metrics.histogram("pgrep_seconds", "pgrep calls looking a process up by name")
 
 class SystemUtils:
     _afk_process = None
@@ -22,32 +34,52 @@ class SystemUtils:
     @staticmethod
     def get_window_list(utils, only_show_wine=False):
         """Returns a list of tuples: (title, window_id) using the detected DE utils."""
-        if not utils: return []
+        return list(SystemUtils.iter_window_list(utils, only_show_wine))
 
-        window_list = []
-        try:
-            window_ids = utils.get_all_window_ids()
+    @staticmethod
+    def iter_window_list(utils, only_show_wine=False, max_workers=CLASSIFY_WORKERS):
+        """
+        Yields (title, window_id) as each window resolves. With only_show_wine
+        the pids are classified concurrently (one ps call per distinct pid) and
+        windows come out in completion order. Closing the generator early drops
+        the classifications not started yet.
+        """
+        if not utils: return
 
-            for wid in window_ids:
+        by_pid = {} # {pid: [(title, wid)]}, windows waiting for classification
+        try:
+            for wid in utils.get_all_window_ids():
                 try:
                     title = utils.get_window_name(wid)
                     if not title:
                         continue
 
-                    if only_show_wine:
-                        pid_str = utils.get_window_pid(wid)
-                        if pid_str and pid_str.isdigit() and SystemUtils.is_wine_or_proton(int(pid_str)):
-                            window_list.append((title, wid))
-                    else:
-                        window_list.append((title, wid))
+                    if not only_show_wine:
+                        yield title, wid
+                        continue
+
+                    pid_str = utils.get_window_pid(wid)
+                    if pid_str and pid_str.isdigit():
+                        by_pid.setdefault(int(pid_str), []).append((title, wid))
                 except Exception:
                     continue
         except Exception:
-            pass
+            return
+
+        if not by_pid:
+            return
 
-        return window_list
+        executor = ThreadPoolExecutor(max_workers=min(max_workers, len(by_pid)))
+        try:
+            futures = {executor.submit(SystemUtils.is_wine_or_proton, pid): pid for pid in by_pid}
+            for future in as_completed(futures):
+                if future.result():
+                    yield from by_pid[futures[future]]
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
 
     @staticmethod
+    @metrics.timed(PS_ENVIRON)
     def get_process_environ(pid):
         """Gets environment variables using ps eww {pid} command"""
         try:
@@ -61,6 +93,7 @@ class SystemUtils:
             return ""
 
     @staticmethod
+    @metrics.timed(PGREP)
     def get_pid_by_name(process_name):
         """
         Extracts the filename and searches the process list.
@@ -108,6 +141,7 @@ class SystemUtils:
         return ntpath.basename(name)
 
     @staticmethod
+    @metrics.timed(PROC_EXE)
     def get_process_name(pid):
         """Returns the executable name from a PID for native applications."""
         try:
@@ -130,6 +164,7 @@ class SystemUtils:
         return "Unknown"
 
     @staticmethod
+    @metrics.timed(PROC_CMDLINE)
     def get_wine_process_name(pid):
         """Extracts the Windows executable name from a Wine/Proton PID."""
         try:
@@ -149,6 +184,7 @@ class SystemUtils:
             return "Unknown"
 
     @staticmethod
+    @metrics.timed(PROC_CMDLINE)
     def get_exe_name_from_cmdline( pid):
         """Extracts the filename from /proc/pid/cmdline (handles Windows and Linux paths)."""
         try:
@@ -159,6 +195,7 @@ class SystemUtils:
             return None
     
     @staticmethod
+    @metrics.timed(PROC_CMDLINE)
     def get_full_cmdline(pid):
         """Gets the full command line for a PID."""
         try:
@@ -211,6 +248,7 @@ class SystemUtils:
             config.AFK_FILE.unlink()
 
     @staticmethod
+    @metrics.timed(AFK_FILE_READ)
     def get_afk_status():
         """
         Returns (is_afk, idle_duration_seconds).
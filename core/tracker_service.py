@@ -2,10 +2,15 @@ from PyQt6.QtCore import QObject, pyqtSignal
 from core.tracker_worker import TrackerWorker
 from core.tracker_bg_worker import TrackerBgWorker
 from core.utils_factory import get_desktop_utils
+from core.live_settings import tracker_listener
 
 class TrackerService(QObject):
     log_received = pyqtSignal(str)
     tracking_finished = pyqtSignal()
+    # LogWriter session-saved events of whichever worker runs, on the GUI thread
+    session_saved = pyqtSignal(object)
+    # (refresh, save, afk) from the settings watcher thread, handled on the GUI thread
+    _settings_changed = pyqtSignal(int, int, int)
 
     def __init__(self):
         super().__init__()
@@ -15,6 +20,15 @@ class TrackerService(QObject):
         except RuntimeError as e:
             print(f"Critical Startup Error: {e}")
             self.desktop_utils = None
+        self._settings_changed.connect(self._push_settings)
+
+    def watch_settings(self, data_manager):
+        """Pushes reloaded tracker settings to the running worker instead of needing a restart."""
+        data_manager.add_settings_listener(tracker_listener(data_manager, self._settings_changed.emit))
+
+    def _push_settings(self, refresh_timer, save_interval, afk_timer):
+        if self.worker and self.worker.isRunning():
+            self.worker.update_settings(refresh_timer, save_interval, afk_timer)
 
     def start_tracking(self, app_name, refresh_timer, save_interval, afk_timer):
         if not self.desktop_utils:
@@ -27,6 +41,7 @@ class TrackerService(QObject):
 
         self.worker = TrackerWorker(app_name, refresh_timer, save_interval, afk_timer, self.desktop_utils)
         self.worker.log_message.connect(self.log_received.emit)
+        self.worker.session_saved.connect(self.session_saved.emit)
         self.worker.finished.connect(self.tracking_finished.emit)
 
         if not self.worker.is_window_open():
@@ -47,6 +62,7 @@ class TrackerService(QObject):
 
         self.worker = TrackerBgWorker(refresh_timer, save_interval, afk_timer, self.desktop_utils)
         self.worker.log_message.connect(self.log_received.emit)
+        self.worker.session_saved.connect(self.session_saved.emit)
         self.worker.finished.connect(self.tracking_finished.emit)
         self.worker.start()    
 
@@ -1,18 +1,32 @@
-import time
-import datetime
+import threading
 from PyQt6.QtCore import QThread, pyqtSignal
 import config
 from core.kde_utils import KdeUtils
 from core.system_utils import SystemUtils
+from core.clock import SYSTEM_CLOCK
+from core.live_settings import SettingsChannel
 from core.log_manager import LogManager
+from core.log_writer import LogWriter
+from core import log_parser, metrics
+
+WORKER = {'worker': 'manual'}
+FOCUS_POLL = metrics.histogram("focus_poll_seconds", "Active window lookups of the tracking loops", WORKER)
+TICKS = metrics.counter("tick_wakeups_total", "Tracking loop wakeups", WORKER)
+AFK_HELP = "AFK transitions seen by the tracking loops"
+AFK_STARTED = metrics.counter("afk_transitions_total", AFK_HELP, {**WORKER, 'to': 'afk'})
+AFK_RESUMED = metrics.counter("afk_transitions_total", AFK_HELP, {**WORKER, 'to': 'active'})
 
 class TrackerWorker(QThread):
     log_message = pyqtSignal(str)
+    session_saved = pyqtSignal(object) # LogWriter session-saved event
 
-    def __init__(self, app_name, refresh_interval, save_interval, afk_timer, desktop_utils):
+    def __init__(self, app_name, refresh_interval, save_interval, afk_timer, desktop_utils, clock=None, system=None):
         super().__init__()
 
         self.utils = desktop_utils
+        # Time and process/AFK lookups, replaced by the focus trace replays (core/focus_trace.py)
+        self.clock = clock or SYSTEM_CLOCK
+        self.system = system or SystemUtils
         self.app_name = app_name
 
         # Find window ID
@@ -22,7 +36,7 @@ class TrackerWorker(QThread):
         if self.target_window_id:
             active_pid = self.utils.get_window_pid(self.target_window_id)
             # print(f'active_pid {active_pid}')
-            self.process_name = SystemUtils.get_app_name_from_pid(active_pid)
+            self.process_name = self.system.get_app_name_from_pid(active_pid)
             # print(f'self.process_name {self.process_name}')
         else:
             self.log_message.emit(f"Could not find Application window ID for: {app_name}")
@@ -30,20 +44,29 @@ class TrackerWorker(QThread):
 
         # print(f'self.process_name {self.process_name}')
 
-        # Initialize the LogManager
+        # Initialize the LogManager, saves go through the writer thread
         self.logger = LogManager(config.LOG_DIR)
+        self.writer = LogWriter(self.logger, on_saved=self.session_saved.emit)
 
         self.refresh_interval = int(refresh_interval)
         self.save_interval = int(save_interval) * 60
         self.afk_timer = int(afk_timer) * 60
+        # New intervals from update_settings(), applied by the loop
+        self.settings = SettingsChannel()
         
         self.running = True
         self.session_line_exists = False
 
+        # Last known state, read by snapshot()
+        self.window_open = True
+        self.focused = False
+        self.afk = False
+
         # Internal counters
         self.total_playtime = 0
         self.session_playtime = 0
-        self.session_start = datetime.datetime.now()
+        self.session_start = self.clock.now()
+        self.session_id = log_parser.new_session_id()
 
         
 
@@ -59,7 +82,7 @@ class TrackerWorker(QThread):
                 return True
 
             # Looks up if new PID exists
-            new_pid = SystemUtils.get_pid_by_name(self.process_name)
+            new_pid = self.system.get_pid_by_name(self.process_name)
             #print(f'new_pid {new_pid}')
             if new_pid:
                 new_wid = self.utils.find_window_by_pid(new_pid)
@@ -78,26 +101,30 @@ class TrackerWorker(QThread):
         if not self.target_window_id:
             return False
 
-        active_id = self.utils.get_active_window_id()
+        with FOCUS_POLL.time():
+            active_id = self.utils.get_active_window_id()
         #print(f"active_id: {active_id}")
         #print(f"self.target_window_id: {self.target_window_id}")
         return str(active_id) == str(self.target_window_id)
 
     def run(self):
         """ Main loop logic to calculate active window focus """
+        # Named for --profile reports (QThreads show up as Dummy-N otherwise)
+        threading.current_thread().name = "TrackerWorker"
         # Load previous total playtime
         # Scan daily logs for this specific app's history
         self.total_playtime = self.logger.get_total_app_playtime(self.process_name)
         self.log_message.emit(f"Starting tracking for: {self.app_name} - {self.process_name} - {self.target_window_id}")
         self.log_message.emit(f"Starting playtime: {self.logger.format_duration(self.total_playtime)}")
+        self.writer.start()
 
         # Launch swayidle afk detection
         if self.afk_timer > 0:
-            SystemUtils.start_afk_daemon(self.afk_timer)
+            self.system.start_afk_daemon(self.afk_timer)
 
         was_afk = False
 
-        last_tick = time.monotonic()
+        last_tick = self.clock.monotonic()
         last_log_update = last_tick
         last_save_time = last_tick
 
@@ -109,7 +136,12 @@ class TrackerWorker(QThread):
         accumulator = 0.0
 
         while self.running:
-            now = time.monotonic()
+            TICKS.inc()
+            update = self.settings.take()
+            if update:
+                self._apply_settings(*update)
+
+            now = self.clock.monotonic()
             delta = now - last_tick
             last_tick = now
             accumulator += delta
@@ -126,25 +158,29 @@ class TrackerWorker(QThread):
                     window_currently_open = True
 
                 # AFK check
-                is_afk, idle_time = SystemUtils.get_afk_status()
+                is_afk, idle_time = self.system.get_afk_status()
 
                 if is_afk and not was_afk:
                     self.log_message.emit("Status: AFK (Tracking paused)")
+                    AFK_STARTED.inc()
                     was_afk = True
                 elif not is_afk and was_afk:
                     self.log_message.emit("Status: Resumed (Back from AFK)")
+                    AFK_RESUMED.inc()
                     was_afk = False
                 
                 last_existence_check = now
+                self.window_open = window_currently_open
+                self.afk = is_afk
                 
             # Increment timer every second if focused and not AFK
             if accumulator >= 1.0:
                 seconds_passed = int(accumulator)
 
-                if window_currently_open and not is_afk:
-                    if self.is_game_focused():
-                        self.total_playtime += seconds_passed
-                        self.session_playtime += seconds_passed
+                self.focused = window_currently_open and not is_afk and self.is_game_focused()
+                if self.focused:
+                    self.total_playtime += seconds_passed
+                    self.session_playtime += seconds_passed
 
                 # Keep the fractional remainder
                 accumulator -= seconds_passed
@@ -161,15 +197,31 @@ class TrackerWorker(QThread):
                 last_save_time = now
 
             # Small sleep to reduce CPU usage
-            time.sleep(0.1)
+            self.clock.sleep(0.1)
 
         # Stop swayidle
-        SystemUtils.stop_afk_daemon()
+        self.system.stop_afk_daemon()
         # Persist session on exit
         self._trigger_log_save(is_final=True)
+        self.writer.stop()
+        self.log_message.emit(f"Log writer: {self.writer.stats()}")
+
+    def _apply_settings(self, refresh_interval, save_interval, afk_timer):
+        """
+        Takes new intervals without ending the session: the log and autosave
+        deadlines move with them, swayidle restarts only if the threshold changed.
+        """
+        self.refresh_interval = refresh_interval
+        self.save_interval = save_interval * 60
+        if afk_timer * 60 != self.afk_timer:
+            self.system.stop_afk_daemon()
+            self.afk_timer = afk_timer * 60
+            if self.afk_timer > 0:
+                self.system.start_afk_daemon(self.afk_timer)
+        self.log_message.emit(f"Settings applied: save every {self.save_interval}s, AFK threshold {self.afk_timer}s")
 
     def _trigger_log_save(self, is_final=False):
-        now = datetime.datetime.now()
+        now = self.clock.now()
         
         # Prepare the data packet for the LogManager
         session_data = {
@@ -180,19 +232,41 @@ class TrackerWorker(QThread):
             'app': self.process_name,
             'title': self.app_name,
             'status': "Manual",
-            'tags': ""
+            'tags': "",
+            'id': self.session_id
         }
 
-        # Save to file
-        log_file = self.logger.save_session(session_data, is_update=self.session_line_exists)
+        # Hand over to the writer thread, no disk I/O here
+        self.writer.submit(session_data, is_update=self.session_line_exists, final=is_final)
         self.session_line_exists = True
+        log_file = self.logger.get_daily_file(self.session_start, create=False)
             
         if is_final:
             session_length = int((now - self.session_start).total_seconds())
             self.log_message.emit(f"Session Length: {self.logger.format_duration(session_length)} Session Playtime: {self.logger.format_duration(self.session_playtime)} Total Playtime: {self.logger.format_duration(self.total_playtime)}")
             self.log_message.emit(f"Final session saved to {log_file.name}")
         else:
-            self.log_message.emit(f"Progress autosaved to {log_file.name}")
+            self.log_message.emit(f"Progress autosaved to {log_file.name} (writer queue: {self.writer.queue_depth}, last flush: {self.writer.last_flush_latency * 1000:.1f} ms)")
+
+    def snapshot(self):
+        """Current session and focus state (control API), safe from any thread."""
+        return {
+            'mode': 'manual',
+            'app': self.process_name,
+            'title': self.app_name,
+            'session_id': self.session_id,
+            'session_start': self.session_start.isoformat(timespec='seconds'),
+            'session_seconds': self.session_playtime,
+            'saved_seconds': self.writer.saved_active(self.session_id),
+            'total_seconds': self.total_playtime,
+            'window_open': self.window_open,
+            'focused': self.focused,
+            'afk': self.afk,
+        }
+
+    def update_settings(self, refresh_interval, save_interval, afk_timer):
+        """Thread safe, same units as the constructor. Applied on the next tick."""
+        self.settings.put(refresh_interval, save_interval, afk_timer)
 
     def stop(self):
         self.running = False
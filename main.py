@@ -1,32 +1,123 @@
+import time
+STARTED = time.perf_counter()
+
 import sys
 import signal
 import ctypes
 import ctypes.util
-from PyQt6.QtWidgets import QApplication
-from ui.main_window import MainWindow
-from core.tracker_service import TrackerService
-from core.data_manager import DataManager
 from core.cli_handler import CliHandler
-from core.cli_controller import CliController
+from core.startup_profile import StartupProfile
+import config
+
+IMPORTED = time.perf_counter()
 
 def main():
     set_process_name("PlayTimeTracker")
     cli = CliHandler()
     args = cli.parse()
-    
-    app = QApplication(sys.argv)
+
+    # Client of the control API of a running tracker
+    if args.command == "ctl":
+        sys.exit(run_ctl(args))
+
+    profile = StartupProfile(enabled=args.startup_profile, origin=STARTED)
+    profile.add("imports (main.py)", IMPORTED - STARTED)
+
+    profiler = start_profiler(args)
+    try:
+        code = run(args, profile)
+    finally:
+        if profiler:
+            profiler.stop()
+            profiler.write_report()
+    sys.exit(code)
+
+def run(args, profile):
+    # Log maintenance commands run without the UI
+    if args.seal_months or args.unseal:
+        return run_log_command(args)
+
+    # Background mode never loads Qt
+    if args.background:
+        from core.daemon import run_daemon
+        return run_daemon()
+
+    return run_gui(args, profile)
+
+def start_profiler(args):
+    """--profile: sampling profiler running until main() returns, None otherwise."""
+    if args.profile is None:
+        return None
+    from core.profiler import SamplingProfiler, default_output_dir
+    return SamplingProfiler(args.profile or default_output_dir(), args.profile_interval / 1000).start()
+
+def run_gui(args, profile):
+    with profile.section("GUI imports"):
+        from PyQt6.QtWidgets import QApplication
+        from PyQt6.QtCore import QTimer
+        from ui.main_window import MainWindow
+        from core.tracker_service import TrackerService
+        from core.data_manager import DataManager
+        from core.cli_controller import CliController
+        from core.live_settings import SettingsWatcher
+
+    with profile.section("QApplication"):
+        app = QApplication(sys.argv)
     signal.signal(signal.SIGINT, signal.SIG_DFL)
 
-    data_manager = DataManager()
-    tracker_service = TrackerService()
-    window = MainWindow(tracker_service, data_manager)
+    with profile.section("DataManager + TrackerService"):
+        data_manager = DataManager()
+        tracker_service = TrackerService()
+    from core import metrics
+    exporter = metrics.configure(data_manager.settings)
+    tracker_service.watch_settings(data_manager)
+    settings_watcher = SettingsWatcher(data_manager).start()
+    window = MainWindow(tracker_service, data_manager, profile)
 
     controller = CliController(window, tracker_service, data_manager)
     controller.handle_args(args)
+    controller.start_control_server()
+
+    window.show()
+    # Once the event loop has shown the window
+    QTimer.singleShot(0, lambda: (profile.mark("time to window"), profile.report()))
+    code = app.exec()
+    controller.stop_control_server()
+    settings_watcher.stop()
+    if exporter:
+        exporter.stop()
+    return code
+
+def run_log_command(args):
+    from core.log_manager import LogManager
+    logger = LogManager(config.LOG_DIR)
+    try:
+        if args.unseal:
+            count = logger.unseal_month(args.unseal)
+            print(f"Restored {count} sessions of {args.unseal} to CSV files.")
+        else:
+            sealed = logger.seal_closed_months()
+            for month, count in sealed.items():
+                print(f"Sealed {month}: {count} sessions.")
+            if not sealed:
+                print("Nothing to seal.")
+    except Exception as e:
+        print(f"[LOG ERROR] {e}")
+        return 1
+    return 0
 
-    if not args.background:
-        window.show()
-    sys.exit(app.exec())
+def run_ctl(args):
+    """Sends one command to the running tracker and prints its JSON reply."""
+    import json
+    from core.control_server import send_command
+    params = {'target': args.target} if args.target else {}
+    try:
+        reply = send_command(args.ctl_command, **params)
+    except OSError as e:
+        print(json.dumps({'ok': False, 'error': f"No tracker running ({e})"}))
+        return 2
+    print(json.dumps(reply, indent=2 if sys.stdout.isatty() else None, ensure_ascii=False))
+    return 0 if reply.get('ok') else 1
 
 def set_process_name(name):
     libc = ctypes.CDLL(ctypes.util.find_library('c'))
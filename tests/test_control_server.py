@@ -0,0 +1,39 @@
+from datetime import datetime, timedelta
+from core import log_parser
+from core.control_server import TodayTotals
+from core.log_manager import LogManager
+from core.log_writer import LogWriter
+
+def make_session(session_id, start, active):
+    return {
+        'id': session_id, 'start': start, 'end': start + timedelta(seconds=active),
+        'duration': active, 'active_time': active,
+        'app': 'game.exe', 'title': 'Game', 'status': 'Focused', 'tags': '',
+    }
+
+def tracker_snapshot(writer, session_id, start, seconds):
+    return {
+        'app': 'game.exe', 'session_id': session_id,
+        'session_start': start.isoformat(timespec='seconds'),
+        'session_seconds': seconds, 'saved_seconds': writer.saved_active(session_id),
+    }
+
+def test_today_first_query_counts_saved_playtime_once(tmp_path):
+    totals = TodayTotals(LogManager(tmp_path))
+    writer = LogWriter(LogManager(tmp_path), on_saved=totals.on_saved)
+    writer.start()
+    try:
+        session_id = log_parser.new_session_id()
+        start = datetime.now().replace(microsecond=0) - timedelta(seconds=400)
+        writer.submit(make_session(session_id, start, 300))
+        assert writer.flush(timeout=5)
+
+        # First query: the logs hold 300 s of the session, 20 s more are unsaved
+        assert totals.snapshot(tracker_snapshot(writer, session_id, start, 320)) == {'game.exe': 320}
+
+        # A later save arrives as an event, then 5 s more are tracked
+        writer.submit(make_session(session_id, start, 330), is_update=True)
+        assert writer.flush(timeout=5)
+        assert totals.snapshot(tracker_snapshot(writer, session_id, start, 335)) == {'game.exe': 335}
+    finally:
+        writer.stop()
@@ -0,0 +1,25 @@
+from datetime import date, datetime
+from core import log_parser
+from core.log_manager import LogManager
+
+def save(manager, start, end, app="game.exe"):
+    manager.save_session({
+        'id': log_parser.new_session_id(), 'start': start, 'end': end,
+        'duration': (end - start).seconds, 'active_time': (end - start).seconds,
+        'app': app, 'title': 'Game', 'status': 'Focused', 'tags': '',
+    })
+
+def test_short_range_ending_on_a_sealed_day(tmp_path):
+    manager = LogManager(tmp_path)
+    save(manager, datetime(2025, 1, 30, 20, 0), datetime(2025, 1, 30, 21, 0))
+    save(manager, datetime(2025, 1, 31, 20, 0), datetime(2025, 1, 31, 20, 30))
+    assert manager.seal_month("2025-01") == 2
+
+    # The pure Python path (no NumPy) visits only the files of short ranges
+    manager = LogManager(tmp_path)
+    manager.sessions.use_numpy = False
+    total, daily = manager.get_stats_for_app("game.exe", date(2025, 1, 31), date(2025, 2, 1))
+    assert total == 1800
+    total, daily = manager.get_stats_for_app("game.exe", date(2025, 1, 30), date(2025, 2, 1))
+    assert total == 5400
+    assert len(daily) == 2
@@ -0,0 +1,63 @@
+"""
+Optional export of the Statistics charts through matplotlib (PNG, SVG, PDF).
+matplotlib is imported only when an export is requested; without it the
+Statistics tab saves a PNG screenshot of its own chart widget instead.
+"""
+import importlib.util
+
+FONTS = [
+    'Noto Sans CJK JP', 'WenQuanYi Micro Hei', 'IPAexGothic',
+    'Droid Sans Fallback', 'DejaVu Sans'
+]
+
+def available():
+    return importlib.util.find_spec("matplotlib") is not None
+
+def _figure(figsize):
+    # Figure + Agg canvas directly: no pyplot, no GUI backend
+    import matplotlib
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    matplotlib.rcParams['font.sans-serif'] = FONTS
+    matplotlib.rcParams['axes.unicode_minus'] = False
+    figure = Figure(figsize=figsize, facecolor='#1e1e1e')
+    FigureCanvasAgg(figure)
+    ax = figure.add_subplot()
+    ax.set_facecolor('#1e1e1e')
+    for spine in ax.spines.values():
+        spine.set_color('#444444')
+    return figure, ax
+
+def export_app_chart(path, buckets, title=""):
+    """buckets: get_app_series() buckets, [(start date, length in days, hours)]."""
+    import matplotlib.dates as mdates
+    from datetime import timedelta
+
+    figure, ax = _figure((10, 5))
+    ax.tick_params(axis='x', colors='white', labelsize=8, labelrotation=30)
+    ax.tick_params(axis='y', colors='white', labelsize=8)
+    if buckets:
+        centers = [start + timedelta(days=length / 2) for start, length, _ in buckets]
+        widths = [length * 0.8 if length > 1 else 0.6 for _, length, _ in buckets]
+        ax.bar(centers, [hours for _, _, hours in buckets], width=widths, color='#3498db')
+        ax.xaxis.set_major_locator(mdates.AutoDateLocator())
+        ax.xaxis.set_major_formatter(mdates.DateFormatter('%b %d %Y'))
+    if title:
+        ax.set_title(title, color='white')
+    figure.savefig(path, facecolor=figure.get_facecolor(), bbox_inches='tight')
+
+def export_global_chart(path, labels, hours):
+    """labels/hours as shown in the global summary (first item at the bottom)."""
+    figure, ax = _figure((10, 6))
+    if labels:
+        bars = ax.barh(labels, hours, color='#e67e22', height=0.7)
+        for bar in bars:
+            width = bar.get_width()
+            ax.text(width + 0.05, bar.get_y() + bar.get_height() / 2, f' {width:.1f}h',
+                    va='center', color='#f1c40f', fontsize=10, fontweight='bold')
+        ax.set_xlim(0, (max(hours) or 1) * 1.25)
+    ax.tick_params(axis='y', colors='white', labelsize=8)
+    ax.tick_params(axis='x', colors='#888', labelsize=8)
+    figure.subplots_adjust(left=0.4, right=0.95, top=0.95, bottom=0.1)
+    figure.savefig(path, facecolor=figure.get_facecolor())
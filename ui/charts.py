@@ -0,0 +1,237 @@
+"""
+QPainter bar charts of the Statistics tab (dark theme), so the GUI doesn't
+need matplotlib. Text goes through Qt's font fallback, CJK titles included.
+matplotlib is only used, when installed, to export charts (ui/chart_export.py).
+"""
+import math
+from datetime import date, timedelta
+from PyQt6.QtWidgets import QWidget
+from PyQt6.QtCore import Qt, QRectF, QPointF, pyqtSignal
+from PyQt6.QtGui import QPainter, QColor, QFont, QPen, QFontMetrics
+
+BACKGROUND = QColor('#1e1e1e')
+SPINE = QColor('#444444')
+EMPTY_TEXT = QColor('gray')
+
+# Date axis tick steps, finest first: (unit, step, approximate days)
+DATE_TICK_STEPS = (
+    ('day', 1, 1), ('day', 2, 2), ('day', 7, 7), ('day', 14, 14),
+    ('month', 1, 30), ('month', 2, 61), ('month', 3, 91), ('month', 6, 182),
+    ('year', 1, 365), ('year', 2, 730), ('year', 5, 1826), ('year', 10, 3652),
+)
+DATE_TICK_FORMATS = {'day': '%b %d', 'month': '%b %Y', 'year': '%Y'}
+
+def nice_ticks(maximum, count=5):
+    """Round tick values (1, 2, 5 x 10^n steps) from 0 to at least maximum."""
+    if maximum <= 0:
+        return [0]
+    raw = maximum / count
+    magnitude = 10 ** math.floor(math.log10(raw))
+    step = next(m * magnitude for m in (1, 2, 5, 10) if m * magnitude >= raw)
+    return [i * step for i in range(int(maximum // step) + 1)]
+
+def format_tick(value):
+    return f"{value:g}"
+
+def date_ticks(first, last, max_ticks):
+    """(date, label) ticks between first and last with at most max_ticks of them."""
+    span = (last - first).days
+    unit, step, _ = next(
+        (s for s in DATE_TICK_STEPS if span / s[2] <= max_ticks), DATE_TICK_STEPS[-1]
+    )
+    if unit == 'day':
+        current = first
+    elif unit == 'month':
+        current = first.replace(day=1)
+    else:
+        current = first.replace(month=1, day=1)
+
+    ticks = []
+    while current <= last:
+        if current >= first:
+            ticks.append((current, current.strftime(DATE_TICK_FORMATS[unit])))
+        if unit == 'day':
+            current += timedelta(days=step)
+        elif unit == 'month':
+            months = current.month - 1 + step
+            current = current.replace(year=current.year + months // 12, month=months % 12 + 1)
+        else:
+            current = current.replace(year=current.year + step)
+    return ticks
+
+class DateBarChart(QWidget):
+    """
+    Vertical bars over a date axis, one bar per bucket of get_app_series()
+    (day, week, month or year). The mouse wheel asks for a zoom around the pointer.
+    """
+    zoom_requested = pyqtSignal(float, object) # factor, center date
+
+    MARGINS = (45, 10, 10, 30) # left, top, right, bottom
+
+    def __init__(self, color='#3498db', parent=None):
+        super().__init__(parent)
+        self.color = QColor(color)
+        self.buckets = []   # [(start date, length in days, hours)]
+        self.x_range = None # (first, end) dates, end exclusive
+        self.setMinimumHeight(150)
+
+    def set_series(self, buckets, x_range):
+        self.buckets = list(buckets)
+        self.x_range = x_range if self.buckets else None
+        self.update()
+
+    def clear(self):
+        self.set_series([], None)
+
+    def plot_rect(self):
+        left, top, right, bottom = self.MARGINS
+        return QRectF(left, top, max(1, self.width() - left - right), max(1, self.height() - top - bottom))
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), BACKGROUND)
+        rect = self.plot_rect()
+        small = QFont(self.font())
+        small.setPointSize(8)
+        painter.setFont(small)
+
+        if not self.buckets:
+            painter.setPen(EMPTY_TEXT)
+            painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, "No data available")
+            self.draw_spines(painter, rect)
+            return
+
+        first, end = self.x_range
+        x0, x1 = first.toordinal(), end.toordinal()
+        days = max(x1 - x0, 1)
+        y_max = max(hours for _, _, hours in self.buckets) * 1.05 or 1
+
+        def to_x(ordinal):
+            return rect.left() + (ordinal - x0) / days * rect.width()
+
+        def to_y(value):
+            return rect.bottom() - value / y_max * rect.height()
+
+        # Y axis
+        metrics = QFontMetrics(small)
+        painter.setPen(Qt.GlobalColor.white)
+        for value in nice_ticks(y_max):
+            y = to_y(value)
+            painter.drawLine(QPointF(rect.left() - 4, y), QPointF(rect.left(), y))
+            painter.drawText(QRectF(0, y - 8, rect.left() - 6, 16),
+                             Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter, format_tick(value))
+
+        # X axis, as many labels as fit
+        label_width = metrics.horizontalAdvance("Mmm 0000") + 12
+        max_ticks = max(2, int(rect.width() // label_width))
+        for tick, label in date_ticks(first, end - timedelta(days=1), max_ticks):
+            x = to_x(tick.toordinal())
+            painter.drawLine(QPointF(x, rect.bottom()), QPointF(x, rect.bottom() + 4))
+            painter.drawText(QRectF(x - label_width / 2, rect.bottom() + 5, label_width, 16),
+                             Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignTop, label)
+
+        # Bars
+        painter.setClipRect(rect)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(self.color)
+        scale = rect.width() / days
+        for start, length, hours in self.buckets:
+            width = (length * 0.8 if length > 1 else 0.6) * scale
+            center = to_x(start.toordinal() + length / 2)
+            top = to_y(hours)
+            painter.drawRect(QRectF(center - width / 2, top, max(width, 1.0), rect.bottom() - top))
+        painter.setClipping(False)
+
+        self.draw_spines(painter, rect)
+
+    def draw_spines(self, painter, rect):
+        painter.setPen(QPen(SPINE))
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        painter.drawRect(rect)
+
+    def wheelEvent(self, event):
+        if not self.x_range:
+            return
+        rect = self.plot_rect()
+        x = event.position().x()
+        if not rect.left() <= x <= rect.right():
+            return
+        first, end = self.x_range
+        ordinal = first.toordinal() + (x - rect.left()) / rect.width() * (end - first).days
+        center = date.fromordinal(int(ordinal))
+        self.zoom_requested.emit(0.5 if event.angleDelta().y() > 0 else 2.0, center)
+        event.accept()
+
+class HBarChart(QWidget):
+    """Horizontal bars with a label on the left and the value after the bar, first item at the bottom."""
+    LABEL_RATIO = 0.4 # Share of the width for the labels ("Process (Title)")
+
+    def __init__(self, color='#e67e22', value_color='#f1c40f', parent=None):
+        super().__init__(parent)
+        self.color = QColor(color)
+        self.value_color = QColor(value_color)
+        self.labels = []
+        self.values = []
+        self.setMinimumHeight(200)
+
+    def set_data(self, labels, values):
+        self.labels = list(labels)
+        self.values = list(values)
+        self.update()
+
+    def plot_rect(self):
+        left = self.width() * self.LABEL_RATIO
+        right = self.width() * 0.05
+        top, bottom = self.height() * 0.05, max(24, self.height() * 0.1)
+        return QRectF(left, top, max(1, self.width() - left - right), max(1, self.height() - top - bottom))
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), BACKGROUND)
+        rect = self.plot_rect()
+        small = QFont(self.font())
+        small.setPointSize(8)
+        painter.setFont(small)
+        painter.setPen(QPen(SPINE))
+        painter.drawRect(rect)
+        if not self.labels:
+            return
+
+        # Give extra space for the hours on the right
+        x_max = (max(self.values) or 1) * 1.25
+        row = rect.height() / len(self.labels)
+
+        def to_x(value):
+            return rect.left() + value / x_max * rect.width()
+
+        # X axis
+        painter.setPen(QColor('#888'))
+        for value in nice_ticks(x_max):
+            x = to_x(value)
+            painter.drawLine(QPointF(x, rect.bottom()), QPointF(x, rect.bottom() + 4))
+            painter.drawText(QRectF(x - 30, rect.bottom() + 5, 60, 16),
+                             Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignTop, format_tick(value))
+
+        value_font = QFont(self.font())
+        value_font.setPointSize(10)
+        value_font.setBold(True)
+
+        for i, (label, value) in enumerate(zip(self.labels, self.values)):
+            center = rect.bottom() - (i + 0.5) * row
+            bar_height = row * 0.7
+
+            painter.setFont(small)
+            painter.setPen(Qt.GlobalColor.white)
+            painter.drawText(QRectF(0, center - row / 2, rect.left() - 6, row),
+                             Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter, label)
+
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(self.color)
+            end = to_x(value)
+            painter.drawRect(QRectF(rect.left(), center - bar_height / 2, end - rect.left(), bar_height))
+
+            # Value labels
+            painter.setFont(value_font)
+            painter.setPen(self.value_color)
+            painter.drawText(QRectF(end + 2, center - row / 2, rect.right() - end + 40, row),
+                             Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, f" {value:.1f}h")
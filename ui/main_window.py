@@ -1,16 +1,24 @@
-from PyQt6.QtWidgets import QMainWindow, QTabWidget
-from ui.tabs.tracking_tab import TrackingTab
-from ui.tabs.stats_tab import StatsTab
-from ui.tabs.notes_tab import NotesTab
-from ui.tabs.logs_tab import LogsTab
-from ui.tabs.settings_tab import SettingsTab
+import importlib
+from PyQt6.QtWidgets import QMainWindow, QTabWidget, QWidget, QVBoxLayout
+from core.startup_profile import StartupProfile
 import config
 
+# (title, attribute, module, class, constructor arguments taken from the window)
+# Tabs are imported and built on their first activation, only Tracking at startup.
+TABS = (
+    ("Tracking", "tracking_tab", "ui.tabs.tracking_tab", "TrackingTab", ("tracker_service", "data_manager")),
+    ("Statistics", "stats_tab", "ui.tabs.stats_tab", "StatsTab", ("data_manager", "tracker_service")),
+    ("Notes", "notes_tab", "ui.tabs.notes_tab", "NotesTab", ("data_manager",)),
+    ("Logs", "logs_tab", "ui.tabs.logs_tab", "LogsTab", ("data_manager",)),
+    ("Settings", "settings_tab", "ui.tabs.settings_tab", "SettingsTab", ("data_manager",)),
+)
+
 class MainWindow(QMainWindow):
-    def __init__(self, tracker_service, data_manager):
+    def __init__(self, tracker_service, data_manager, profile=None):
         super().__init__()
         self.tracker_service = tracker_service
         self.data_manager = data_manager
+        self.profile = profile or StartupProfile()
 
         self.setWindowTitle(f"PlayTimeTracker {config.VERSION}")
         self.setGeometry(100, 100, 800, 600)
@@ -18,19 +26,34 @@ class MainWindow(QMainWindow):
         self.tabs = QTabWidget()
         self.setCentralWidget(self.tabs)
 
-        # Initialize Tabs
-        self.tracking_tab = TrackingTab(tracker_service, data_manager)
-        self.stats_tab = StatsTab(data_manager)
-        self.notes_tab = NotesTab(data_manager)
-        self.logs_tab = LogsTab(data_manager)
-        self.settings_tab = SettingsTab(data_manager)
+        # Initialize Tabs: empty pages until first shown
+        for title, attribute, _, _, _ in TABS:
+            setattr(self, attribute, None)
+            page = QWidget()
+            layout = QVBoxLayout(page)
+            layout.setContentsMargins(0, 0, 0, 0)
+            self.tabs.addTab(page, title)
+
+        self.ensure_tab(self.tabs.currentIndex())
+        self.tabs.currentChanged.connect(self.ensure_tab)
+
+    def ensure_tab(self, index):
+        """Imports and builds the tab at index if not done yet, returns it."""
+        _, attribute, module_name, class_name, arg_names = TABS[index]
+        tab = getattr(self, attribute)
+        if tab is not None:
+            return tab
+
+        with self.profile.section(f"import {module_name}"):
+            module = importlib.import_module(module_name)
+        with self.profile.section(f"construct {class_name}"):
+            tab = getattr(module, class_name)(*(getattr(self, name) for name in arg_names))
 
-        self.tabs.addTab(self.tracking_tab, "Tracking")
-        self.tabs.addTab(self.stats_tab, "Statistics")
-        self.tabs.addTab(self.notes_tab, "Notes")
-        self.tabs.addTab(self.logs_tab, "Logs")
-        self.tabs.addTab(self.settings_tab, "Settings")
+        self.tabs.widget(index).layout().addWidget(tab)
+        setattr(self, attribute, tab)
+        return tab
 
     def closeEvent(self, event):
         self.tracking_tab.stop_tracking()
+        self.tracking_tab.cancel_refresh()
         event.accept()
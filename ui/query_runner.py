@@ -0,0 +1,89 @@
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+class _QuerySignals(QObject):
+    # (task, result, error)
+    done = pyqtSignal(object, object, object)
+
+class _QueryTask(QRunnable):
+    def __init__(self, kind, fn, args, signals):
+        super().__init__()
+        # Kept alive by QueryRunner until its result is delivered
+        self.setAutoDelete(False)
+        self.kind = kind
+        self.fn = fn
+        self.args = args
+        self.signals = signals
+        self.cancelled = False
+
+    def run(self):
+        result, error = None, None
+        # Superseded before it even started: skip the work
+        if not self.cancelled:
+            try:
+                result = self.fn(*self.args)
+            except Exception as e:
+                error = e
+        try:
+            self.signals.done.emit(self, result, error)
+        except RuntimeError:
+            # The runner was deleted meanwhile (window closed, app exiting): nobody to deliver to
+            pass
+
+class QueryRunner(QObject):
+    """
+    Runs blocking queries (log scans) on a QThreadPool and delivers the results
+    on the GUI thread. There is at most one live query per kind: submitting a
+    new one cancels the previous (removed from the pool queue if not started,
+    its result dropped otherwise), so fast combo changes never pile up scans.
+    """
+    finished = pyqtSignal(str, object)   # kind, result
+    failed = pyqtSignal(str, str)        # kind, error message
+    busy_changed = pyqtSignal(str, bool) # kind, running
+
+    def __init__(self, parent=None, max_threads=2):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads)
+        self._current = {} # {kind: latest task}
+        self._tasks = set() # Every task not delivered yet
+        self._signals = _QuerySignals()
+        self._signals.done.connect(self._on_done)
+
+    def submit(self, kind, fn, *args):
+        """Runs fn(*args) in the pool, result sent with finished(kind, result)."""
+        self._cancel_task(self._current.get(kind))
+        task = _QueryTask(kind, fn, args, self._signals)
+        self._current[kind] = task
+        self._tasks.add(task)
+        self.pool.start(task)
+        self.busy_changed.emit(kind, True)
+
+    def cancel(self, kind):
+        task = self._current.pop(kind, None)
+        if task is not None:
+            self._cancel_task(task)
+            self.busy_changed.emit(kind, False)
+
+    def is_busy(self, kind):
+        return kind in self._current
+
+    def wait(self, msecs=-1):
+        return self.pool.waitForDone(msecs)
+
+    def _cancel_task(self, task):
+        if task is None:
+            return
+        task.cancelled = True
+        if self.pool.tryTake(task):
+            self._tasks.discard(task)
+
+    def _on_done(self, task, result, error):
+        self._tasks.discard(task)
+        if task.cancelled or self._current.get(task.kind) is not task:
+            return
+        del self._current[task.kind]
+        self.busy_changed.emit(task.kind, False)
+        if error is not None:
+            self.failed.emit(task.kind, str(error))
+        else:
+            self.finished.emit(task.kind, result)
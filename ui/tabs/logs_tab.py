@@ -1,20 +1,177 @@
 import config
 from core.log_manager import LogManager
+from ui.query_runner import QueryRunner
 from PyQt6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QComboBox, QPushButton, 
-    QTableWidget, QTableWidgetItem, QHeaderView, QMessageBox, 
-    QLabel, QScrollArea, QMenu
+    QWidget, QVBoxLayout, QHBoxLayout, QComboBox, QPushButton,
+    QTableView, QHeaderView, QMessageBox, QLabel, QMenu, QAbstractItemView
 )
-from PyQt6.QtGui import QIcon, QAction
-from PyQt6.QtCore import QTimer, Qt
-from pathlib import Path
+from PyQt6.QtGui import QAction, QColor, QFont
+from PyQt6.QtCore import QTimer, Qt, QAbstractTableModel, QModelIndex
+
+ID_COLUMN = 8
+# Days read per fetchMore (one daily file each)
+PAGE_DAYS = 30
+
+class LogTableModel(QAbstractTableModel):
+    """
+    Every session of one app in a single flat model: a header row per day
+    followed by that day's sessions, most recent day first.
+    Only the list of days is known up front (queried off the GUI thread by
+    LogsTab), the rows of the days are read from the LogManager page by page
+    as the view scrolls (canFetchMore/fetchMore).
+    """
+    def __init__(self, log_manager, parent=None):
+        super().__init__(parent)
+        self.log_manager = log_manager
+        self.headers = log_manager.header.strip().split(";")
+        self.app = ""
+        self._days = []      # All days of the app, most recent first
+        self._next_day = 0   # Index in _days of the first day not fetched yet
+        self._rows = []      # (date_str, None) for day headers, (date_str, [9 fields]) for sessions
+        self._edited = {}    # {date_str: session IDs of edited rows}
+        self._deleted = {}   # {date_str: session IDs of removed rows}
+        self._header_font = QFont()
+        self._header_font.setBold(True)
+
+    def set_app(self, app, days=()):
+        """Shows app, days being its played days ('YYYY-MM-DD') most recent first."""
+        self.beginResetModel()
+        self.app = app
+        self._days = list(days) if app else []
+        self._next_day = 0
+        self._rows = []
+        self._edited = {}
+        self._deleted = {}
+        self.endResetModel()
+        if self.canFetchMore(QModelIndex()):
+            self.fetchMore(QModelIndex())
+
+    def day_count(self):
+        return len(self._days)
+
+    def is_day_row(self, row):
+        return self._rows[row][1] is None
+
+    # --- Lazy loading ---
+
+    def canFetchMore(self, parent):
+        return not parent.isValid() and self._next_day < len(self._days)
+
+    def fetchMore(self, parent):
+        if parent.isValid():
+            return
+        days = self._days[self._next_day:self._next_day + PAGE_DAYS]
+        self._next_day += len(days)
+        grouped = self.log_manager.get_logs_for_days(self.app, days)
+
+        new_rows = []
+        for date_str in days:
+            rows = grouped.get(date_str)
+            if not rows:
+                continue
+            new_rows.append((date_str, None))
+            new_rows.extend((date_str, row) for row in rows)
+        if not new_rows:
+            return
+
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(new_rows) - 1)
+        self._rows.extend(new_rows)
+        self.endInsertRows()
+
+    # --- Read ---
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.headers[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        date_str, row = self._rows[index.row()]
+        if row is None:
+            if role == Qt.ItemDataRole.DisplayRole and index.column() == 0:
+                return f"📅 {date_str}"
+            if role == Qt.ItemDataRole.FontRole:
+                return self._header_font
+            if role == Qt.ItemDataRole.ForegroundRole:
+                return QColor("#3498db")
+            return None
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            return row[index.column()]
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        if self._rows[index.row()][1] is None:
+            return Qt.ItemFlag.ItemIsEnabled
+        flags = Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+        if index.column() != ID_COLUMN:
+            flags |= Qt.ItemFlag.ItemIsEditable
+        return flags
+
+    # --- Edit ---
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if role != Qt.ItemDataRole.EditRole or not index.isValid():
+            return False
+        date_str, row = self._rows[index.row()]
+        if row is None or row[index.column()] == value:
+            return False
+        row[index.column()] = value
+        self._edited.setdefault(date_str, set()).add(row[ID_COLUMN])
+        self.dataChanged.emit(index, index, [role])
+        return True
+
+    def remove_sessions(self, rows):
+        """Removes session rows (day headers are ignored). Returns the number removed."""
+        removed = 0
+        for r in sorted(set(rows), reverse=True):
+            date_str, row = self._rows[r]
+            if row is None:
+                continue
+            self._deleted.setdefault(date_str, set()).add(row[ID_COLUMN])
+            self.beginRemoveRows(QModelIndex(), r, r)
+            del self._rows[r]
+            self.endRemoveRows()
+            removed += 1
+        return removed
+
+    def has_changes(self):
+        return bool(self._edited or self._deleted)
+
+    def pending_edits(self):
+        """{date_str: (updates, deletes)} for LogManager.apply_batch, modified days only."""
+        edits = {}
+        for date_str in self._edited.keys() | self._deleted.keys():
+            deletes = self._deleted.get(date_str, set())
+            edited = self._edited.get(date_str, set()) - deletes
+            updates = {
+                row[ID_COLUMN]: row[:ID_COLUMN]
+                for row_date, row in self._rows
+                if row_date == date_str and row is not None and row[ID_COLUMN] in edited
+            }
+            edits[date_str] = (updates, deletes)
+        return edits
 
 class LogsTab(QWidget):
     def __init__(self, data_manager):
         super().__init__()
         self.data = data_manager
         self.log_manager = LogManager(config.LOG_DIR)
-        self.tables = [] 
+        self.model = LogTableModel(self.log_manager, self)
+        self.queries = QueryRunner(self)
+        self.queries.finished.connect(self.on_query_finished)
+        self.queries.failed.connect(self.on_query_failed)
+        self.queries.busy_changed.connect(self.on_query_busy)
         self.setup_ui()
 
     def setup_ui(self):
@@ -25,34 +182,51 @@ class LogsTab(QWidget):
         self.app_combo = QComboBox()
         self.app_combo.currentIndexChanged.connect(self.load_log)
         top_bar.addWidget(self.app_combo, 1)
-        
+
+        self.loading_label = QLabel("⏳ Loading...")
+        self.loading_label.setStyleSheet("color: #888888;")
+        self.loading_label.setVisible(False)
+        top_bar.addWidget(self.loading_label)
+
         refresh_btn = QPushButton("Refresh List")
         refresh_btn.clicked.connect(self.refresh_list)
         top_bar.addWidget(refresh_btn)
         self.main_layout.addLayout(top_bar)
 
-        # --- Scroll Area ---
-        self.scroll = QScrollArea()
-        self.scroll.setWidgetResizable(True)
-        self.container = QWidget()
-        self.container_layout = QVBoxLayout(self.container)
-        self.scroll.setWidget(self.container)
-        self.main_layout.addWidget(self.scroll)
+        # --- Log View ---
+        self.empty_label = QLabel("No logs found for this application.")
+        self.empty_label.setVisible(False)
+        self.main_layout.addWidget(self.empty_label)
+
+        self.view = QTableView()
+        self.view.setModel(self.model)
+        self.view.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.view.setColumnHidden(ID_COLUMN, True)
+        self.view.verticalHeader().setVisible(False)
+        # Set a standard row height for consistency
+        self.view.verticalHeader().setDefaultSectionSize(30)
+        self.view.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        self.model.rowsInserted.connect(self.span_day_rows)
+
+        # Enable right click
+        self.view.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        self.view.customContextMenuRequested.connect(self.show_context_menu)
+        self.main_layout.addWidget(self.view)
 
         # --- Bottom Buttons ---
         btn_layout = QHBoxLayout()
-        
+
         self.status = QLabel("")
         self.status.setStyleSheet("color: #2ecc71; font-weight: bold;")
         btn_layout.addWidget(self.status)
-        
+
         btn_layout.addStretch()
 
         self.save_btn = QPushButton("Save All Changes")
         self.save_btn.clicked.connect(self.save_all)
         self.save_btn.setStyleSheet("padding: 8px 20px; font-weight: bold;")
         btn_layout.addWidget(self.save_btn)
-        
+
         self.main_layout.addLayout(btn_layout)
 
         self.refresh_list()
@@ -62,160 +236,100 @@ class LogsTab(QWidget):
         current = self.app_combo.currentText()
         self.app_combo.blockSignals(True)
         self.app_combo.clear()
-        
+
         # Get apps from the JSON metadata cache
         apps = self.log_manager.get_apps_sorted_by_latest()
         self.app_combo.addItems(apps)
-        
+
         if current in apps:
             self.app_combo.setCurrentText(current)
-            
+
         self.app_combo.blockSignals(False)
         self.load_log()
 
     def load_log(self):
+        """
+        Empties the view and queries the days of the selected app in the
+        background (the first query parses the whole history), the model is
+        filled once they arrive and its rows are fetched as the view scrolls.
+        """
         app = self.app_combo.currentText()
-        
-        # Clear existing table widgets
-        while self.container_layout.count():
-            item = self.container_layout.takeAt(0)
-            widget = item.widget()
-            if widget:
-                widget.deleteLater() # Better than setParent(None) for memory
-        
-        # Force the layout to align to the TOP 
-        self.container_layout.setAlignment(Qt.AlignmentFlag.AlignTop)
-        
-        self.tables = []
-        if not app: return
-
-        grouped_logs = self.log_manager.get_grouped_logs_for_app(app)
-        headers = self.log_manager.header.strip().split(";")
-
-        if not grouped_logs:
-            self.container_layout.addWidget(QLabel("No logs found for this application."))
+        self.view.clearSpans()
+        self.model.set_app(app)
+        self.empty_label.setVisible(False)
+        if app:
+            self.queries.submit('days', self.query_days, app)
+        else:
+            self.queries.cancel('days')
+
+    def query_days(self, app):
+        return app, self.log_manager.get_log_days_for_app(app)
+
+    def on_query_finished(self, kind, result):
+        app, days = result
+        if app != self.app_combo.currentText():
             return
+        self.view.clearSpans()
+        self.model.set_app(app, days)
+        self.empty_label.setVisible(self.model.day_count() == 0)
+
+    def on_query_failed(self, kind, error):
+        print(f"[LOGS ERROR] {kind}: {error}")
 
-        for date_str, rows in grouped_logs.items():
-            date_label = QLabel(f"📅 {date_str}")
-            date_label.setStyleSheet("font-weight: bold; font-size: 13px; margin-top: 15px; color: #3498db;")
-            self.container_layout.addWidget(date_label)
-
-            table = QTableWidget(len(rows), len(headers))
-            table.setHorizontalHeaderLabels(headers)
-            table.setProperty("date_source", date_str) 
-            
-            for r, row_data in enumerate(rows):
-                for c, text in enumerate(row_data):
-                    table.setItem(r, c, QTableWidgetItem(text))
-                        
-            # Use Qt.ScrollBarPolicy instead of QAbstractItemView
-            table.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
-            table.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-            
-            # Improved height calculation
-            # Row height (30) * num rows + Header (35) + Scrollbar space (25)
-            row_count = table.rowCount()
-            calculated_height = (row_count * 30) + 65
-            
-            # Ensure 1-row entries aren't squashed (min 110), limit max to 400
-            final_height = max(110, min(400, calculated_height))
-            table.setFixedHeight(final_height)
-            
-            # Set a standard row height for consistency
-            table.verticalHeader().setDefaultSectionSize(30)
-            table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
-
-            # Enable right click
-            table.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
-            table.customContextMenuRequested.connect(lambda pos, t=table: self.show_context_menu(pos, t))
-
-            self.container_layout.addWidget(table)
-            self.tables.append(table)
-
-        self.container_layout.addStretch(1)
+    def on_query_busy(self, kind, busy):
+        self.loading_label.setVisible(busy)
+
+    def span_day_rows(self, parent, first, last):
+        """Day header rows span the whole width."""
+        for row in range(first, last + 1):
+            if self.model.is_day_row(row):
+                self.view.setSpan(row, 0, 1, self.model.columnCount())
 
     def save_all(self):
-        """Iterates through all visible tables and updates each daily CSV."""
-        app_name = self.app_combo.currentText()
-        if not app_name: return
+        """Writes the edited and deleted rows of the modified days only."""
+        if not self.model.app: return
+
+        if not self.model.has_changes():
+            self.show_status("No changes to save")
+            return
 
         try:
-            for table in self.tables:
-                date_str = table.property("date_source")
-                
-                # Extract data from UI table
-                new_app_rows = []
-                for r in range(table.rowCount()):
-                    row_data = []
-                    for c in range(table.columnCount()):
-                        item = table.item(r, c)
-                        row_data.append(item.text() if item else "")
-                    new_app_rows.append(";".join(row_data))
-
-                # Update the file
-                self.update_daily_file(date_str, app_name, new_app_rows)
-
-            self.status.setText("✓ All files updated")
-            self.status.setVisible(True)
-            QTimer.singleShot(3000, lambda: self.status.setVisible(False))
-            
+            # Rows of other apps are never rewritten
+            touched = self.log_manager.apply_batch(self.model.pending_edits())
+            self.show_status(f"✓ {touched} file(s) updated")
+            # Edited legacy rows got new session IDs
+            self.load_log()
+
         except Exception as e:
             QMessageBox.critical(self, "Save Error", f"Failed to save: {e}")
 
-    def update_daily_file(self, date_str, combined_name, new_app_rows):
-        """Helper to overwrite only specific app entries."""
-        app_process = self.log_manager._extract_process(combined_name)
-        
-        year_month = date_str[:7]
-        file_path = self.log_manager.log_dir / year_month / f"activity_{date_str}.csv"
-        
-        if not file_path.exists(): return
-
-        lines = file_path.read_text(encoding="utf-8").splitlines()
-        header = lines[0]
-        
-        # Keep rows belonging to OTHER apps by comparing with app_process
-        other_apps_data = [
-            line for line in lines[1:] 
-            if line.strip() and line.split(";")[4] != app_process
-        ]
-        
-        final_lines = [header] + other_apps_data + new_app_rows
-        file_path.write_text("\n".join(final_lines) + "\n", encoding="utf-8")
+    def show_status(self, text):
+        self.status.setText(text)
+        self.status.setVisible(True)
+        QTimer.singleShot(3000, lambda: self.status.setVisible(False))
 
-    def show_context_menu(self, pos, table):
+    def show_context_menu(self, pos):
         """Displays a menu when right-clicking a row."""
         menu = QMenu()
         delete_action = QAction("🗑 Delete Selected Row(s)", self)
-        delete_action.triggered.connect(lambda: self.delete_selected_rows(table))
+        delete_action.triggered.connect(self.delete_selected_rows)
         menu.addAction(delete_action)
-        menu.exec(table.mapToGlobal(pos))
+        menu.exec(self.view.viewport().mapToGlobal(pos))
 
-    def delete_selected_rows(self, table):
-        """Removes rows from the table and shrinks the table height."""
-        # Get selected unique row indices in reverse order
-        selected_items = table.selectedItems()
-        if not selected_items:
+    def delete_selected_rows(self):
+        """Removes the selected sessions from the view, saved with 'Save All Changes'."""
+        rows = [
+            index.row() for index in self.view.selectionModel().selectedRows()
+            if not self.model.is_day_row(index.row())
+        ]
+        if not rows:
             return
 
-        rows_to_delete = sorted(list(set(item.row() for item in selected_items)), reverse=True)
-
         confirm = QMessageBox.question(
-            self, "Confirm Delete", 
-            f"Are you sure you want to remove {len(rows_to_delete)} entry(s)?\n\nNote: Changes are only permanent after clicking 'Save All Changes'.",
+            self, "Confirm Delete",
+            f"Are you sure you want to remove {len(rows)} entry(s)?\n\nNote: Changes are only permanent after clicking 'Save All Changes'.",
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
         )
 
         if confirm == QMessageBox.StandardButton.Yes:
-            for row in rows_to_delete:
-                table.removeRow(row)
-            
-            # Re-calculate height so the UI shrinks nicely
-            new_row_count = table.rowCount()
-            if new_row_count == 0:
-                # If no rows left for this day, we could hide the table or just make it small
-                table.setFixedHeight(65) 
-            else:
-                new_height = max(110, min(400, (new_row_count * 30) + 65))
-                table.setFixedHeight(new_height)
\ No newline at end of file
+            self.model.remove_sessions(rows)
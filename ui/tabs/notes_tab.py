@@ -50,14 +50,14 @@ class NotesTab(QWidget):
 
     def load_note(self):
         app = self.app_combo.currentText()
-        process = self.log_manager._extract_process(app)
+        process = self.log_manager.extract_process(app)
         content = self.data.get_note(process)
         self.editor.setPlainText(content)
         self.status.setVisible(False)
 
     def save_note(self):
         app = self.app_combo.currentText()
-        process = self.log_manager._extract_process(app)
+        process = self.log_manager.extract_process(app)
         if app:
             self.data.save_note(process, self.editor.toPlainText())
 
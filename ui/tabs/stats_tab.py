@@ -1,27 +1,38 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QComboBox, 
                              QPushButton, QLabel, QTabWidget, QTableWidget, 
-                             QTableWidgetItem, QHeaderView)
+                             QTableWidgetItem, QHeaderView, QFileDialog, QMessageBox)
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QIcon
-import matplotlib
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-import matplotlib.dates as mdates
+from datetime import timedelta
 from core.log_manager import LogManager
+from ui.query_runner import QueryRunner
+from ui.charts import DateBarChart, HBarChart
+from ui import chart_export
 import config
-from datetime import datetime
 
-matplotlib.rcParams['font.sans-serif'] = [
-    'Noto Sans CJK JP', 'WenQuanYi Micro Hei', 'IPAexGothic', 
-    'Droid Sans Fallback', 'DejaVu Sans'
-]
-matplotlib.rcParams['axes.unicode_minus'] = False
+# Apps shown in the global summary
+GLOBAL_TOP = 15
+# Horizontal pixels per bar of the individual graph, decides its resolution
+PIXELS_PER_BAR = 8
+# Narrowest zoom, in days
+MIN_VIEW_DAYS = 7
 
 class StatsTab(QWidget):
-    def __init__(self, data_manager):
+    def __init__(self, data_manager, tracker_service=None):
         super().__init__()
         self.data = data_manager
         self.log_manager = LogManager(config.LOG_DIR)
+        # Prepared results until the logged data changes
+        self._app_cache = {}    # {(app, range, max bars): (data version, result)}
+        self._global_cache = {} # {timeframe: (key, result)}
+        # Global summary shown: {'range': (start, end), 'totals': {app: [seconds, title]}}
+        self._global_live = None
+
+        # Log scans run in the pool, never on the GUI thread
+        self.queries = QueryRunner(self)
+        self.queries.finished.connect(self.on_query_finished)
+        self.queries.failed.connect(self.on_query_failed)
+        self.queries.busy_changed.connect(self.on_query_busy)
         
         # Main Layout
         self.main_layout = QVBoxLayout(self)
@@ -35,6 +46,10 @@ class StatsTab(QWidget):
         self.setup_global_tab()
         self.refresh_data()
 
+        # New playtime is added to what's shown as the tracker saves it
+        if tracker_service is not None:
+            tracker_service.session_saved.connect(self.on_session_saved)
+
     def setup_individual_tab(self):
         tab = QWidget()
         layout = QVBoxLayout(tab)
@@ -45,7 +60,7 @@ class StatsTab(QWidget):
         controls = QHBoxLayout()
         self.app_combo = QComboBox()
         self.app_combo.setMinimumHeight(30)
-        self.app_combo.currentIndexChanged.connect(self.update_graph)
+        self.app_combo.currentIndexChanged.connect(self.on_app_changed)
         controls.addWidget(self.app_combo, stretch=1)
 
         refresh_btn = QPushButton()
@@ -55,15 +70,40 @@ class StatsTab(QWidget):
         controls.addWidget(refresh_btn)
         layout.addLayout(controls)
 
+        self.app_loading = self.create_loading_label()
+        controls.insertWidget(1, self.app_loading)
+
         self.info_label = QLabel("Total Playtime: 0h 0m")
         self.info_label.setStyleSheet("font-size: 13px; font-weight: bold; color: #3498db;")
         self.info_label.setAlignment(Qt.AlignmentFlag.AlignLeft)
-        layout.addWidget(self.info_label)
+
+        # Zoom / pan of the graph, finer resolutions are queried on demand
+        view_controls = QHBoxLayout()
+        view_controls.addWidget(self.info_label, stretch=1)
+        self.resolution_label = QLabel("")
+        self.resolution_label.setStyleSheet("color: #888888;")
+        view_controls.addWidget(self.resolution_label)
+        for text, tooltip, slot in (
+            ("◀", "Pan left", lambda: self.pan_graph(-1)),
+            ("▶", "Pan right", lambda: self.pan_graph(1)),
+            ("+", "Zoom in", lambda: self.zoom_graph(0.5)),
+            ("−", "Zoom out", lambda: self.zoom_graph(2)),
+            ("⟲", "Whole history", self.reset_graph_view),
+            ("⤓", "Export graph", self.export_app_chart),
+        ):
+            btn = QPushButton(text)
+            btn.setFixedSize(30, 30)
+            btn.setToolTip(tooltip)
+            btn.clicked.connect(slot)
+            view_controls.addWidget(btn)
+        layout.addLayout(view_controls)
 
         # Graph Area
-        self.figure, self.ax = plt.subplots(figsize=(5, 3), facecolor='#1e1e1e')
-        self.canvas = FigureCanvas(self.figure)
-        layout.addWidget(self.canvas, stretch=1)
+        self.app_chart = DateBarChart()
+        self.app_chart.zoom_requested.connect(self.zoom_graph)
+        layout.addWidget(self.app_chart, stretch=1)
+        self.app_range = None  # (start, end) dates requested, None = whole history
+        self.app_series = None # Last get_app_series() result shown
         
         self.tabs.addTab(tab, "Individual App")
 
@@ -89,23 +129,57 @@ class StatsTab(QWidget):
         refresh_btn.clicked.connect(self.update_global_stats) 
         controls.addWidget(refresh_btn)
 
+        export_btn = QPushButton("⤓")
+        export_btn.setFixedSize(30, 30)
+        export_btn.setToolTip("Export chart")
+        export_btn.clicked.connect(self.export_global_chart)
+        controls.addWidget(export_btn)
+
+        self.global_loading = self.create_loading_label()
+        controls.insertWidget(2, self.global_loading)
+
         # Summary Label (Total time for all apps in period)
         self.summary_info = QLabel("Total time in period: 0h 0m")
         self.summary_info.setStyleSheet("font-size: 13px; font-weight: bold; color: #f1c40f;")
         layout.addWidget(self.summary_info)
 
         # Horizontal Bar Chart 
-        self.global_figure, self.global_ax = plt.subplots(figsize=(6, 4), facecolor='#1e1e1e')
-        self.global_canvas = FigureCanvas(self.global_figure)
-        layout.addWidget(self.global_canvas, stretch=1)
+        self.global_chart = HBarChart()
+        self.global_data = ([], [])
+        layout.addWidget(self.global_chart, stretch=1)
 
         self.tabs.addTab(tab, "Global Summary")
 
+    def create_loading_label(self):
+        label = QLabel("⏳ Loading...")
+        label.setStyleSheet("color: #888888;")
+        label.setVisible(False)
+        return label
+
     def refresh_data(self):
-        """Populates the combo box and updates both views."""
+        """Reloads the app list, both views are updated once it arrives."""
+        self.queries.submit('apps', self.log_manager.get_apps_sorted_by_latest)
+
+    def on_query_finished(self, kind, result):
+        if kind == 'apps':
+            self.populate_apps(result)
+        elif kind == 'app':
+            self.show_app_stats(*result)
+        elif kind == 'global':
+            self.show_global_stats(*result)
+
+    def on_query_failed(self, kind, error):
+        print(f"[STATS ERROR] {kind}: {error}")
+
+    def on_query_busy(self, kind, busy):
+        if kind in ('apps', 'app'):
+            self.app_loading.setVisible(self.queries.is_busy('apps') or self.queries.is_busy('app'))
+        else:
+            self.global_loading.setVisible(busy)
+
+    def populate_apps(self, apps):
         self.app_combo.blockSignals(True)
         self.app_combo.clear()
-        apps = self.log_manager.get_apps_sorted_by_latest()
         if apps:
             self.app_combo.addItems(apps)
             self.app_combo.setCurrentIndex(0)
@@ -115,70 +189,163 @@ class StatsTab(QWidget):
         self.update_graph()
         self.update_global_stats()
 
+    def on_app_changed(self):
+        self.app_range = None
+        self.update_graph()
+
     def update_graph(self):
         app = self.app_combo.currentText()
         if not app:
+            self.queries.cancel('app')
             self.info_label.setText("Total Playtime: 0h 0m")
-            self.render_canvas({}) # Clear graph
+            self.app_series = None
+            self.resolution_label.setText("")
+            self.render_canvas(None) # Clear graph
             return
 
-        total_seconds, daily_data = self.log_manager.get_stats_for_app(app)
-        print(f'total_seconds {total_seconds}')
+        # The canvas width bounds the number of bars, whatever the history length
+        max_bars = max(20, self.app_chart.width() // PIXELS_PER_BAR)
+        # Replaces (cancels) the query of the previously selected app or range
+        self.queries.submit('app', self.query_app_stats, app, self.app_range, max_bars)
+
+    def query_app_stats(self, app, view_range, max_bars):
+        """Worker thread: pre-aggregated series of the app, memoized until the logs change."""
+        version = self.log_manager.get_data_version()
+        key = (app, view_range, max_bars)
+        cached = self._app_cache.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        start, end = view_range or (None, None)
+        series = self.log_manager.get_app_series(app, start, end, max_bars)
+        result = (app, series)
+        if len(self._app_cache) > 64:
+            self._app_cache.clear()
+        self._app_cache[key] = (version, result)
+        return result
+
+    def show_app_stats(self, app, series):
+        self.show_app_total(series['total_seconds'])
+        self.resolution_label.setText(f"{series['resolution'].capitalize()} view" if series['buckets'] else "")
+        self.app_series = series
         
+        self.render_canvas(series)
+
+    def show_app_total(self, total_seconds):
         hours = int(total_seconds // 3600)
         minutes = int((total_seconds % 3600) // 60)
         self.info_label.setText(f"Total Playtime: {hours}h {minutes}m")
-        
-        self.render_canvas(daily_data)
 
-    def render_canvas(self, daily_data):
-        """--- FIX 3: Robust Graph Rendering ---"""
-        self.ax.clear()
-        
-        # Set dark theme styles
-        self.ax.set_facecolor('#1e1e1e')
-        self.ax.tick_params(axis='x', colors='white', labelsize=8)
-        self.ax.tick_params(axis='y', colors='white', labelsize=8)
-        for spine in self.ax.spines.values():
-            spine.set_color('#444444')
-
-        if daily_data:
-            # Ensure dates are sorted chronologically
-            sorted_dates = sorted(daily_data.keys())
-            
-            # Convert string dates to datetime objects if they aren't already
-            plot_dates = []
-            for d in sorted_dates:
-                if isinstance(d, str):
-                    plot_dates.append(datetime.strptime(d, '%Y-%m-%d'))
-                else:
-                    plot_dates.append(d)
-
-            plot_hours = [daily_data[d] for d in sorted_dates]
-
-            # Plot bars
-            self.ax.bar(plot_dates, plot_hours, color='#3498db', width=0.6)
-            
-            # Formatting the X-axis for dates
-            self.ax.xaxis.set_major_formatter(mdates.DateFormatter('%b %d'))
-            self.ax.xaxis.set_major_locator(mdates.AutoDateLocator())
-            self.figure.autofmt_xdate()
+    def render_canvas(self, series):
+        """series: get_app_series() result, None clears the graph."""
+        if series is None:
+            self.app_chart.clear()
+        else:
+            self.app_chart.set_series(series['buckets'], (series['start'], series['end']))
+
+    # --- Zoom / pan ---
+
+    def shown_range(self):
+        """(start, end, first, end of history) dates of the graph, None without data."""
+        series = self.app_series
+        if not series or series['first'] is None:
+            return None
+        return series['start'], series['end'], series['first'], series['last'] + timedelta(days=1)
+
+    def zoom_graph(self, factor, center=None):
+        shown = self.shown_range()
+        if shown is None:
+            return
+        start, end, first, last = shown
+        span = max(MIN_VIEW_DAYS, round((end - start).days * factor))
+        if center is None:
+            center = start + (end - start) / 2
+        self.set_graph_view(center - timedelta(days=span // 2), span)
+
+    def pan_graph(self, direction):
+        shown = self.shown_range()
+        if shown is None:
+            return
+        start, end, _, _ = shown
+        span = (end - start).days
+        self.set_graph_view(start + timedelta(days=direction * max(1, span // 2)), span)
+
+    def set_graph_view(self, start, span):
+        """Shows span days from start, kept inside the history."""
+        _, _, first, last = self.shown_range()
+        if span >= (last - first).days:
+            self.app_range = None
         else:
-            # If no data, show a message on the canvas
-            self.ax.text(0.5, 0.5, "No data available", color='gray', 
-                         ha='center', va='center', transform=self.ax.transAxes)
+            start = min(max(start, first), last - timedelta(days=span))
+            self.app_range = (start, start + timedelta(days=span))
+        self.update_graph()
+
+    def reset_graph_view(self):
+        self.app_range = None
+        self.update_graph()
 
-        self.canvas.draw()
+    def export_app_chart(self):
+        series = self.app_series
+        buckets = series['buckets'] if series else []
+        self.export_chart(self.app_chart, lambda path: chart_export.export_app_chart(
+            path, buckets, self.app_combo.currentText()))
+
+    def export_global_chart(self):
+        labels, hours = self.global_data
+        self.export_chart(self.global_chart, lambda path: chart_export.export_global_chart(path, labels, hours))
+
+    def export_chart(self, widget, export):
+        """Saves through matplotlib when installed (PNG/SVG/PDF), else a PNG of the widget."""
+        if chart_export.available():
+            filters = "PNG image (*.png);;SVG image (*.svg);;PDF document (*.pdf)"
+        else:
+            filters = "PNG image (*.png)"
+        path, _ = QFileDialog.getSaveFileName(self, "Export Chart", "chart.png", filters)
+        if not path:
+            return
+        try:
+            if chart_export.available():
+                export(path)
+            elif not widget.grab().save(path, "PNG"):
+                raise OSError(f"Could not write {path}")
+        except Exception as e:
+            QMessageBox.critical(self, "Export Error", f"Failed to export: {e}")
 
     def update_global_stats(self):
         timeframe = self.range_combo.currentText()
-        data = self.log_manager.get_global_summary(timeframe)
+        self.queries.submit('global', self.query_global_stats, timeframe)
 
+    def query_global_stats(self, timeframe):
+        """Worker thread: summary of the timeframe, ready to render."""
+        start, end = self.log_manager.timeframe_range(timeframe)
+        # Rolling ranges move with the clock, minute precision is enough
+        key = (self.log_manager.get_data_version(start, end), start and start.replace(second=0, microsecond=0))
+        cached = self._global_cache.get(timeframe)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        data = self.log_manager.get_global_summary(timeframe, start, end)
+        result = ((start, end), data)
+        self._global_cache[timeframe] = (key, result)
+        return result
+
+    def show_global_stats(self, time_range, data):
+        # Kept as a dict so tracker saves can be added without a query
+        self._global_live = {
+            'range': time_range,
+            'totals': {app: [seconds, title] for app, seconds, title in data},
+        }
+        self.render_global_stats()
+
+    def render_global_stats(self):
+        """Summary and chart of the top apps from the live totals."""
+        totals = self._global_live['totals']
+        data = sorted(
+            ((app, seconds, title) for app, (seconds, title) in totals.items() if seconds > 0),
+            key=lambda x: x[1], reverse=True
+        )
         total_seconds = sum(item[1] for item in data)
-        h, m = int(total_seconds // 3600), int((total_seconds % 3600) // 60)
-        self.summary_info.setText(f"Total time in period: {h}h {m}m")
 
-        top_data = data[:15]
+        top_data = data[:GLOBAL_TOP]
         top_data.reverse()
 
         # Format the label: "process (truncated title)"
@@ -193,30 +360,64 @@ class StatsTab(QWidget):
             display_labels.append(label)
 
         hours = [item[1] / 3600 for item in top_data]
+
+        h, m = int(total_seconds // 3600), int((total_seconds % 3600) // 60)
+        self.summary_info.setText(f"Total time in period: {h}h {m}m")
         self.render_global_canvas(display_labels, hours)
 
     def render_global_canvas(self, labels, hours):
-        self.global_ax.clear()
-        self.global_ax.set_facecolor('#1e1e1e')
-        
-        if labels:
-            bars = self.global_ax.barh(labels, hours, color='#e67e22', height=0.7)
-            
-            # Value labels
-            for bar in bars:
-                width = bar.get_width()
-                self.global_ax.text(width + 0.05, bar.get_y() + bar.get_height()/2, 
-                                    f' {width:.1f}h', 
-                                    va='center', color='#f1c40f', fontsize=10, fontweight='bold')
-
-            # Give extra space for the labels on the left and the hours on the right
-            max_h = max(hours) if hours else 1
-            self.global_ax.set_xlim(0, max_h * 1.25)
-            
-            self.global_ax.tick_params(axis='y', colors='white', labelsize=8)
-            self.global_ax.tick_params(axis='x', colors='#888', labelsize=8)
-            
-            # Subplots adjust to give left side plenty of room for "Process (Title)"
-            self.global_figure.subplots_adjust(left=0.4, right=0.95, top=0.95, bottom=0.1)
-        
-        self.global_canvas.draw()
\ No newline at end of file
+        self.global_data = (labels, hours)
+        self.global_chart.set_data(labels, hours)
+
+    # --- Live updates ---
+
+    def on_session_saved(self, event):
+        """LogWriter session-saved event: adds its delta to the views, no log reads."""
+        self.apply_global_delta(event)
+        self.apply_app_delta(event)
+
+    def apply_global_delta(self, event):
+        live = self._global_live
+        if live is None:
+            return
+        if self.queries.is_busy('global'):
+            # The result on its way may or may not hold this save, read it again
+            self.update_global_stats()
+            return
+
+        start, end = live['range']
+        if end is not None and event['start'] >= end:
+            # "Today" is over: the timeframe has moved on
+            self.update_global_stats()
+            return
+        if start is not None and event['start'] < start:
+            return
+
+        entry = live['totals'].setdefault(event['app'], [0, event['title']])
+        entry[0] += event['delta']
+        entry[1] = event['title']
+        self.render_global_stats()
+
+    def apply_app_delta(self, event):
+        if self.log_manager.extract_process(self.app_combo.currentText()) != event['app']:
+            return
+        series = self.app_series
+        if series is None or self.queries.is_busy('app'):
+            self.update_graph()
+            return
+
+        # Copy, the shown series may also be a cached query result
+        series = self.app_series = dict(series, buckets=list(series['buckets']))
+        series['total_seconds'] += event['delta']
+        self.show_app_total(series['total_seconds'])
+
+        day = event['day']
+        for i, (start, length, hours) in enumerate(series['buckets']):
+            if start <= day < start + timedelta(days=length):
+                series['buckets'][i] = (start, length, hours + event['delta'] / 3600)
+                self.render_canvas(series)
+                return
+
+        # First playtime of its bucket: the axis may have to grow, query once
+        if self.app_range is None or series['start'] <= day < series['end']:
+            self.update_graph()
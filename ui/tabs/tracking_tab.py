@@ -1,13 +1,96 @@
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QComboBox, QPushButton, QTextEdit, QCheckBox
-from PyQt6.QtGui import QIcon
+from collections import deque
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QComboBox, QPushButton, QPlainTextEdit, QCheckBox
+from PyQt6.QtGui import QIcon, QTextCursor
+from PyQt6.QtCore import QTimer, QThread, pyqtSignal
 from core.system_utils import SystemUtils
 
+# Appends arriving within this many ms are inserted together (about one frame)
+CONSOLE_BATCH_MS = 16
+
+class LogConsole(QPlainTextEdit):
+    """
+    Read-only console keeping at most max_lines lines (the document drops the
+    oldest blocks). Appends are queued and inserted in one edit per batch,
+    and the console never reads its own text back.
+    """
+    def __init__(self, max_lines=5000, parent=None):
+        super().__init__(parent)
+        max_lines = max(0, int(max_lines))
+        self.setReadOnly(True)
+        self.setMaximumBlockCount(max_lines)
+        # Bursts larger than the console can show only keep their tail
+        self._pending = deque(maxlen=2 * max_lines if max_lines > 0 else None)
+        # Whether the last queued text left its line open (no trailing newline)
+        self._line_open = False
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(CONSOLE_BATCH_MS)
+        self._timer.timeout.connect(self.flush)
+
+    def append_line(self, text):
+        """Adds text on a new line."""
+        self._queue("\n" + text if self._line_open else text)
+
+    def append_partial(self, text):
+        """Adds text at the end of the current line."""
+        self._queue(text)
+
+    def _queue(self, chunk):
+        if not chunk:
+            return
+        self._line_open = not chunk.endswith("\n")
+        self._pending.append(chunk)
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def flush(self):
+        if not self._pending:
+            return
+        text = "".join(self._pending)
+        self._pending.clear()
+
+        scrollbar = self.verticalScrollBar()
+        at_bottom = scrollbar.value() == scrollbar.maximum()
+
+        cursor = QTextCursor(self.document())
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        cursor.insertText(text)
+
+        if at_bottom:
+            scrollbar.setValue(scrollbar.maximum())
+
+class WindowListThread(QThread):
+    """Enumerates the windows off the GUI thread, one signal per window as it resolves."""
+    window_found = pyqtSignal(int, str) # generation, title
+
+    def __init__(self, generation, utils, only_show_wine):
+        super().__init__()
+        self.generation = generation
+        self.utils = utils
+        self.only_show_wine = only_show_wine
+        self.cancelled = False
+
+    def run(self):
+        windows = SystemUtils.iter_window_list(self.utils, self.only_show_wine)
+        try:
+            for title, _ in windows:
+                if self.cancelled:
+                    break
+                self.window_found.emit(self.generation, title)
+        finally:
+            windows.close()
+
 class TrackingTab(QWidget):
     def __init__(self, tracker_service, data_manager):
         super().__init__()
         self.tracker = tracker_service
         self.data = data_manager
 
+        # Window list refresh: one thread at most, later requests coalesced into one rerun
+        self._list_thread = None
+        self._list_generation = 0
+        self._list_pending = False
+
         # Connect Signals
         self.tracker.log_received.connect(self.append_log)
         self.tracker.tracking_finished.connect(self.on_tracking_finished)
@@ -52,20 +135,51 @@ class TrackingTab(QWidget):
         layout.addWidget(self.bg_btn)
 
         # Console
-        self.console = QTextEdit()
-        self.console.setReadOnly(True)
+        self.console = LogConsole(self.data.settings.get('CONSOLE_MAX_LINES', 5000))
         layout.addWidget(self.console)
 
         # Initial Load
         self.wine_check.setChecked(bool(self.data.settings.get('ENABLE_ONLY_WINE', 0)))
         
     def refresh_list(self):
+        """Refreshes the window list in the background, titles are added as they resolve."""
+        self._list_generation += 1
+        if self._list_thread is not None:
+            # Stale results are ignored, a single rerun starts when it ends
+            self._list_thread.cancelled = True
+            self._list_pending = True
+            return
+        self._start_list_refresh()
+
+    def _start_list_refresh(self):
+        self._list_pending = False
         self.window_combo.clear()
-        utils = self.tracker.desktop_utils
-        windows = SystemUtils.get_window_list(utils, self.wine_check.isChecked())
-        for title, _ in windows:
+        thread = WindowListThread(
+            self._list_generation, self.tracker.desktop_utils, self.wine_check.isChecked()
+        )
+        thread.window_found.connect(self.on_window_found)
+        thread.finished.connect(self.on_list_refreshed)
+        self._list_thread = thread
+        thread.start()
+
+    def on_window_found(self, generation, title):
+        if generation == self._list_generation and self.window_combo.findText(title) < 0:
             self.window_combo.addItem(title)
-        self.console.append("List refreshed.")
+
+    def on_list_refreshed(self):
+        thread, self._list_thread = self._list_thread, None
+        thread.deleteLater()
+        if self._list_pending:
+            self._start_list_refresh()
+        else:
+            self.append_log("List refreshed.")
+
+    def cancel_refresh(self, msecs=2000):
+        """Stops a running window list refresh (on close)."""
+        self._list_pending = False
+        if self._list_thread is not None:
+            self._list_thread.cancelled = True
+            self._list_thread.wait(msecs)
 
     def start_tracking(self):
         app = self.window_combo.currentText()
@@ -91,39 +205,22 @@ class TrackingTab(QWidget):
         self.tracker.background_tracking(refresh_timer, save_time, afk_timer)
 
     def stop_tracking(self):
-        self.console.append("Stopping tracking...")
+        self.append_log("Stopping tracking...")
         self.tracker.stop_tracking()
 
     def on_tracking_finished(self):
         self.start_btn.setEnabled(True)
         self.bg_btn.setEnabled(True)
         self.stop_btn.setEnabled(False)
-        self.console.append("Tracking stopped.")
+        self.append_log("Tracking stopped.")
 
     def append_log(self, text):
         """Inserts text at console."""
-
-        scrollbar = self.console.verticalScrollBar()
-        at_bottom = scrollbar.value() == scrollbar.maximum()
-
-        cursor = self.console.textCursor()
-        cursor.movePosition(cursor.MoveOperation.End)
-
-        if self.console.toPlainText() and not self.console.toPlainText().endswith("\n"):
-            cursor.insertText("\n")
-
-        cursor.insertText(text)
-
-        if at_bottom:
-            scrollbar.setValue(scrollbar.maximum())
+        self.console.append_line(text)
 
     def append_partial_log(self, text):
         """Inserts text at the end of the console without a newline."""
-        cursor = self.console.textCursor()
-        cursor.movePosition(cursor.MoveOperation.End)
-        cursor.insertText(text)
-        # Ensure the scrollbar stays at the bottom
-        self.console.ensureCursorVisible()
+        self.console.append_partial(text)
 
     def start_tracking_with_params(self, title):
         """Programmatically starts tracking for a specific window title."""